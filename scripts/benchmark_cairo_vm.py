@@ -0,0 +1,73 @@
+"""
+Script for measuring the latency of calls executed by the Rust implementation of Cairo VM,
+comparing runs which serialize the program of the called class with runs reusing it.
+Usage: STARKNET_DEVNET_CAIRO_VM=rust python scripts/benchmark_cairo_vm.py [REPETITIONS]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+from starkware.starknet.public.abi import get_selector_from_name
+from starkware.starknet.services.api.feeder_gateway.request_objects import CallFunction
+
+from starknet_devnet.devnet_config import DevnetConfig, parse_args
+from starknet_devnet.fee_token import FeeToken
+from starknet_devnet.starknet_wrapper import StarknetWrapper
+
+
+async def _measure(name: str, repetitions: int, call, before_each=None):
+    elapsed = 0.0
+    for _ in range(repetitions):
+        if before_each:
+            before_each()
+        start = time.perf_counter()
+        await call()
+        elapsed += time.perf_counter() - start
+    print(f"{name}: {elapsed / repetitions * 1000:.3f} ms per call")
+
+
+async def main():
+    """Main function"""
+    if os.environ.get("STARKNET_DEVNET_CAIRO_VM") != "rust":
+        sys.exit("Run with STARKNET_DEVNET_CAIRO_VM=rust")
+
+    # pylint: disable=import-outside-toplevel
+    from starknet_devnet.cairo_rs_py_patch import dumped_programs
+
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    starknet_wrapper = StarknetWrapper(DevnetConfig(parse_args(["--accounts", "1"])))
+    await starknet_wrapper.initialize()
+    account = starknet_wrapper.accounts[0]
+
+    calls = {
+        "fee token balanceOf": CallFunction(
+            contract_address=FeeToken.ADDRESS,
+            entry_point_selector=get_selector_from_name("balanceOf"),
+            calldata=[account.address],
+        ),
+        "account getPublicKey": CallFunction(
+            contract_address=account.address,
+            entry_point_selector=get_selector_from_name("getPublicKey"),
+            calldata=[],
+        ),
+    }
+
+    for name, call_function in calls.items():
+
+        async def call(call_function=call_function):
+            await starknet_wrapper.call(call_function)
+
+        await _measure(
+            f"{name}, serializing the program",
+            repetitions,
+            call,
+            before_each=dumped_programs.clear,
+        )
+        await _measure(f"{name}, reusing the program", repetitions, call)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
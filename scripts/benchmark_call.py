@@ -0,0 +1,90 @@
+"""
+Script for measuring the latency of a call against a state with many deployed contracts,
+comparing execution on a full copy of the state with execution on an overlay state.
+Usage: python scripts/benchmark_call.py [REPETITIONS] [NUMBER_OF_CONTRACTS]
+"""
+
+import asyncio
+import sys
+import time
+
+from starkware.starknet.public.abi import (
+    get_selector_from_name,
+    get_storage_var_address,
+)
+from starkware.starknet.services.api.feeder_gateway.request_objects import CallFunction
+
+from starknet_devnet.devnet_config import DevnetConfig, parse_args
+from starknet_devnet.fee_token import FeeToken
+from starknet_devnet.starknet_wrapper import StarknetWrapper
+from starknet_devnet.util import create_overlay_state
+
+BALANCE_OF = get_selector_from_name("balanceOf")
+FIRST_ADDRESS = 0x1000
+
+
+async def _populate(starknet_wrapper: StarknetWrapper, number_of_contracts: int):
+    """Deploy `number_of_contracts` token contracts, each with a stored balance"""
+    cached_state = starknet_wrapper.get_state().state
+    for i in range(number_of_contracts):
+        address = FIRST_ADDRESS + i
+        # pylint: disable=protected-access
+        cached_state.cache._class_hash_writes[address] = FeeToken.HASH
+        balance_key = get_storage_var_address("ERC20_balances", address)
+        await cached_state.set_storage_at(address, balance_key, i)
+    await starknet_wrapper.generate_latest_block()
+
+
+async def _measure(name: str, repetitions: int, call):
+    start = time.perf_counter()
+    for _ in range(repetitions):
+        await call()
+    elapsed = time.perf_counter() - start
+    print(f"{name}: {elapsed / repetitions * 1000:.3f} ms per call")
+
+
+async def main():
+    """Main function"""
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    number_of_contracts = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+
+    starknet_wrapper = StarknetWrapper(DevnetConfig(parse_args(["--accounts", "1"])))
+    await starknet_wrapper.initialize()
+    await _populate(starknet_wrapper, number_of_contracts)
+    print(f"state with {number_of_contracts} contracts")
+
+    address = FIRST_ADDRESS + number_of_contracts // 2
+    state = starknet_wrapper.get_state()
+
+    async def call_on_copy():
+        await state.copy().execute_entry_point_raw(
+            contract_address=address,
+            selector=BALANCE_OF,
+            calldata=[address],
+            caller_address=0,
+        )
+
+    async def call_on_overlay():
+        await create_overlay_state(state).execute_entry_point_raw(
+            contract_address=address,
+            selector=BALANCE_OF,
+            calldata=[address],
+            caller_address=0,
+        )
+
+    async def wrapper_call():
+        await starknet_wrapper.call(
+            CallFunction(
+                contract_address=address,
+                entry_point_selector=BALANCE_OF,
+                calldata=[address],
+            )
+        )
+
+    await _measure("state copy", repetitions, call_on_copy)
+    await _measure("overlay state", repetitions, call_on_overlay)
+    await _measure("StarknetWrapper.call", repetitions, wrapper_call)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
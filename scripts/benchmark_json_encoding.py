@@ -0,0 +1,58 @@
+"""
+Script for comparing the encoding of a large RPC block response by Flask's default approach
+(the standard library with sorted keys) against the encoder used by devnet.
+Usage: python scripts/benchmark_json_encoding.py [REPETITIONS] [BLOCK_SIZE]
+"""
+
+import json
+import sys
+import timeit
+
+from starknet_devnet.blueprints.rpc.utils import rpc_felt, rpc_response
+from starknet_devnet.json_encoding import dumps
+
+
+def _invoke_transaction(index: int) -> dict:
+    return {
+        "type": "INVOKE",
+        "transaction_hash": rpc_felt(2**250 + index),
+        "max_fee": rpc_felt(10**15),
+        "version": rpc_felt(1),
+        "signature": [rpc_felt(2**251 - index), rpc_felt(2**249 + index)],
+        "nonce": rpc_felt(index),
+        "sender_address": rpc_felt(2**200 + index),
+        "calldata": [rpc_felt(2**240 + index * i) for i in range(10)],
+    }
+
+
+def _block_with_txs(block_size: int) -> dict:
+    return {
+        "status": "ACCEPTED_ON_L2",
+        "block_hash": rpc_felt(2**250),
+        "parent_hash": rpc_felt(2**249),
+        "block_number": 1,
+        "new_root": rpc_felt(2**248),
+        "timestamp": 1,
+        "sequencer_address": rpc_felt(2**247),
+        "transactions": [_invoke_transaction(i) for i in range(block_size)],
+    }
+
+
+def _flask_default_dumps(obj) -> bytes:
+    return json.dumps(obj, separators=(",", ":"), sort_keys=True).encode("utf-8")
+
+
+def main():
+    """Main function"""
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    block_size = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+
+    response = rpc_response(message_id=0, content=_block_with_txs(block_size))
+
+    for name, function in [("flask default", _flask_default_dumps), ("devnet", dumps)]:
+        elapsed = timeit.timeit(lambda f=function: f(response), number=repetitions)
+        print(f"{name}: {elapsed / repetitions * 1000:.3f} ms per response")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Script for comparing RPC schema validation with a fresh validator per call (as done by
+`jsonschema.validate`) against validation with validators compiled once per method.
+Usage: python scripts/benchmark_rpc_validation.py [REPETITIONS] [BLOCK_SIZE]
+"""
+
+import sys
+import timeit
+
+from jsonschema import validate
+
+from starknet_devnet.blueprints.rpc.schema import (
+    _assert_valid_rpc_request,
+    _assert_valid_rpc_schema,
+    _request_schemas_for_method,
+    _response_schema_for_method,
+)
+
+
+def _block_with_tx_hashes(block_size: int) -> dict:
+    return {
+        "status": "ACCEPTED_ON_L2",
+        "block_hash": "0x1",
+        "parent_hash": "0x0",
+        "block_number": 1,
+        "new_root": "0x2",
+        "timestamp": 1,
+        "sequencer_address": "0x3",
+        "transactions": [hex(i + 1) for i in range(block_size)],
+    }
+
+
+def _validate_uncompiled(block: dict, params: dict):
+    for name, value in params.items():
+        validate(value, _request_schemas_for_method("starknet_getStorageAt")[name])
+    validate(block, _response_schema_for_method("starknet_getBlockWithTxHashes"))
+
+
+def _validate_compiled(block: dict, params: dict):
+    _assert_valid_rpc_request(**params, method_name="getStorageAt")
+    _assert_valid_rpc_schema(block, "getBlockWithTxHashes")
+
+
+def main():
+    """Main function"""
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    block_size = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    block = _block_with_tx_hashes(block_size)
+    params = {"contract_address": "0x1", "key": "0x02", "block_id": "latest"}
+
+    for name, function in [
+        ("uncompiled", _validate_uncompiled),
+        ("compiled", _validate_compiled),
+    ]:
+        function(block, params)  # warm up the caches
+        elapsed = timeit.timeit(lambda f=function: f(block, params), number=repetitions)
+        print(f"{name}: {elapsed / repetitions * 1000:.3f} ms per request")
+
+
+if __name__ == "__main__":
+    main()
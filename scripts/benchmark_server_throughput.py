@@ -0,0 +1,53 @@
+"""
+Script for measuring the throughput of a running devnet under concurrent read load.
+Compare the default mode with --persistent-event-loop by running it against each.
+Usage: python scripts/benchmark_server_throughput.py [URL] [CONCURRENCY] [REQUESTS_PER_CLIENT]
+"""
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+RPC_READS = [
+    {"method": "starknet_blockNumber", "params": {}},
+    {"method": "starknet_getBlockWithTxHashes", "params": {"block_id": "latest"}},
+    {"method": "starknet_chainId", "params": {}},
+]
+
+
+def _client(url: str, number_of_requests: int) -> int:
+    """Send requests over a single keep-alive connection; return the number of failures"""
+    failures = 0
+    with requests.Session() as session:
+        for i in range(number_of_requests):
+            body = {"jsonrpc": "2.0", "id": i, **RPC_READS[i % len(RPC_READS)]}
+            response = session.post(f"{url}/rpc", json=body)
+            if response.status_code != 200 or "error" in response.json():
+                failures += 1
+    return failures
+
+
+def main():
+    """Main function"""
+    url = sys.argv[1] if len(sys.argv) > 1 else "http://127.0.0.1:5050"
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    requests_per_client = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        failures = sum(
+            executor.map(
+                _client, [url] * concurrency, [requests_per_client] * concurrency
+            )
+        )
+    elapsed = time.perf_counter() - start
+
+    total = concurrency * requests_per_client
+    print(f"{total} requests by {concurrency} clients in {elapsed:.2f} s")
+    print(f"throughput: {total / elapsed:.1f} requests/s, failures: {failures}")
+
+
+if __name__ == "__main__":
+    main()
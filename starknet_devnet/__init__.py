@@ -107,3 +107,17 @@ elif not _cairo_vm or _cairo_vm == "python":
 
 else:
     sys.exit(f"Error: Invalid value of environment variable {_VM_VAR}: '{_cairo_vm}'")
+
+
+def _patch_class_hash_computation():
+    """
+    Memoize class hash computations by class content.
+    Applied after the VM patch, so that it wraps the functions of the selected VM.
+    """
+
+    from starknet_devnet.class_hashes import memoize_class_hash_computations
+
+    memoize_class_hash_computations()
+
+
+_patch_class_hash_computation()
@@ -0,0 +1,181 @@
+"""
+Admission control: bounds the work accepted by Devnet, so that under burst load
+requests are rejected fast instead of queueing until they time out.
+"""
+
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Dict
+
+from .util import OverloadedDevnetException
+
+MAX_RETRY_AFTER = 60  # seconds
+
+# weight of the latest sample in the moving averages of durations
+_SMOOTHING = 0.2
+
+
+class RequestClass(Enum):
+    """Classes of requests with separate concurrency limits"""
+
+    EXECUTE = "execute"
+    SIMULATE = "simulate"
+    READ = "read"
+
+
+@dataclass
+class AdmissionTicket:
+    """An admitted request"""
+
+    request_class: RequestClass
+    exclusive: bool
+    admitted_at: float = field(default_factory=time.monotonic)
+    granted_at: float = None
+
+
+@dataclass
+class _ClassStats:
+    in_flight: int = 0
+    admitted: int = 0
+    granted: int = 0
+    rejected: int = 0
+    total_wait_time: float = 0.0
+    max_wait_time: float = 0.0
+    average_duration: float = 0.0
+
+
+def _smoothed(average: float, sample: float) -> float:
+    """Return the exponential moving average updated with `sample`"""
+    if not average:
+        return sample
+    return average + _SMOOTHING * (sample - average)
+
+
+def _retry_after(expected_wait: float) -> int:
+    return min(max(math.ceil(expected_wait), 1), MAX_RETRY_AFTER)
+
+
+class AdmissionControl:
+    """
+    Admits requests before they wait for access to the global state.
+    Each request class has its own limit of requests being served at once (waiting or running);
+    requests over it are rejected with 429. Requests needing exclusive access (writes) also
+    count towards the bounded write queue while waiting; requests over it are rejected with 503.
+    A limit of 0 means no limit.
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.max_queued_writes = 0
+        self.limits: Dict[RequestClass, int] = {
+            request_class: 0 for request_class in RequestClass
+        }
+        self.__queued_writes = 0
+        self.__max_queued_writes_seen = 0
+        self.__write_duration = 0.0
+        self.__stats = {request_class: _ClassStats() for request_class in RequestClass}
+
+    def configure(self, max_queued_writes: int, limits: Dict[RequestClass, int]):
+        """Set the bounds; 0 means unbounded"""
+        self.max_queued_writes = max_queued_writes
+        self.limits.update(limits)
+
+    def admit(self, request_class: RequestClass, exclusive: bool) -> AdmissionTicket:
+        """
+        Admit a request of `request_class` or raise if Devnet is saturated.
+        The returned ticket must be passed to `granted` and `release`.
+        """
+        with self.__lock:
+            stats = self.__stats[request_class]
+            limit = self.limits[request_class]
+            if limit and stats.in_flight >= limit:
+                stats.rejected += 1
+                raise OverloadedDevnetException(
+                    message=f"Too many {request_class.value} requests in progress (limit: {limit}).",
+                    status_code=429,
+                    retry_after=_retry_after(stats.average_duration),
+                )
+
+            if exclusive:
+                if self.max_queued_writes and (
+                    self.__queued_writes >= self.max_queued_writes
+                ):
+                    stats.rejected += 1
+                    raise OverloadedDevnetException(
+                        message=f"Write queue is full ({self.max_queued_writes} requests).",
+                        status_code=503,
+                        retry_after=_retry_after(
+                            self.__queued_writes * self.__write_duration
+                        ),
+                    )
+                self.__queued_writes += 1
+                self.__max_queued_writes_seen = max(
+                    self.__max_queued_writes_seen, self.__queued_writes
+                )
+
+            stats.in_flight += 1
+            stats.admitted += 1
+            return AdmissionTicket(request_class, exclusive)
+
+    def granted(self, ticket: AdmissionTicket):
+        """Record that the request of `ticket` got access to the state"""
+        ticket.granted_at = time.monotonic()
+        wait_time = ticket.granted_at - ticket.admitted_at
+        with self.__lock:
+            if ticket.exclusive:
+                self.__queued_writes -= 1
+
+            stats = self.__stats[ticket.request_class]
+            stats.granted += 1
+            stats.total_wait_time += wait_time
+            stats.max_wait_time = max(stats.max_wait_time, wait_time)
+
+    def release(self, ticket: AdmissionTicket):
+        """Record that the request of `ticket` is done"""
+        now = time.monotonic()
+        with self.__lock:
+            stats = self.__stats[ticket.request_class]
+            stats.in_flight -= 1
+
+            if ticket.granted_at is None:
+                # failed before getting access to the state
+                if ticket.exclusive:
+                    self.__queued_writes -= 1
+                return
+
+            duration = now - ticket.granted_at
+            stats.average_duration = _smoothed(stats.average_duration, duration)
+            if ticket.exclusive:
+                self.__write_duration = _smoothed(self.__write_duration, duration)
+
+    def metrics(self) -> dict:
+        """Return the current queue depth, wait times and counters"""
+        with self.__lock:
+            classes = {}
+            for request_class, stats in self.__stats.items():
+                classes[request_class.value] = {
+                    "limit": self.limits[request_class],
+                    "in_flight": stats.in_flight,
+                    "admitted": stats.admitted,
+                    "rejected": stats.rejected,
+                    "average_wait_time": stats.total_wait_time / stats.granted
+                    if stats.granted
+                    else 0.0,
+                    "max_wait_time": stats.max_wait_time,
+                    "average_duration": stats.average_duration,
+                }
+
+            return {
+                "write_queue": {
+                    "depth": self.__queued_writes,
+                    "max_depth": self.__max_queued_writes_seen,
+                    "limit": self.max_queued_writes,
+                },
+                "classes": classes,
+            }
+
+
+admission = AdmissionControl()
@@ -302,6 +302,15 @@ class DevnetBlocks:
         self.__pending_signatures = None
         return block
 
+    def store_replicated(
+        self, block: StarknetBlock, state_update: BlockStateUpdate, state: StarknetState
+    ):
+        """Store a block accepted by another process, as the latest block"""
+        self.__num2hash[block.block_number] = block.block_hash
+        self.__hash2block[block.block_hash] = block
+        self.__state_updates[block.block_hash] = state_update
+        self.__state_archive.store(block.block_hash, state)
+
     def get_state(self, block_hash: int) -> StarknetState:
         """Return state at block with `number`"""
         return self.__state_archive.get(block_hash)
@@ -1,11 +1,24 @@
 """
 Base routes
 """
-from flask import Blueprint, Response, jsonify, request
+import json
+
+from flask import Blueprint, Response, request
 from starkware.starkware_utils.error_handling import StarkErrorCode
+from werkzeug.datastructures import MultiDict
 
+from starknet_devnet.admission import admission
+from starknet_devnet.blueprints.shared import lock_free
+from starknet_devnet.constants import DEFAULT_SUBSCRIPTION_QUEUE_SIZE
 from starknet_devnet.fee_token import FeeToken
+from starknet_devnet.json_encoding import json_response
 from starknet_devnet.state import state
+from starknet_devnet.subscriptions import (
+    DropPolicy,
+    SubscriptionFilter,
+    Topic,
+    subscriptions,
+)
 from starknet_devnet.util import (
     StarknetDevnetException,
     check_valid_dump_path,
@@ -135,7 +148,7 @@ async def increase_time():
     if not state.starknet_wrapper.pending_txs:
         state.starknet_wrapper.increase_block_time(time_s)
         block = await state.starknet_wrapper.generate_latest_block()
-        return jsonify(
+        return json_response(
             {"timestamp_increased_by": time_s, "block_hash": hex(block.block_hash)}
         )
 
@@ -156,7 +169,9 @@ async def set_time():
     if not state.starknet_wrapper.pending_txs:
         state.starknet_wrapper.set_block_time(time_s)
         block = await state.starknet_wrapper.generate_latest_block()
-        return jsonify({"block_timestamp": time_s, "block_hash": hex(block.block_hash)})
+        return json_response(
+            {"block_timestamp": time_s, "block_hash": hex(block.block_hash)}
+        )
 
     raise StarknetDevnetException(
         code=StarkErrorCode.MALFORMED_REQUEST,
@@ -171,14 +186,14 @@ async def get_balance():
     address = request.args.get("address", type=lambda x: int(x, 16))
 
     balance = await state.starknet_wrapper.fee_token.get_balance(address)
-    return jsonify({"amount": balance, "unit": "wei"})
+    return json_response({"amount": balance, "unit": "wei"})
 
 
 @base.route("/predeployed_accounts", methods=["GET"])
 def get_predeployed_accounts():
     """Get predeployed accounts"""
     accounts = state.starknet_wrapper.accounts
-    return jsonify([account.to_json() for account in accounts])
+    return json_response([account.to_json() for account in accounts])
 
 
 @base.route("/fee_token", methods=["GET"])
@@ -186,7 +201,7 @@ async def get_fee_token():
     """Get the address of the fee token"""
     fee_token_address = FeeToken.ADDRESS
     symbol = FeeToken.SYMBOL
-    return jsonify({"symbol": symbol, "address": hex(fee_token_address)})
+    return json_response({"symbol": symbol, "address": hex(fee_token_address)})
 
 
 @base.route("/mint", methods=["POST"])
@@ -203,7 +218,9 @@ async def mint():
     )
 
     new_balance = await state.starknet_wrapper.fee_token.get_balance(address)
-    return jsonify({"new_balance": new_balance, "unit": "wei", "tx_hash": tx_hash})
+    return json_response(
+        {"new_balance": new_balance, "unit": "wei", "tx_hash": tx_hash}
+    )
 
 
 @base.route("/create_block", methods=["POST"])
@@ -211,7 +228,7 @@ async def create_block():
     """Create block with pending transactions."""
     block = await state.starknet_wrapper.generate_latest_block()
 
-    return jsonify({"block_hash": hex(block.block_hash)})
+    return json_response({"block_hash": hex(block.block_hash)})
 
 
 @base.route("/fork_status", methods=["GET"])
@@ -219,8 +236,17 @@ async def fork_status():
     """Get fork status"""
     config = state.starknet_wrapper.config
     if config.fork_network:
-        return jsonify({"url": config.fork_network.url, "block": config.fork_block})
-    return jsonify({})
+        return json_response(
+            {"url": config.fork_network.url, "block": config.fork_block}
+        )
+    return json_response({})
+
+
+@base.route("/state_version", methods=["GET"])
+@lock_free
+def get_state_version():
+    """Get the version of the state, increasing with each change of the state"""
+    return json_response({"state_version": state.starknet_wrapper.state_version})
 
 
 @base.route("/abort_blocks", methods=["POST"])
@@ -232,4 +258,88 @@ async def abort_blocks():
     )
     aborted_blocks = await state.starknet_wrapper.abort_blocks(starting_block)
 
-    return jsonify({"aborted": aborted_blocks})
+    return json_response({"aborted": aborted_blocks})
+
+
+def _parse_subscription_filter(args: MultiDict) -> SubscriptionFilter:
+    """Parse filter of the subscription from query parameters"""
+    try:
+        topics = {Topic(topic) for topic in args.get("topics", "").split(",") if topic}
+        address = args.get("address")
+        keys = json.loads(args.get("keys", "[]"))
+        transaction_hashes = {
+            parse_hex_string(tx_hash) for tx_hash in args.getlist("transactionHash")
+        }
+
+        return SubscriptionFilter(
+            topics=topics or set(Topic),
+            address=parse_hex_string(address) if address is not None else None,
+            keys=[[parse_hex_string(key) for key in accepted] for accepted in keys],
+            transaction_hashes=transaction_hashes or None,
+        )
+    except (ValueError, TypeError, StarknetDevnetException) as error:
+        raise StarknetDevnetException(
+            code=StarkErrorCode.MALFORMED_REQUEST,
+            message=f"Invalid subscription filter: {error}",
+            status_code=400,
+        ) from error
+
+
+def _parse_drop_policy(args: MultiDict) -> DropPolicy:
+    raw_policy = args.get("dropPolicy", DropPolicy.DROP_OLDEST.value)
+    try:
+        return DropPolicy(raw_policy)
+    except ValueError as error:
+        valid_policies = ", ".join(policy.value for policy in DropPolicy)
+        raise StarknetDevnetException(
+            code=StarkErrorCode.MALFORMED_REQUEST,
+            message=f"Invalid dropPolicy: {raw_policy}. Valid policies: {valid_policies}",
+            status_code=400,
+        ) from error
+
+
+def _parse_queue_size(args: MultiDict) -> int:
+    raw_queue_size = args.get("queueSize", str(DEFAULT_SUBSCRIPTION_QUEUE_SIZE))
+    try:
+        queue_size = int(raw_queue_size)
+    except ValueError:
+        queue_size = None
+
+    if queue_size is None or not 0 < queue_size <= DEFAULT_SUBSCRIPTION_QUEUE_SIZE:
+        raise StarknetDevnetException(
+            code=StarkErrorCode.MALFORMED_REQUEST,
+            message=f"queueSize must be an integer between 1 and {DEFAULT_SUBSCRIPTION_QUEUE_SIZE}.",
+            status_code=400,
+        )
+    return queue_size
+
+
+@base.route("/admission_metrics", methods=["GET"])
+@lock_free
+def get_admission_metrics():
+    """Get the depth of the write queue and the waiting times of requests"""
+    return json_response(admission.metrics())
+
+
+@base.route("/subscribe", methods=["GET"])
+@lock_free
+def subscribe():
+    """Stream new blocks, transaction status changes and events as Server-Sent Events"""
+    subscription_filter = _parse_subscription_filter(request.args)
+    drop_policy = _parse_drop_policy(request.args)
+    queue_size = _parse_queue_size(request.args)
+    subscription = subscriptions.subscribe(
+        subscription_filter, queue_size=queue_size, drop_policy=drop_policy
+    )
+
+    def stream():
+        try:
+            yield from subscription.stream()
+        finally:
+            subscriptions.unsubscribe(subscription)
+
+    return Response(
+        stream(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
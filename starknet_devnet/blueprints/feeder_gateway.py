@@ -4,8 +4,9 @@ Feeder gateway routes.
 
 from typing import Type
 
-from flask import Blueprint, Response, jsonify, request
+from flask import Blueprint, request
 from marshmallow import ValidationError
+from starkware.starknet.services.api.contract_class.contract_class import ContractClass
 from starkware.starknet.services.api.feeder_gateway.request_objects import (
     CallFunction,
     CallL1Handler,
@@ -13,7 +14,6 @@ from starkware.starknet.services.api.feeder_gateway.request_objects import (
 from starkware.starknet.services.api.feeder_gateway.response_objects import (
     LATEST_BLOCK_ID,
     PENDING_BLOCK_ID,
-    BlockTransactionTraces,
     StarknetBlock,
     TransactionSimulationInfo,
 )
@@ -27,6 +27,20 @@ from starkware.starkware_utils.validated_dataclass import ValidatedMarshmallowDa
 from werkzeug.datastructures import MultiDict
 
 from starknet_devnet.blueprints.rpc.structures.types import BlockId
+from starknet_devnet.blueprints.shared import (
+    block_etag,
+    class_etag,
+    get_block_transaction_traces,
+    historical_if,
+    is_not_modified,
+    lock_free,
+    not_modified_response,
+    parse_wait_timeout,
+    read_only,
+    simulation,
+    tag_response,
+)
+from starknet_devnet.json_encoding import json_response
 from starknet_devnet.state import state
 from starknet_devnet.util import (
     StarknetDevnetException,
@@ -84,24 +98,6 @@ async def _get_block_object(args: MultiDict) -> StarknetBlock:
     return await state.starknet_wrapper.blocks.get_by_number(block_number)
 
 
-async def _get_block_transaction_traces(block: StarknetBlock):
-    traces = []
-    if block.transaction_receipts:
-        for transaction in block.transaction_receipts:
-            tx_hash = hex(transaction.transaction_hash)
-            trace = await state.starknet_wrapper.transactions.get_transaction_trace(
-                tx_hash
-            )
-
-            # expected trace is equal to response of get_transaction, but with the hash property
-            trace_dict = trace.dump()
-            trace_dict["transaction_hash"] = tx_hash
-            traces.append(trace_dict)
-
-    # assert correct structure
-    return BlockTransactionTraces.load({"traces": traces})
-
-
 def _get_block_id(args: MultiDict) -> BlockId:
     block_number = args.get("blockNumber")
     block_hash = args.get("blockHash")
@@ -120,25 +116,34 @@ def _get_block_id(args: MultiDict) -> BlockId:
     return {"block_number": block_number}
 
 
-def _get_skip_validate(args: MultiDict) -> bool:
-    skip_validate = args.get("skipValidate")
+def _get_boolean_arg(args: MultiDict, name: str) -> bool:
+    value = args.get(name)
 
-    if skip_validate == "true":
+    if value == "true":
         return True
 
-    if skip_validate == "false":
+    if value == "false":
         return False
 
     # default case (user did not specify)
-    if skip_validate is None:
+    if value is None:
         return False
 
     raise StarknetDevnetException(
         code=StarkErrorCode.MALFORMED_REQUEST,
-        message=f"Invalid value for skipValidate: {skip_validate}. Should be true or false.",
+        message=f"Invalid value for {name}: {value}. Should be true or false.",
     )
 
 
+def _get_skip_validate(args: MultiDict) -> bool:
+    return _get_boolean_arg(args, "skipValidate")
+
+
+def _is_historical_request() -> bool:
+    """Return `True` if the request is executed at an accepted block, not the latest or pending"""
+    return isinstance(_get_block_id(request.args), dict)
+
+
 @feeder_gateway.route("/get_contract_addresses", methods=["GET"])
 def get_contract_addresses():
     """Endpoint that returns an object containing the addresses of key system components."""
@@ -146,6 +151,8 @@ def get_contract_addresses():
 
 
 @feeder_gateway.route("/call_contract", methods=["POST"])
+@read_only
+@historical_if(_is_historical_request)
 async def call_contract():
     """
     Endpoint for receiving calls (not invokes) of contract functions.
@@ -162,21 +169,26 @@ async def call_contract():
         call_specifications = validate_request(data, InvokeFunction)
 
     result_dict = await state.starknet_wrapper.call(call_specifications, block_id)
-    return jsonify(result_dict)
+    return json_response(result_dict)
 
 
 @feeder_gateway.route("/get_block", methods=["GET"])
+@read_only
 async def get_block():
     """Endpoint for retrieving a block identified by its hash or number."""
 
     block = await _get_block_object(request.args)
+    etag = block_etag(block)
+    if is_not_modified(etag):
+        return not_modified_response(etag)
+
     block_dump = block.dump()
 
     # This is a hack to fix StarknetBlock.loads(data=raw_response)
     if "transaction_receipts" not in block_dump:
         block_dump["transaction_receipts"] = None
 
-    return jsonify(block_dump)
+    return tag_response(json_response(block_dump), etag)
 
 
 @feeder_gateway.route("/get_block_traces", methods=["GET"])
@@ -184,8 +196,12 @@ async def get_block_traces():
     """Returns the traces of the transactions in the specified block."""
 
     block = await _get_block_object(request.args)
-    block_transaction_traces = await _get_block_transaction_traces(block)
-    return jsonify(block_transaction_traces.dump())
+    etag = block_etag(block)
+    if is_not_modified(etag):
+        return not_modified_response(etag)
+
+    block_transaction_traces = await get_block_transaction_traces(block)
+    return tag_response(json_response(block_transaction_traces), etag)
 
 
 @feeder_gateway.route("/get_code", methods=["GET"])
@@ -198,7 +214,7 @@ async def get_code():
 
     contract_address = request.args.get("contractAddress", type=parse_hex_string)
     code_dict = await state.starknet_wrapper.get_code(contract_address, block_id)
-    return jsonify(code_dict)
+    return json_response(code_dict)
 
 
 @feeder_gateway.route("/get_full_contract", methods=["GET"])
@@ -217,7 +233,7 @@ async def get_full_contract():
     if class_program and class_program.get("debug_info"):
         class_program["debug_info"] = None
 
-    return jsonify(contract_class)
+    return json_response(contract_class)
 
 
 @feeder_gateway.route("/get_class_hash_at", methods=["GET"])
@@ -226,7 +242,7 @@ async def get_class_hash_at():
 
     contract_address = request.args.get("contractAddress", type=parse_hex_string)
     class_hash = await state.starknet_wrapper.get_class_hash_at(contract_address)
-    return jsonify(fixed_length_hex(class_hash))
+    return json_response(fixed_length_hex(class_hash))
 
 
 @feeder_gateway.route("/get_class_by_hash", methods=["GET"])
@@ -234,24 +250,42 @@ async def get_class_by_hash():
     """Get contract class by class hash"""
 
     class_hash = request.args.get("classHash", type=parse_hex_string)
+    # the tag depends only on the hash, so a class declared in devnet isn't fetched
+    # if the client has it; any other class is fetched first, to report it if it's unknown
+    etag = class_etag(class_hash)
+    local_class = state.starknet_wrapper.get_local_contract_class(class_hash)
+    if local_class is not None and is_not_modified(etag):
+        return not_modified_response(etag)
+
     class_dict = await state.starknet_wrapper.get_class_by_hash(class_hash)
     # if isinstance(contract_class, DeprecatedCompiledClass):
     #     contract_class = contract_class.remove_debug_info()
 
-    return jsonify(class_dict)
+    if is_not_modified(etag):
+        return not_modified_response(etag)
+    return tag_response(json_response(class_dict), etag)
 
 
 @feeder_gateway.route("/get_compiled_class_by_class_hash", methods=["GET"])
 async def get_compiled_class_by_hash():
     """Get compiled class by class hash (sierra hash)"""
     class_hash = request.args.get("classHash", type=parse_hex_string)
+    # only sierra classes have a compiled class, others are reported as undeclared
+    etag = class_etag(class_hash)
+    local_class = state.starknet_wrapper.get_local_contract_class(class_hash)
+    if isinstance(local_class, ContractClass) and is_not_modified(etag):
+        return not_modified_response(etag)
+
     compiled_class = await state.starknet_wrapper.get_compiled_class_by_class_hash(
         class_hash
     )
-    return jsonify(compiled_class.dump())
+    if is_not_modified(etag):
+        return not_modified_response(etag)
+    return tag_response(json_response(compiled_class.dump()), etag)
 
 
 @feeder_gateway.route("/get_storage_at", methods=["GET"])
+@read_only
 async def get_storage_at():
     """Endpoint for returning the storage identified by `key` from the contract at"""
     block_id = _get_block_id(request.args)
@@ -262,7 +296,7 @@ async def get_storage_at():
     storage = await state.starknet_wrapper.get_storage_at(
         contract_address, key, block_id
     )
-    return jsonify(storage)
+    return json_response(storage)
 
 
 @feeder_gateway.route("/get_transaction_status", methods=["GET"])
@@ -275,7 +309,31 @@ async def get_transaction_status():
     tx_status = await state.starknet_wrapper.transactions.get_transaction_status(
         transaction_hash
     )
-    return jsonify(tx_status)
+    return json_response(tx_status)
+
+
+@feeder_gateway.route("/wait_for_transaction", methods=["GET"])
+@lock_free
+async def wait_for_transaction():
+    """
+    Waits until the transaction identified by the transactionHash argument is accepted or rejected,
+    or until the timeout argument (in seconds) expires. Returns the last known transaction status.
+    """
+
+    transaction_hash = request.args.get("transactionHash")
+    try:
+        timeout = parse_wait_timeout(request.args.get("timeout"))
+    except ValueError as err:
+        raise StarknetDevnetException(
+            code=StarkErrorCode.MALFORMED_REQUEST,
+            message=str(err),
+            status_code=400,
+        ) from err
+
+    tx_status = await state.starknet_wrapper.transactions.wait_for_transaction_status(
+        transaction_hash, timeout
+    )
+    return json_response(tx_status)
 
 
 @feeder_gateway.route("/get_transaction", methods=["GET"])
@@ -288,9 +346,51 @@ async def get_transaction():
     transaction_info = await state.starknet_wrapper.transactions.get_transaction(
         transaction_hash
     )
-    return Response(
-        response=transaction_info.dumps(), status=200, mimetype="application/json"
+    return json_response(transaction_info.dump())
+
+
+@feeder_gateway.route("/get_transactions_by_account", methods=["GET"])
+async def get_transactions_by_account():
+    """
+    Returns the transactions sent by the account identified by the contractAddress argument in the GET request.
+    """
+
+    contract_address = request.args.get("contractAddress", type=parse_hex_string)
+    transactions = state.starknet_wrapper.transactions.get_transactions_by_account(
+        contract_address
+    )
+    return json_response(
+        {"transactions": [transaction.dump() for transaction in transactions]}
+    )
+
+
+@feeder_gateway.route("/get_transaction_by_sender_and_nonce", methods=["GET"])
+async def get_transaction_by_sender_and_nonce():
+    """
+    Returns the transaction identified by the senderAddress and nonce arguments in the GET request.
+    """
+
+    sender_address = request.args.get("senderAddress", type=parse_hex_string)
+    nonce = validate_int(request.args, "nonce")
+    transaction_info = (
+        state.starknet_wrapper.transactions.get_transaction_by_sender_and_nonce(
+            sender_address, nonce
+        )
+    )
+    return json_response(transaction_info.dump())
+
+
+@feeder_gateway.route("/get_declare_transaction", methods=["GET"])
+async def get_declare_transaction():
+    """
+    Returns the transaction which declared the class identified by the classHash argument in the GET request.
+    """
+
+    class_hash = request.args.get("classHash", type=parse_hex_string)
+    transaction_info = state.starknet_wrapper.transactions.get_declare_transaction(
+        class_hash
     )
+    return json_response(transaction_info.dump())
 
 
 @feeder_gateway.route("/get_transaction_receipt", methods=["GET"])
@@ -303,9 +403,7 @@ async def get_transaction_receipt():
     tx_receipt = await state.starknet_wrapper.transactions.get_transaction_receipt(
         transaction_hash
     )
-    return Response(
-        response=tx_receipt.dumps(), status=200, mimetype="application/json"
-    )
+    return json_response(tx_receipt.dump())
 
 
 @feeder_gateway.route("/get_transaction_trace", methods=["GET"])
@@ -319,9 +417,7 @@ async def get_transaction_trace():
         transaction_hash
     )
 
-    return Response(
-        response=transaction_trace.dumps(), status=200, mimetype="application/json"
-    )
+    return json_response(transaction_trace.dump())
 
 
 @feeder_gateway.route("/get_state_update", methods=["GET"])
@@ -338,10 +434,13 @@ async def get_state_update():
     )
 
     assert state_update is not None
-    return jsonify(state_update.dump())
+    return json_response(state_update.dump())
 
 
 @feeder_gateway.route("/estimate_fee", methods=["POST"])
+@simulation
+@read_only
+@historical_if(_is_historical_request)
 async def estimate_fee():
     """Returns the estimated fee for a transaction."""
     data = request.get_data()
@@ -357,10 +456,13 @@ async def estimate_fee():
     _, fee_response = await state.starknet_wrapper.calculate_trace_and_fee(
         transaction, skip_validate=skip_validate, block_id=block_id
     )
-    return jsonify(fee_response)
+    return json_response(fee_response)
 
 
 @feeder_gateway.route("/estimate_fee_bulk", methods=["POST"])
+@simulation
+@read_only
+@historical_if(_is_historical_request)
 async def estimate_fee_bulk():
     """Returns the estimated fee for a bulk of transactions."""
 
@@ -373,16 +475,20 @@ async def estimate_fee_bulk():
 
     block_id = _get_block_id(request.args)
     skip_validate = _get_skip_validate(request.args)
+    independent = _get_boolean_arg(request.args, "independent")
 
     _, fee_responses, _ = await state.starknet_wrapper.calculate_traces_and_fees(
         transactions,
         block_id=block_id,
         skip_validate=skip_validate,
+        independent=independent,
     )
-    return jsonify(fee_responses)
+    return json_response(fee_responses)
 
 
 @feeder_gateway.route("/simulate_transaction", methods=["POST"])
+@simulation
+@historical_if(_is_historical_request)
 async def simulate_transaction():
     """Returns the estimated fee for a transaction."""
     transaction = validate_request(request.get_data(), AccountTransaction)
@@ -399,7 +505,7 @@ async def simulate_transaction():
         trace=trace, fee_estimation=fee_response
     )
 
-    return jsonify(simulation_info.dump())
+    return json_response(simulation_info.dump())
 
 
 @feeder_gateway.route("/get_nonce", methods=["GET"])
@@ -410,10 +516,11 @@ async def get_nonce():
     contract_address = request.args.get("contractAddress", type=parse_hex_string)
     nonce = await state.starknet_wrapper.get_nonce(contract_address, block_id)
 
-    return jsonify(hex(nonce))
+    return json_response(hex(nonce))
 
 
 @feeder_gateway.route("/estimate_message_fee", methods=["POST"])
+@simulation
 async def estimate_message_fee():
     """Message fee estimation endpoint"""
 
@@ -421,4 +528,4 @@ async def estimate_message_fee():
 
     call = validate_request(request.get_data(), CallL1Handler)
     fee_estimation = await state.starknet_wrapper.estimate_message_fee(call, block_id)
-    return jsonify(fee_estimation)
+    return json_response(fee_estimation)
@@ -5,18 +5,26 @@ Gateway routes
 from flask import Blueprint, jsonify, request
 from starkware.starknet.definitions.error_codes import StarknetErrorCode
 from starkware.starknet.definitions.transaction_type import TransactionType
+from starkware.starknet.services.api.gateway.transaction import Declare
 from starkware.starkware_utils.error_handling import StarkErrorCode
 
 from starknet_devnet.devnet_config import DumpOn
 from starknet_devnet.state import state
 from starknet_devnet.util import StarknetDevnetException, fixed_length_hex
 
-from .shared import validate_transaction
+from .shared import prepare_with, validate_transaction
 
 gateway = Blueprint("gateway", __name__, url_prefix="/gateway")
 
 
+def _precompile_declared_class():
+    transaction = validate_transaction(request.get_data())
+    if isinstance(transaction, Declare):
+        state.starknet_wrapper.precompile(transaction.contract_class)
+
+
 @gateway.route("/add_transaction", methods=["POST"])
+@prepare_with(_precompile_declared_class)
 async def add_transaction():
     """Endpoint for accepting (state-changing) transactions."""
 
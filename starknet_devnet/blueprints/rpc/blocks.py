@@ -4,7 +4,11 @@ RPC block endpoints
 from starknet_devnet.blueprints.rpc.schema import validate_schema
 from starknet_devnet.blueprints.rpc.structures.payloads import rpc_block
 from starknet_devnet.blueprints.rpc.structures.types import BlockId, RpcError
-from starknet_devnet.blueprints.rpc.utils import get_block_by_block_id, rpc_felt
+from starknet_devnet.blueprints.rpc.utils import (
+    cached_block_response,
+    get_block_by_block_id,
+    rpc_felt,
+)
 from starknet_devnet.state import state
 
 
@@ -14,7 +18,9 @@ async def get_block_with_tx_hashes(block_id: BlockId) -> dict:
     Get block information with transaction hashes given the block id
     """
     block = await get_block_by_block_id(block_id)
-    return await rpc_block(block=block)
+    return await cached_block_response(
+        ("getBlockWithTxHashes", "TXN_HASH"), block, lambda: rpc_block(block=block)
+    )
 
 
 @validate_schema("getBlockWithTxs")
@@ -23,7 +29,11 @@ async def get_block_with_txs(block_id: BlockId) -> dict:
     Get block information with full transactions given the block id
     """
     block = await get_block_by_block_id(block_id)
-    return await rpc_block(block=block, tx_type="FULL_TXNS")
+    return await cached_block_response(
+        ("getBlockWithTxs", "FULL_TXNS"),
+        block,
+        lambda: rpc_block(block=block, tx_type="FULL_TXNS"),
+    )
 
 
 @validate_schema("blockNumber")
@@ -41,7 +41,7 @@ async def call(request: RpcFunctionCall, block_id: BlockId) -> List[Felt]:
     await assert_block_id_is_valid(block_id)
 
     if not await state.starknet_wrapper.is_deployed(
-        int(request["contract_address"], 16)
+        int(request["contract_address"], 16), block_id
     ):
         raise RpcError.from_spec_name("CONTRACT_NOT_FOUND")
 
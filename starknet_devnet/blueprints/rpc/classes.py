@@ -4,7 +4,10 @@ RPC classes endpoints
 from starkware.starkware_utils.error_handling import StarkException
 
 from starknet_devnet.blueprints.rpc.schema import validate_schema
-from starknet_devnet.blueprints.rpc.structures.payloads import contract_class_from_dict
+from starknet_devnet.blueprints.rpc.structures.payloads import (
+    contract_class_from_dict,
+    contract_class_from_object,
+)
 from starknet_devnet.blueprints.rpc.structures.types import (
     Address,
     BlockId,
@@ -12,8 +15,37 @@ from starknet_devnet.blueprints.rpc.structures.types import (
     RpcError,
 )
 from starknet_devnet.blueprints.rpc.utils import assert_block_id_is_valid, rpc_felt
+from starknet_devnet.constants import RPC_CONTRACT_CLASS_CACHE_SIZE
 from starknet_devnet.state import state
-from starknet_devnet.util import StarknetDevnetException
+from starknet_devnet.util import Invalidation, LRUCache, StarknetDevnetException
+
+# keyed by class hash; entries are owned by the local class object or by the origin
+_rpc_contract_class_cache = LRUCache(
+    maxsize=RPC_CONTRACT_CLASS_CACHE_SIZE, invalidation=Invalidation.OWNER
+)
+
+
+async def _get_rpc_contract_class(class_hash: int) -> dict:
+    """
+    Get the contract class in rpc format. The conversion is done once per class,
+    classes of the forking origin are also fetched only once.
+    """
+    starknet_wrapper = state.starknet_wrapper
+    contract_class = starknet_wrapper.get_local_contract_class(class_hash)
+    owner = starknet_wrapper.origin if contract_class is None else contract_class
+
+    rpc_contract_class = _rpc_contract_class_cache.get(class_hash, source=owner)
+    if rpc_contract_class is not None:
+        return rpc_contract_class
+
+    if contract_class is None:
+        class_dict = await starknet_wrapper.origin.get_class_by_hash(class_hash)
+        rpc_contract_class = contract_class_from_dict(class_dict)
+    else:
+        rpc_contract_class = contract_class_from_object(contract_class)
+
+    _rpc_contract_class_cache.set(class_hash, rpc_contract_class, source=owner)
+    return rpc_contract_class
 
 
 @validate_schema("getClass")
@@ -24,14 +56,10 @@ async def get_class(block_id: BlockId, class_hash: Felt) -> dict:
     await assert_block_id_is_valid(block_id)  # T O D O   unused
 
     try:
-        result_dict = await state.starknet_wrapper.get_class_by_hash(
-            class_hash=int(class_hash, 16)
-        )
+        return await _get_rpc_contract_class(int(class_hash, 16))
     except StarknetDevnetException as ex:
         raise RpcError.from_spec_name("CLASS_HASH_NOT_FOUND") from ex
 
-    return contract_class_from_dict(result_dict)
-
 
 @validate_schema("getClassHashAt")
 async def get_class_hash_at(block_id: BlockId, contract_address: Address) -> Felt:
@@ -58,10 +86,9 @@ async def get_class_at(block_id: BlockId, contract_address: Address) -> dict:
     await assert_block_id_is_valid(block_id)
 
     try:
-        result_dict = await state.starknet_wrapper.get_class_by_address(
+        class_hash = await state.starknet_wrapper.get_class_hash_at(
             int(contract_address, 16), block_id
         )
+        return await _get_rpc_contract_class(class_hash)
     except StarkException as ex:
         raise RpcError.from_spec_name("CONTRACT_NOT_FOUND") from ex
-
-    return contract_class_from_dict(result_dict)
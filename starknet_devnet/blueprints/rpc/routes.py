@@ -6,10 +6,12 @@ https://github.com/starkware-libs/starknet-specs/releases/tag/v0.1.0
 
 from __future__ import annotations
 
+import asyncio
 import inspect
-from typing import Callable, Dict, List, Tuple, Union
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
-from flask import Blueprint, request
+from flask import Blueprint, Response, request
+from starkware.starknet.services.api.contract_class.contract_class import ContractClass
 
 from starknet_devnet.blueprints.rpc.blocks import (
     block_hash_and_number,
@@ -36,6 +38,10 @@ from starknet_devnet.blueprints.rpc.structures.types import (
     PredefinedRpcErrorCode,
     RpcError,
 )
+from starknet_devnet.blueprints.rpc.traces import (
+    trace_block_transactions,
+    trace_transaction,
+)
 from starknet_devnet.blueprints.rpc.transactions import (
     add_declare_transaction,
     add_deploy_account_transaction,
@@ -46,8 +52,18 @@ from starknet_devnet.blueprints.rpc.transactions import (
     get_transaction_receipt,
     pending_transactions,
     simulate_transaction,
+    wait_for_transaction,
 )
 from starknet_devnet.blueprints.rpc.utils import rpc_error, rpc_response
+from starknet_devnet.blueprints.shared import (
+    historical_if,
+    lock_free_if,
+    prepare_with,
+    read_only_if,
+    simulation_if,
+)
+from starknet_devnet.json_encoding import json_response
+from starknet_devnet.state import state
 from starknet_devnet.util import StarknetDevnetException
 
 methods = {
@@ -75,20 +91,193 @@ methods = {
     "addDeclareTransaction": add_declare_transaction,
     "addDeployAccountTransaction": add_deploy_account_transaction,
     "simulateTransaction": simulate_transaction,
+    "traceTransaction": trace_transaction,
+    "traceBlockTransactions": trace_block_transactions,
+    "devnet_waitForTransaction": wait_for_transaction,
+}
+
+# Methods which wait server-side, so they mustn't block other requests;
+# they can only be batched with each other, since a batch of other methods holds the state lock
+LOCK_FREE_METHODS = {"devnet_waitForTransaction"}
+
+# Methods which only read the state, so they may run concurrently with each other
+READ_ONLY_METHODS = {
+    "call",
+    "estimateFee",
+    "getStorageAt",
+    "getBlockWithTxHashes",
+    "getBlockWithTxs",
+    "getEvents",
+}
+
+# Methods which simulate transactions, limited separately by admission control
+SIMULATION_METHODS = {"estimateFee", "simulateTransaction"}
+
+# Methods which, given an accepted block, only read its archived state
+HISTORICAL_METHODS = {"call", "estimateFee", "simulateTransaction"}
+
+# Methods which change the state; in a batch, they are executed one by one in submission order
+WRITE_METHODS = {
+    "addInvokeTransaction",
+    "addDeclareTransaction",
+    "addDeployAccountTransaction",
 }
 
 rpc = Blueprint("rpc", __name__, url_prefix="/rpc")
 
 
+def _method_name(body) -> Optional[str]:
+    if not isinstance(body, dict) or not isinstance(body.get("method"), str):
+        return None
+    return body["method"].replace("starknet_", "")
+
+
+def _is_lock_free_request() -> bool:
+    body = request.get_json(silent=True)
+    if isinstance(body, list):
+        return bool(body) and all(
+            _method_name(entry) in LOCK_FREE_METHODS for entry in body
+        )
+    return _method_name(body) in LOCK_FREE_METHODS
+
+
+def _is_read_only_request() -> bool:
+    body = request.get_json(silent=True)
+    if isinstance(body, list):
+        return bool(body) and all(
+            _method_name(entry) in READ_ONLY_METHODS for entry in body
+        )
+    return _method_name(body) in READ_ONLY_METHODS
+
+
+def _is_simulation_request() -> bool:
+    body = request.get_json(silent=True)
+    entries = body if isinstance(body, list) else [body]
+    return any(_method_name(entry) in SIMULATION_METHODS for entry in entries)
+
+
+def _param(body: dict, name: str):
+    params = body.get("params")
+    if isinstance(params, dict):
+        return params.get(name)
+    if isinstance(params, list):
+        param_names = list(inspect.signature(methods[_method_name(body)]).parameters)
+        position = param_names.index(name)
+        return params[position] if position < len(params) else None
+    return None
+
+
+def _is_historical_request() -> bool:
+    body = request.get_json(silent=True)
+    entries = body if isinstance(body, list) else [body]
+    return bool(entries) and all(
+        _method_name(entry) in HISTORICAL_METHODS
+        and isinstance(_param(entry, "block_id"), dict)
+        for entry in entries
+    )
+
+
+def _precompile_declared_classes():
+    body = request.get_json(silent=True)
+    entries = body if isinstance(body, list) else [body]
+    for entry in entries:
+        if _method_name(entry) != "addDeclareTransaction":
+            continue
+        declare_transaction = _param(entry, "declare_transaction")
+        contract_class = declare_transaction.get("contract_class")
+        # only Sierra classes are compiled
+        if "sierra_program" in contract_class:
+            state.starknet_wrapper.precompile(
+                ContractClass.load({"abi": "", **contract_class})
+            )
+
+
 @rpc.route("", methods=["POST"])
+@lock_free_if(_is_lock_free_request)
+@read_only_if(_is_read_only_request)
+@simulation_if(_is_simulation_request)
+@historical_if(_is_historical_request)
+@prepare_with(_precompile_declared_classes)
 async def base_route():
     """
     Base route for RPC calls
     """
+    body = request.json
+    if isinstance(body, list):
+        responses = await _handle_batch(body)
+        if responses == []:
+            # a batch of notifications only is answered with nothing at all
+            return Response(status=204)
+        return json_response(responses)
+
+    response = await _handle_request(body)
+    if _is_notification(body):
+        return Response(status=204)
+    return json_response(response)
+
+
+async def _handle_batch(batch: list) -> Union[dict, List[dict]]:
+    """
+    Handle a batch of rpc calls. Consecutive read calls are awaited together on the event loop
+    of the request, they all see the same state since nothing else modifies it in the meantime.
+    Write calls are executed one by one in submission order, each of them after the reads
+    submitted before it. Notifications (calls without an id) are executed, but not answered.
+    """
+    if not batch:
+        return rpc_error(
+            message_id=None,
+            code=PredefinedRpcErrorCode.INVALID_REQUEST.value,
+            message="Invalid request",
+        )
+
+    # waiting while holding the state lock would block the transactions waited for
+    reject_lock_free = not all(
+        _method_name(body) in LOCK_FREE_METHODS for body in batch
+    )
+
+    responses = []
+    pending_reads = []
+    for body in batch:
+        if reject_lock_free and _method_name(body) in LOCK_FREE_METHODS:
+            pending_reads.append(_reject_lock_free_request(body))
+        elif _method_name(body) in WRITE_METHODS:
+            responses.extend(await asyncio.gather(*pending_reads))
+            pending_reads = []
+            responses.append(await _handle_request(body))
+        else:
+            pending_reads.append(_handle_request(body))
+
+    responses.extend(await asyncio.gather(*pending_reads))
+    return [
+        response
+        for body, response in zip(batch, responses)
+        if not _is_notification(body)
+    ]
+
+
+def _is_notification(body) -> bool:
+    return _method_name(body) is not None and "id" not in body
+
+
+async def _reject_lock_free_request(body: dict) -> dict:
+    return rpc_error(
+        message_id=body.get("id"),
+        code=PredefinedRpcErrorCode.INVALID_REQUEST.value,
+        message=f"{body['method']} can't be batched with other methods",
+    )
+
+
+async def _handle_request(body: dict) -> dict:
+    """
+    Handle a single rpc call, return the rpc response
+    """
 
     message_id = None
+    if _is_notification(body):
+        body = {**body, "id": None}
+
     try:
-        method, params, message_id = parse_body(request.json)
+        method, params, message_id = parse_body(body)
         result = await (
             method(*params) if isinstance(params, list) else method(**params)
         )
@@ -126,7 +315,7 @@ def parse_body(body: dict) -> Tuple[Callable, Union[List, dict], int]:
         method_name = body["method"].replace("starknet_", "")
         params: Union[List, dict] = body.get("params") or {}
         message_id = body["id"]
-    except RuntimeError as error:
+    except (RuntimeError, KeyError, TypeError, AttributeError) as error:
         raise RpcError(
             code=PredefinedRpcErrorCode.INVALID_REQUEST.value, message="Invalid request"
         ) from error
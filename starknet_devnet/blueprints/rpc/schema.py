@@ -1,6 +1,8 @@
 """
 Utilities for validating RPC responses against RPC specification
 """
+import copy
+import itertools
 import json
 from collections import OrderedDict
 from functools import lru_cache, wraps
@@ -9,28 +11,96 @@ from typing import Any, Dict, List
 from typing import OrderedDict as OrderedDictType
 from typing import Tuple
 
-from jsonschema import validate
-from jsonschema.exceptions import ValidationError
+from jsonschema.exceptions import ValidationError, best_match
+from jsonschema.protocols import Validator
+from jsonschema.validators import validator_for
 
 from starknet_devnet.blueprints.rpc.rpc_spec import RPC_SPECIFICATION
 from starknet_devnet.blueprints.rpc.rpc_spec_write import RPC_SPECIFICATION_WRITE
 from starknet_devnet.blueprints.rpc.rpc_trace_spec import RPC_SPECIFICATION_TRACE
 from starknet_devnet.state import state
 
+# Devnet extension: optional server-side filtering of invocations returned by trace methods
+TRACE_FILTER_PARAMS = [
+    {
+        "name": "contract_address",
+        "required": False,
+        "schema": {"$ref": "#/components/schemas/ADDRESS"},
+    },
+    {
+        "name": "max_depth",
+        "required": False,
+        "schema": {"type": "integer", "minimum": 0},
+    },
+]
+# Invocations present in traces of any transaction type
+SHARED_TRACE_INVOCATIONS = ["validate_invocation", "fee_transfer_invocation"]
+FILTERABLE_TRACE_METHODS = [
+    "starknet_traceTransaction",
+    "starknet_traceBlockTransactions",
+]
+
+# Devnet extension: simulating each transaction against the same state, rather than
+# against the state resulting from the previous one
+INDEPENDENT_PARAM = {
+    "name": "independent",
+    "required": False,
+    "schema": {"type": "boolean"},
+}
+INDEPENDENT_SIMULATION_METHODS = [
+    "starknet_estimateFee",
+    "starknet_simulateTransaction",
+]
+
+
+def _load_trace_specs() -> Dict[str, Any]:
+    """
+    Load the trace api specification, adapted for validation together with the main api:
+    references to the main api are made local, trace variants are made mutually exclusive
+    for their oneOf (by requiring their own invocation and forbidding the others),
+    invocations may be null (if they didn't happen) and filter params are added.
+    """
+    trace_specs_json = json.loads(
+        RPC_SPECIFICATION_TRACE.replace("./api/starknet_api_openrpc.json#", "#")
+    )
+
+    trace_schema = trace_specs_json["components"]["schemas"]["TRANSACTION_TRACE"]
+    for variant in trace_schema["oneOf"]:
+        variant["required"] = [
+            key for key in variant["properties"] if key not in SHARED_TRACE_INVOCATIONS
+        ]
+        variant["additionalProperties"] = False
+        for key, invocation_schema in variant["properties"].items():
+            variant["properties"][key] = {
+                "oneOf": [invocation_schema, {"type": "null"}]
+            }
+
+    for method in trace_specs_json["methods"]:
+        if method["name"] in FILTERABLE_TRACE_METHODS:
+            method["params"].extend(copy.deepcopy(TRACE_FILTER_PARAMS))
+
+    return trace_specs_json
+
 
 # Cache the function result so schemas are not reloaded from disk on every call
 @lru_cache
 def _load_schemas() -> Tuple[Dict[str, Any], Dict[str, Any]]:
     specs_json = json.loads(RPC_SPECIFICATION)
     write_specs_json = json.loads(RPC_SPECIFICATION_WRITE)
-    trace_specs_json = json.loads(RPC_SPECIFICATION_TRACE)
-    schemas = specs_json["components"]["schemas"]
+    trace_specs_json = _load_trace_specs()
+    # trace api schemas which alias the main api ones are shadowed by them
+    schemas = {
+        **trace_specs_json["components"]["schemas"],
+        **specs_json["components"]["schemas"],
+    }
 
     methods = {
         **_extract_methods(specs_json),
         **_extract_methods(write_specs_json),
         **_extract_methods(trace_specs_json),
     }
+    for name in INDEPENDENT_SIMULATION_METHODS:
+        methods[name]["params"].append(copy.deepcopy(INDEPENDENT_PARAM))
 
     return methods, schemas
 
@@ -118,12 +188,42 @@ def _request_schemas_for_method(name: str) -> OrderedDictType[str, Any]:
     return request_schemas
 
 
+def _compile_validator(schema: Dict[str, Any]) -> Validator:
+    """
+    Create a validator which can be reused for validating any number of instances against
+    `schema`; resolved references are cached by its resolver.
+    """
+    return validator_for(schema)(schema)
+
+
+def _validate(validator: Validator, data: Any):
+    """
+    Raise the most relevant ValidationError if `data` is invalid, like `jsonschema.validate`
+    """
+    error = best_match(validator.iter_errors(data))
+    if error is not None:
+        raise error
+
+
+@lru_cache
+def _response_validator_for_method(name: str) -> Validator:
+    return _compile_validator(_response_schema_for_method(name))
+
+
+@lru_cache
+def _request_validators_for_method(name: str) -> OrderedDictType[str, Validator]:
+    return OrderedDict(
+        (param_name, _compile_validator(schema))
+        for param_name, schema in _request_schemas_for_method(name).items()
+    )
+
+
 def _assert_valid_rpc_schema(data: Dict[str, Any], method_name: str):
     """
     Check if rpc response is valid against the schema for given method name
     """
-    schema = _response_schema_for_method("starknet_" + method_name)
-    validate(data, schema=schema)
+    validator = _response_validator_for_method("starknet_" + method_name)
+    _validate(validator, data)
 
 
 def _assert_valid_rpc_request(*args, method_name: str, **kwargs):
@@ -133,6 +233,7 @@ def _assert_valid_rpc_request(*args, method_name: str, **kwargs):
     Raise ValidationError if not.
     """
     schemas = _request_schemas_for_method("starknet_" + method_name)
+    validators = _request_validators_for_method("starknet_" + method_name)
 
     if args and kwargs:
         raise ValueError("Cannot validate schemas with both args and kwargs provided.")
@@ -143,9 +244,11 @@ def _assert_valid_rpc_request(*args, method_name: str, **kwargs):
 
         for name, arg in zip_longest(schemas.keys(), args, fillvalue="missing"):
             if arg == "missing":
+                if not schemas[name]["is_required"]:
+                    continue
                 raise ValidationError(f"""Missing positional argument \"{name}\".""")
 
-            validate(arg, schemas[name])
+            _validate(validators[name], arg)
         return
 
     if kwargs:
@@ -159,7 +262,7 @@ def _assert_valid_rpc_request(*args, method_name: str, **kwargs):
                 continue
 
             value = kwargs[name]
-            validate(value, schema)
+            _validate(validators[name], value)
         return
 
     if len(schemas) != 0:
@@ -206,6 +309,17 @@ def felt_pattern_from_schema() -> str:
     return schemas["FELT"]["pattern"]
 
 
+# Counts responses eligible for validation, so that only every n-th is validated if sampling
+_response_counter = itertools.count()
+
+
+def _should_validate_response(config) -> bool:
+    if not config.validate_rpc_responses:
+        return False
+    sampling = config.rpc_response_validation_sampling
+    return sampling == 1 or next(_response_counter) % sampling == 0
+
+
 def validate_schema(method_name: str):
     """
     Decorator ensuring that call to rpc method and its response are valid
@@ -225,7 +339,7 @@ def validate_schema(method_name: str):
 
             result = await func(*args, **kwargs)
 
-            if config.validate_rpc_responses:
+            if _should_validate_response(config):
                 try:
                     _assert_valid_rpc_schema(result, method_name)
                 except ValidationError as err:
@@ -4,7 +4,10 @@ RPC state endpoints
 from starknet_devnet.blueprints.rpc.schema import validate_schema
 from starknet_devnet.blueprints.rpc.structures.payloads import rpc_state_update
 from starknet_devnet.blueprints.rpc.structures.types import BlockId, RpcError
-from starknet_devnet.blueprints.rpc.utils import block_tag_to_block_number
+from starknet_devnet.blueprints.rpc.utils import (
+    block_tag_to_block_number,
+    cached_block_response,
+)
 from starknet_devnet.state import state
 from starknet_devnet.util import StarknetDevnetException
 
@@ -28,4 +31,7 @@ async def get_state_update(block_id: BlockId) -> dict:
     except StarknetDevnetException as ex:
         raise RpcError.from_spec_name("BLOCK_NOT_FOUND") from ex
 
-    return rpc_state_update(result)
+    async def build_response():
+        return rpc_state_update(result)
+
+    return await cached_block_response(("getStateUpdate",), result, build_response)
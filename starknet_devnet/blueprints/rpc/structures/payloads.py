@@ -30,7 +30,6 @@ from starkware.starknet.services.api.feeder_gateway.response_objects import (
     L1HandlerSpecificInfo,
     StarknetBlock,
     TransactionSpecificInfo,
-    TransactionTrace,
     TransactionType,
 )
 from starkware.starknet.services.api.gateway.transaction import (
@@ -802,6 +801,16 @@ def contract_class_from_dict(
     return rpc_deprecated_contract_class(loaded_class)
 
 
+def contract_class_from_object(
+    contract_class: Union[ContractClass, DeprecatedCompiledClass]
+) -> Union[RpcContractClass, RpcDeprecatedContractClass]:
+    """Convert contract class object to RpcContractClass or RpcDeprecatedContractClass"""
+    if isinstance(contract_class, ContractClass):
+        return rpc_contract_class(contract_class)
+
+    return rpc_deprecated_contract_class(contract_class)
+
+
 class RpcStorageEntry(TypedDict):
     """TypedDict for rpc storage entry"""
 
@@ -957,62 +966,119 @@ def rpc_state_update(
     return rpc_state
 
 
-def rpc_map_traces(
-    traces: List[TransactionTrace], types: List[TransactionType]
-) -> List[Dict[str, Dict]]:
+def rpc_function_invocation(invocation: dict) -> dict:
     """
-    The purpose of this method is to map RPC trace responses based on different transaction types.
+    Convert a function invocation of a gateway trace (as dumped) to rpc format.
     """
-    # traces number must be equal to types to properly map objects
-    assert len(traces) == len(types)
-
-    result = []
-    for i, trace in enumerate(traces):
-        trace_dict = trace.dump()
-
-        if types[i] == TransactionType.INVOKE_FUNCTION:
-            trace = rpc_invoke_txn_trace(trace_dict)
-        elif types[i] == TransactionType.DECLARE:
-            trace = rpc_declare_txn_trace(trace_dict)
-        elif types[i] == TransactionType.DEPLOY_ACCOUNT:
-            trace = rpc_deploy_account_txn_trace(trace_dict)
-        else:
-            raise RpcError(
-                code=-1, message=f"Transaction type '{types[i]}' is not supported."
+    contract_address = rpc_felt(invocation["contract_address"])
+    is_library_call = invocation.get("call_type") == "DELEGATE"
+    # a library call runs the code of a class, which is given by its hash
+    code_address = invocation.get("code_address") or (
+        invocation.get("class_hash") if is_library_call else None
+    )
+    return {
+        "contract_address": contract_address,
+        "entry_point_selector": rpc_felt(invocation.get("selector") or 0),
+        "calldata": [rpc_felt(value) for value in invocation["calldata"]],
+        "caller_address": rpc_felt(invocation["caller_address"]),
+        "code_address": contract_address
+        if code_address is None
+        else rpc_felt(code_address),
+        "entry_point_type": invocation.get("entry_point_type") or "EXTERNAL",
+        "call_type": "LIBRARY_CALL" if is_library_call else "CALL",
+        "result": [rpc_felt(value) for value in invocation["result"]],
+        "calls": [
+            rpc_function_invocation(internal_call)
+            for internal_call in invocation["internal_calls"]
+        ],
+        "events": [
+            {
+                "from_address": contract_address,
+                "keys": [rpc_felt(key) for key in event["keys"]],
+                "data": [rpc_felt(value) for value in event["data"]],
+            }
+            for event in sorted(invocation["events"], key=lambda event: event["order"])
+        ],
+        "messages": [
+            {
+                "from_address": contract_address,
+                "to_address": rpc_felt(message["to_address"]),
+                "payload": [rpc_felt(value) for value in message["payload"]],
+            }
+            for message in sorted(
+                invocation["messages"], key=lambda message: message["order"]
             )
-
-        result.append(trace)
-
-    return result
+        ],
+    }
 
 
-def rpc_invoke_txn_trace(trace_dict: dict) -> Dict[str, Dict]:
+def rpc_transaction_trace(
+    trace_dict: dict, tx_type: TransactionType
+) -> Dict[str, Dict]:
     """
-    Mapping for the execution trace of a invoke transaction.
+    Convert a gateway trace (as dumped) of a transaction of type `tx_type` to rpc format.
+    Invocations which didn't happen (e.g. skipped validation) are kept as `None`.
     """
-    return {
+    function_invocation_key = {
+        TransactionType.INVOKE_FUNCTION: "execute_invocation",
+        TransactionType.DEPLOY_ACCOUNT: "constructor_invocation",
+        TransactionType.DEPLOY: "constructor_invocation",
+        TransactionType.L1_HANDLER: "function_invocation",
+    }.get(tx_type)
+
+    invocations = {
         "validate_invocation": trace_dict.get("validate_invocation"),
-        "execute_invocation": trace_dict.get("function_invocation"),
+        function_invocation_key: trace_dict.get("function_invocation"),
         "fee_transfer_invocation": trace_dict.get("fee_transfer_invocation"),
     }
 
+    return {
+        key: None if invocation is None else rpc_function_invocation(invocation)
+        for key, invocation in invocations.items()
+        if key is not None
+    }
+
 
-def rpc_declare_txn_trace(trace_dict: dict) -> Dict[str, Dict]:
+def _filter_rpc_invocation(
+    invocation: dict, contract_address: Optional[Felt], max_depth: Optional[int]
+) -> Optional[dict]:
     """
-    Mapping for the execution trace of a declare transaction.
+    Return `invocation` with nested calls deeper than `max_depth` removed. If `contract_address`
+    is given, only the calls of that contract and the calls leading to them are kept.
     """
-    return {
-        "validate_invocation": trace_dict.get("validate_invocation"),
-        "fee_transfer_invocation": trace_dict.get("fee_transfer_invocation"),
-    }
+    calls = []
+    if max_depth is None or max_depth > 0:
+        next_depth = None if max_depth is None else max_depth - 1
+        for call in invocation["calls"]:
+            filtered_call = _filter_rpc_invocation(call, contract_address, next_depth)
+            if filtered_call is not None:
+                calls.append(filtered_call)
+
+    if (
+        contract_address is not None
+        and int(invocation["contract_address"], 16) != int(contract_address, 16)
+        and not calls
+    ):
+        return None
+
+    return {**invocation, "calls": calls}
 
 
-def rpc_deploy_account_txn_trace(trace_dict: dict) -> Dict[str, Dict]:
+def filter_rpc_trace(
+    trace: Dict[str, Dict],
+    contract_address: Optional[Felt] = None,
+    max_depth: Optional[int] = None,
+) -> Dict[str, Dict]:
     """
-    Mapping for the execution trace of a deploy account transaction.
+    Filter invocations of an rpc trace by contract address and call depth (0 being the top level).
+    Invocations filtered out entirely are set to `None`.
     """
+    if contract_address is None and max_depth is None:
+        return trace
+
     return {
-        "validate_invocation": trace_dict.get("validate_invocation"),
-        "constructor_invocation": trace_dict.get("function_invocation"),
-        "fee_transfer_invocation": trace_dict.get("fee_transfer_invocation"),
+        key: None
+        if invocation is None
+        else _filter_rpc_invocation(invocation, contract_address, max_depth)
+        for key, invocation in trace.items()
     }
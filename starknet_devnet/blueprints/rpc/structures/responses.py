@@ -6,6 +6,7 @@ from typing import Dict, List, TypedDict
 from starkware.starknet.definitions.transaction_type import TransactionType
 from starkware.starknet.services.api.feeder_gateway.response_objects import (
     TransactionReceipt,
+    TransactionSpecificInfo,
     TransactionStatus,
 )
 
@@ -20,7 +21,10 @@ from starknet_devnet.blueprints.rpc.structures.types import (
     rpc_txn_type,
 )
 from starknet_devnet.blueprints.rpc.utils import rpc_felt
+from starknet_devnet.constants import RPC_RECEIPT_CACHE_SIZE
 from starknet_devnet.state import state
+from starknet_devnet.transactions import DevnetTransaction
+from starknet_devnet.util import Invalidation, LRUCache
 
 
 class RpcInvokeTransactionResult(TypedDict):
@@ -116,53 +120,58 @@ class RpcDeployAccountReceipt(RpcBaseTransactionReceipt):
     contract_address: Felt
 
 
-async def rpc_invoke_receipt(txr: TransactionReceipt) -> RpcInvokeReceipt:
+def rpc_invoke_receipt(
+    txr: TransactionReceipt, transaction: TransactionSpecificInfo
+) -> RpcInvokeReceipt:
     """
     Convert gateway invoke transaction receipt to rpc format
     """
-    return await rpc_base_transaction_receipt(txr)
+    return rpc_base_transaction_receipt(txr, transaction)
 
 
-async def rpc_declare_receipt(txr: TransactionReceipt) -> RpcDeclareReceipt:
+def rpc_declare_receipt(
+    txr: TransactionReceipt, transaction: TransactionSpecificInfo
+) -> RpcDeclareReceipt:
     """
     Convert gateway declare transaction receipt to rpc format
     """
-    return await rpc_base_transaction_receipt(txr)
+    return rpc_base_transaction_receipt(txr, transaction)
 
 
-async def rpc_deploy_receipt(txr: TransactionReceipt) -> RpcDeployReceipt:
+def rpc_deploy_receipt(
+    txr: TransactionReceipt, transaction: TransactionSpecificInfo
+) -> RpcDeployReceipt:
     """
     Convert gateway deploy transaction receipt to rpc format
     """
-    base_receipt = await rpc_base_transaction_receipt(txr)
-    transaction = await state.starknet_wrapper.transactions.get_transaction(
-        hex(txr.transaction_hash)
-    )
-
     receipt: RpcDeployReceipt = {
-        "contract_address": rpc_felt(transaction.transaction.contract_address),
-        **base_receipt,
+        "contract_address": rpc_felt(transaction.contract_address),
+        **rpc_base_transaction_receipt(txr, transaction),
     }
     return receipt
 
 
-async def rpc_deploy_account_receipt(
-    txr: TransactionReceipt,
+def rpc_deploy_account_receipt(
+    txr: TransactionReceipt, transaction: TransactionSpecificInfo
 ) -> RpcDeployAccountReceipt:
     """
     Convert gateway deploy account transaction receipt to rpc format
     """
-    return await rpc_deploy_receipt(txr)
+    return rpc_deploy_receipt(txr, transaction)
 
 
-async def rpc_l1_handler_receipt(txr: TransactionReceipt) -> RpcL1HandlerReceipt:
+def rpc_l1_handler_receipt(
+    txr: TransactionReceipt, transaction: TransactionSpecificInfo
+) -> RpcL1HandlerReceipt:
     """
     Convert gateway l1 handler transaction receipt to rpc format
     """
-    return await rpc_base_transaction_receipt(txr)
+    return rpc_base_transaction_receipt(txr, transaction)
 
 
-async def rpc_base_transaction_receipt(txr: TransactionReceipt) -> dict:
+def rpc_base_transaction_receipt(
+    txr: TransactionReceipt, transaction: TransactionSpecificInfo
+) -> dict:
     """
     Convert gateway transaction receipt to rpc base transaction receipt
     """
@@ -197,12 +206,6 @@ async def rpc_base_transaction_receipt(txr: TransactionReceipt) -> dict:
         }
         return mapping[txr.status]
 
-    async def txn_type() -> RpcTxnType:
-        transaction = await state.starknet_wrapper.transactions.get_transaction(
-            hex(txr.transaction_hash)
-        )
-        return rpc_txn_type(transaction.transaction.tx_type.name)
-
     receipt: RpcBaseTransactionReceipt = {
         "transaction_hash": rpc_felt(txr.transaction_hash),
         "actual_fee": rpc_felt(txr.actual_fee or 0),
@@ -213,15 +216,14 @@ async def rpc_base_transaction_receipt(txr: TransactionReceipt) -> dict:
         "block_number": txr.block_number if txr.block_number is not None else 0,
         "messages_sent": messages_sent(),
         "events": events(),
-        "type": await txn_type(),
+        "type": rpc_txn_type(transaction.tx_type.name),
     }
     return receipt
 
 
-async def rpc_transaction_receipt(txr: TransactionReceipt) -> dict:
-    """
-    Convert gateway transaction receipt to rpc format
-    """
+def _build_rpc_receipt(
+    txr: TransactionReceipt, transaction: TransactionSpecificInfo
+) -> dict:
     tx_mapping = {
         TransactionType.DEPLOY: rpc_deploy_receipt,
         TransactionType.INVOKE_FUNCTION: rpc_invoke_receipt,
@@ -229,8 +231,38 @@ async def rpc_transaction_receipt(txr: TransactionReceipt) -> dict:
         TransactionType.L1_HANDLER: rpc_l1_handler_receipt,
         TransactionType.DEPLOY_ACCOUNT: rpc_deploy_account_receipt,
     }
+    return tx_mapping[transaction.tx_type](txr, transaction)
+
+
+async def rpc_transaction_receipt(txr: TransactionReceipt) -> dict:
+    """
+    Convert gateway transaction receipt to rpc format
+    """
     transaction = await state.starknet_wrapper.transactions.get_transaction(
         hex(txr.transaction_hash)
     )
-    tx_type = transaction.transaction.tx_type
-    return await tx_mapping[tx_type](txr)
+    return _build_rpc_receipt(txr, transaction.transaction)
+
+
+# keyed by transaction hash and status
+_receipt_cache = LRUCache(
+    maxsize=RPC_RECEIPT_CACHE_SIZE, invalidation=Invalidation.OWNER
+)
+
+
+def rpc_devnet_transaction_receipt(transaction: DevnetTransaction) -> dict:
+    """
+    Convert receipt of a transaction stored in devnet to rpc format,
+    resolving the transaction only once. The receipt is cached and shared between callers,
+    so it must not be modified.
+    """
+    cache_key = (transaction.transaction_hash, transaction.status)
+    receipt = _receipt_cache.get(cache_key, source=transaction)
+    if receipt is None:
+        tx_info = transaction.get_tx_info()
+        receipt = _build_rpc_receipt(
+            transaction.get_receipt(tx_info=tx_info), tx_info.transaction
+        )
+        _receipt_cache.set(cache_key, receipt, source=transaction)
+
+    return receipt
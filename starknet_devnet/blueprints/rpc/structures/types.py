@@ -13,6 +13,7 @@ from typing_extensions import Literal, TypedDict
 
 from ..rpc_spec import RPC_SPECIFICATION
 from ..rpc_spec_write import RPC_SPECIFICATION_WRITE
+from ..rpc_trace_spec import RPC_SPECIFICATION_TRACE
 
 Felt = str
 
@@ -113,14 +114,20 @@ class PredefinedRpcErrorCode(Enum):
 
 def _combine_rpc_errors():
     """
-    Merge write api errors with main api errors.
+    Merge write and trace api errors with main api errors.
 
-    All references from write api will be shadowed by errors from main api.
+    All references from write and trace api will be shadowed by errors from main api.
     """
     rpc_errors = json.loads(RPC_SPECIFICATION)["components"]["errors"]
     rpc_write_errors = json.loads(RPC_SPECIFICATION_WRITE)["components"]["errors"]
+    rpc_trace_errors = {
+        name: {"code": error["code"], "message": error["message"]}
+        for name, error in json.loads(RPC_SPECIFICATION_TRACE)["components"][
+            "errors"
+        ].items()
+    }
 
-    return rpc_write_errors | rpc_errors
+    return rpc_trace_errors | rpc_write_errors | rpc_errors
 
 
 RPC_ERRORS = _combine_rpc_errors()
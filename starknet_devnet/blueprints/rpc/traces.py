@@ -0,0 +1,125 @@
+"""
+RPC trace endpoints
+"""
+
+from typing import List
+
+from starkware.starknet.definitions.error_codes import StarknetErrorCode
+from starkware.starknet.services.api.feeder_gateway.response_objects import (
+    StarknetBlock,
+    TransactionStatus,
+)
+
+from starknet_devnet.blueprints.rpc.schema import validate_schema
+from starknet_devnet.blueprints.rpc.structures.payloads import (
+    filter_rpc_trace,
+    rpc_transaction_trace,
+)
+from starknet_devnet.blueprints.rpc.structures.types import (
+    Address,
+    BlockHash,
+    RpcError,
+    TxnHash,
+)
+from starknet_devnet.blueprints.rpc.utils import rpc_felt
+from starknet_devnet.blueprints.shared import get_block_transaction_traces
+from starknet_devnet.constants import BLOCK_TRACES_CACHE_SIZE
+from starknet_devnet.state import state
+from starknet_devnet.util import Invalidation, LRUCache, StarknetDevnetException
+
+# keyed by block hash; pending blocks aren't cached
+_rpc_block_traces_cache = LRUCache(
+    maxsize=BLOCK_TRACES_CACHE_SIZE, invalidation=Invalidation.OWNER
+)
+
+
+async def _get_rpc_block_traces(block: StarknetBlock) -> List[dict]:
+    """
+    Get traces of all transactions in the block, in rpc format
+    """
+    rpc_traces = _rpc_block_traces_cache.get(block.block_hash, source=block)
+    if rpc_traces is not None:
+        return rpc_traces
+
+    block_traces = await get_block_transaction_traces(block)
+    rpc_traces = [
+        {
+            "transaction_hash": rpc_felt(trace["transaction_hash"]),
+            "trace_root": rpc_transaction_trace(trace, transaction.tx_type),
+        }
+        for trace, transaction in zip(block_traces["traces"], block.transactions)
+    ]
+
+    if block.block_hash is not None:
+        _rpc_block_traces_cache.set(block.block_hash, rpc_traces, source=block)
+    return rpc_traces
+
+
+async def _get_rpc_trace(transaction_hash: TxnHash) -> dict:
+    transactions = state.starknet_wrapper.transactions
+    transaction = transactions.get_local_transaction(transaction_hash)
+
+    if transaction is None:
+        # transaction of the forking origin
+        tx_info = await transactions.get_transaction(transaction_hash)
+        if tx_info.status == TransactionStatus.NOT_RECEIVED:
+            raise RpcError.from_spec_name("INVALID_TXN_HASH")
+
+        trace = await transactions.get_transaction_trace(transaction_hash)
+        return rpc_transaction_trace(trace.dump(), tx_info.transaction.tx_type)
+
+    if transaction.status in (TransactionStatus.RECEIVED, TransactionStatus.REJECTED):
+        raise RpcError.from_spec_name("NO_TRACE_AVAILABLE")
+
+    if transaction.block is None:
+        return rpc_transaction_trace(
+            transaction.get_trace().dump(), transaction.internal_tx.tx_type
+        )
+
+    for block_trace in await _get_rpc_block_traces(transaction.block):
+        if int(block_trace["transaction_hash"], 16) == transaction.transaction_hash:
+            return block_trace["trace_root"]
+
+    raise RpcError.from_spec_name("NO_TRACE_AVAILABLE")
+
+
+@validate_schema("traceTransaction")
+async def trace_transaction(
+    transaction_hash: TxnHash, contract_address: Address = None, max_depth: int = None
+) -> dict:
+    """
+    Get the trace of the transaction; invocations can be filtered by contract address
+    and the depth of nested calls (devnet extension)
+    """
+    try:
+        trace = await _get_rpc_trace(transaction_hash)
+    except StarknetDevnetException as ex:
+        if ex.code == StarknetErrorCode.NO_TRACE:
+            raise RpcError.from_spec_name("NO_TRACE_AVAILABLE") from ex
+        raise RpcError.from_spec_name("INVALID_TXN_HASH") from ex
+
+    return filter_rpc_trace(trace, contract_address, max_depth)
+
+
+@validate_schema("traceBlockTransactions")
+async def trace_block_transactions(
+    block_hash: BlockHash, contract_address: Address = None, max_depth: int = None
+) -> List[dict]:
+    """
+    Get traces of all transactions in the block; invocations can be filtered by contract address
+    and the depth of nested calls (devnet extension)
+    """
+    try:
+        block = await state.starknet_wrapper.blocks.get_by_hash(block_hash)
+    except StarknetDevnetException as ex:
+        raise RpcError.from_spec_name("INVALID_BLOCK_HASH") from ex
+
+    return [
+        {
+            "transaction_hash": block_trace["transaction_hash"],
+            "trace_root": filter_rpc_trace(
+                block_trace["trace_root"], contract_address, max_depth
+            ),
+        }
+        for block_trace in await _get_rpc_block_traces(block)
+    ]
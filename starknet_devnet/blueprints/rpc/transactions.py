@@ -8,7 +8,7 @@ from starkware.starknet.services.api.feeder_gateway.response_objects import (
     TransactionStatus,
 )
 from starkware.starknet.services.api.gateway.transaction import AccountTransaction
-from starkware.starkware_utils.error_handling import StarkException
+from starkware.starkware_utils.error_handling import StarkErrorCode, StarkException
 
 from starknet_devnet.blueprints.rpc.schema import validate_schema
 from starknet_devnet.blueprints.rpc.structures.payloads import (
@@ -22,21 +22,28 @@ from starknet_devnet.blueprints.rpc.structures.payloads import (
     make_deploy_account,
     make_invoke_function,
     rpc_fee_estimate,
-    rpc_map_traces,
     rpc_transaction,
+    rpc_transaction_trace,
 )
 from starknet_devnet.blueprints.rpc.structures.responses import (
     RpcDeclareTransactionResult,
     RpcDeployAccountTransactionResult,
     RpcInvokeTransactionResult,
+    rpc_devnet_transaction_receipt,
     rpc_transaction_receipt,
 )
-from starknet_devnet.blueprints.rpc.structures.types import BlockId, RpcError, TxnHash
+from starknet_devnet.blueprints.rpc.structures.types import (
+    BlockId,
+    PredefinedRpcErrorCode,
+    RpcError,
+    TxnHash,
+)
 from starknet_devnet.blueprints.rpc.utils import (
     assert_block_id_is_valid,
     get_block_by_block_id,
     rpc_felt,
 )
+from starknet_devnet.blueprints.shared import parse_wait_timeout
 from starknet_devnet.constants import LEGACY_TX_VERSION
 from starknet_devnet.state import state
 from starknet_devnet.util import StarknetDevnetException
@@ -80,10 +87,13 @@ async def get_transaction_receipt(transaction_hash: TxnHash) -> dict:
     """
     Get the transaction receipt by the transaction hash
     """
+    transactions = state.starknet_wrapper.transactions
     try:
-        result = await state.starknet_wrapper.transactions.get_transaction_receipt(
-            tx_hash=transaction_hash
-        )
+        transaction = transactions.get_local_transaction(transaction_hash)
+        if transaction is not None:
+            return rpc_devnet_transaction_receipt(transaction)
+
+        result = await transactions.get_transaction_receipt(tx_hash=transaction_hash)
     except StarknetDevnetException as ex:
         raise RpcError.from_spec_name("TXN_HASH_NOT_FOUND") from ex
 
@@ -93,6 +103,32 @@ async def get_transaction_receipt(transaction_hash: TxnHash) -> dict:
     return await rpc_transaction_receipt(result)
 
 
+async def wait_for_transaction(
+    transaction_hash: TxnHash, timeout: float = None
+) -> dict:
+    """
+    Devnet extension: wait until the transaction is accepted or rejected,
+    or until `timeout` seconds pass, and return its receipt
+    """
+    try:
+        timeout = parse_wait_timeout(timeout)
+    except (TypeError, ValueError) as ex:
+        raise RpcError(
+            code=PredefinedRpcErrorCode.INVALID_PARAMS.value, message=str(ex)
+        ) from ex
+
+    try:
+        await state.starknet_wrapper.transactions.wait_for_transaction_status(
+            transaction_hash, timeout
+        )
+    except StarknetDevnetException as ex:
+        if ex.code != StarkErrorCode.MALFORMED_REQUEST:
+            raise
+        raise RpcError.from_spec_name("TXN_HASH_NOT_FOUND") from ex
+
+    return await get_transaction_receipt(transaction_hash=transaction_hash)
+
+
 @validate_schema("pendingTransactions")
 async def pending_transactions() -> List[RpcTransaction]:
     """
@@ -192,9 +228,12 @@ def make_transaction(txn: RpcBroadcastedTxn) -> AccountTransaction:
 
 
 @validate_schema("estimateFee")
-async def estimate_fee(request: List[RpcBroadcastedTxn], block_id: BlockId) -> list:
+async def estimate_fee(
+    request: List[RpcBroadcastedTxn], block_id: BlockId, independent: bool = False
+) -> list:
     """
-    Estimate the fee for a given Starknet transaction
+    Estimate the fee for a given Starknet transaction.
+    If `independent`, each transaction is estimated against the state of `block_id`.
     """
     await assert_block_id_is_valid(block_id)
     transactions = list(map(make_transaction, request))
@@ -204,6 +243,7 @@ async def estimate_fee(request: List[RpcBroadcastedTxn], block_id: BlockId) -> l
             transactions,
             skip_validate=False,
             block_id=block_id,
+            independent=independent,
         )
     except StarkException as ex:
         if "Entry point" in ex.message and "not found" in ex.message:
@@ -222,10 +262,12 @@ async def simulate_transaction(
     block_id: BlockId,
     transaction: List[RpcTransaction],
     simulation_flags: List[SimulationFlag],
+    independent: bool = False,
 ) -> list:
     """
     Simulate transactions.
     SKIP_EXECUTE SimulationFlag is not supported.
+    If `independent`, each transaction is simulated against the state of `block_id`.
     """
     await assert_block_id_is_valid(block_id)
     transactions = list(map(make_transaction, transaction))
@@ -245,10 +287,14 @@ async def simulate_transaction(
             transactions,
             skip_validate=skip_validate,
             block_id=block_id,
+            independent=independent,
         )
         simulated_transactions.append(
             {
-                "transaction_trace": rpc_map_traces(traces, transaction_types),
+                "transaction_trace": [
+                    rpc_transaction_trace(trace.dump(), tx_type)
+                    for trace, tx_type in zip(traces, transaction_types)
+                ],
                 "fee_estimation": rpc_fee_estimate(fee),
             }
         )
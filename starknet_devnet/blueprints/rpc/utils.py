@@ -1,7 +1,7 @@
 """
 RPC utilities
 """
-from typing import Union
+from typing import Any, Awaitable, Callable, Hashable, Union
 
 from starkware.starknet.services.api.feeder_gateway.response_objects import (
     StarknetBlock,
@@ -13,8 +13,14 @@ from starknet_devnet.blueprints.rpc.structures.types import (
     PredefinedRpcErrorCode,
     RpcError,
 )
+from starknet_devnet.constants import RPC_BLOCK_RESPONSE_CACHE_SIZE
 from starknet_devnet.state import state
-from starknet_devnet.util import StarknetDevnetException
+from starknet_devnet.util import Invalidation, LRUCache, StarknetDevnetException
+
+# keyed by (method, block hash, transaction detail); entries are owned by the block (state update)
+_block_response_cache = LRUCache(
+    maxsize=RPC_BLOCK_RESPONSE_CACHE_SIZE, invalidation=Invalidation.OWNER
+)
 
 
 def block_tag_to_block_number(block_id: BlockId) -> BlockId:
@@ -49,6 +55,25 @@ async def get_block_by_block_id(block_id: BlockId) -> StarknetBlock:
         raise RpcError.from_spec_name("BLOCK_NOT_FOUND") from ex
 
 
+async def cached_block_response(
+    key: Hashable, block_object: Any, build: Callable[[], Awaitable[dict]]
+) -> dict:
+    """
+    Return the response built by `build` from `block_object` (a block or its state update).
+    Responses of accepted blocks are cached for as long as the object isn't replaced,
+    e.g. by aborting the block; pending objects (without a hash) are never cached.
+    """
+    if not block_object.block_hash:
+        return await build()
+
+    cache_key = (*key, block_object.block_hash)
+    response = _block_response_cache.get(cache_key, source=block_object)
+    if response is None:
+        response = await build()
+        _block_response_cache.set(cache_key, response, source=block_object)
+    return response
+
+
 async def assert_block_id_is_valid(block_id: BlockId) -> None:
     """
     Assert block_id is valid
@@ -78,12 +103,10 @@ def rpc_felt(value: Union[int, str]) -> Felt:
     Convert value to 0x prefixed felt
     The value can be base 10 integer, base 10 string or base 16 string
     """
-    if isinstance(value, str):
-        value = int(value) if value.isnumeric() else int(value, 16)
+    if isinstance(value, int):
+        return hex(value)
 
-    if value == 0:
-        return "0x0"
-    return hex(value)
+    return hex(int(value) if value.isnumeric() else int(value, 16))
 
 
 def rpc_storage_key(value: Union[int, str]) -> Felt:
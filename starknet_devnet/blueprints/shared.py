@@ -2,12 +2,25 @@
 Shared functions between blueprints
 """
 
+from typing import Callable, Optional
+
+from flask import Response, request
 from marshmallow import ValidationError
+from starkware.starknet.services.api.feeder_gateway.response_objects import (
+    BlockTransactionTraces,
+    StarknetBlock,
+)
 from starkware.starknet.services.api.gateway.transaction import Transaction
 from starkware.starkware_utils.error_handling import StarkErrorCode
 
-from starknet_devnet.constants import CAIRO_LANG_VERSION
-from starknet_devnet.util import StarknetDevnetException
+from starknet_devnet.constants import (
+    BLOCK_TRACES_CACHE_SIZE,
+    CAIRO_LANG_VERSION,
+    DEFAULT_WAIT_FOR_TRANSACTION_TIMEOUT,
+    MAX_WAIT_FOR_TRANSACTION_TIMEOUT,
+)
+from starknet_devnet.state import state
+from starknet_devnet.util import Invalidation, LRUCache, StarknetDevnetException
 
 
 def validate_transaction(data: bytes) -> Transaction:
@@ -20,3 +33,204 @@ Be sure to use the correct compilation (json) artifact. Devnet-compatible cairo-
         raise StarknetDevnetException(
             code=StarkErrorCode.MALFORMED_REQUEST, message=msg, status_code=400
         ) from err
+
+
+# keyed by block hash; pending blocks aren't cached
+_block_traces_cache = LRUCache(
+    maxsize=BLOCK_TRACES_CACHE_SIZE, invalidation=Invalidation.OWNER
+)
+
+
+async def get_block_transaction_traces(block: StarknetBlock) -> dict:
+    """Returns the dumped `BlockTransactionTraces` of the transactions in `block`"""
+    cached_traces = _block_traces_cache.get(block.block_hash, source=block)
+    if cached_traces is not None:
+        return cached_traces
+
+    traces = []
+    for transaction in block.transaction_receipts or []:
+        tx_hash = hex(transaction.transaction_hash)
+        trace = await state.starknet_wrapper.transactions.get_transaction_trace(tx_hash)
+
+        # expected trace is equal to response of get_transaction, but with the hash property
+        trace_dict = trace.dump()
+        trace_dict["transaction_hash"] = tx_hash
+        traces.append(trace_dict)
+
+    # assert correct structure
+    block_traces = BlockTransactionTraces.load({"traces": traces}).dump()
+
+    if block.block_hash is not None:
+        _block_traces_cache.set(block.block_hash, block_traces, source=block)
+    return block_traces
+
+
+def parse_wait_timeout(raw_timeout) -> float:
+    """Parse timeout of a request waiting for a transaction; raises `ValueError` if invalid"""
+    if raw_timeout is None:
+        return DEFAULT_WAIT_FOR_TRANSACTION_TIMEOUT
+
+    timeout = float(raw_timeout)
+    if not 0 <= timeout <= MAX_WAIT_FOR_TRANSACTION_TIMEOUT:
+        raise ValueError(
+            f"Timeout should be between 0 and {MAX_WAIT_FOR_TRANSACTION_TIMEOUT} seconds; got: {raw_timeout}."
+        )
+    return timeout
+
+
+def lock_free(view_func):
+    """
+    Mark a view as not requiring exclusive access to the global state.
+    Meant for long-lived responses which would otherwise block all other requests.
+    """
+    view_func.lock_free = True
+    return view_func
+
+
+def lock_free_if(predicate: Callable[[], bool]):
+    """
+    Like `lock_free`, but only for requests for which `predicate` returns `True`.
+    Meant for views dispatching to both regular and long-lived handlers.
+    """
+
+    def decorator(view_func):
+        view_func.lock_free = predicate
+        return view_func
+
+    return decorator
+
+
+def is_lock_free(view_func) -> bool:
+    """Return `True` if `view_func` was marked as not requiring the lock for the current request"""
+    return _is_marked(view_func, "lock_free")
+
+
+def read_only(view_func):
+    """
+    Mark a view as only reading the global state.
+    Such views may run concurrently with each other, but not with views modifying the state.
+    """
+    view_func.read_only = True
+    return view_func
+
+
+def read_only_if(predicate: Callable[[], bool]):
+    """
+    Like `read_only`, but only for requests for which `predicate` returns `True`.
+    Meant for views dispatching to both reading and modifying handlers.
+    """
+
+    def decorator(view_func):
+        view_func.read_only = predicate
+        return view_func
+
+    return decorator
+
+
+def is_read_only(view_func) -> bool:
+    """Return `True` if `view_func` was marked as only reading the state for the current request"""
+    return _is_marked(view_func, "read_only")
+
+
+def simulation(view_func):
+    """Mark a view as simulating transactions, which has its own concurrency limit"""
+    view_func.simulation = True
+    return view_func
+
+
+def simulation_if(predicate: Callable[[], bool]):
+    """Like `simulation`, but only for requests for which `predicate` returns `True`."""
+
+    def decorator(view_func):
+        view_func.simulation = predicate
+        return view_func
+
+    return decorator
+
+
+def is_simulation(view_func) -> bool:
+    """Return `True` if `view_func` was marked as simulating transactions for the current request"""
+    return _is_marked(view_func, "simulation")
+
+
+def historical_if(predicate: Callable[[], bool]):
+    """
+    Mark a view as only reading archived states (of accepted blocks) for requests for which
+    `predicate` returns `True`. Such requests are read-only: they need shared access to the
+    global state, since the archive is looked up through it and aborting or loading rewrites it.
+    """
+
+    def decorator(view_func):
+        view_func.historical = predicate
+        return view_func
+
+    return decorator
+
+
+def is_historical(view_func) -> bool:
+    """Return `True` if `view_func` was marked as only reading archived states for the current request"""
+    return _is_marked(view_func, "historical")
+
+
+def prepare_with(prepare: Callable[[], None]):
+    """
+    Mark a view as having work (e.g. compilation) which `prepare` can start in the background
+    before the request waits for access to the global state. Errors in `prepare` are ignored,
+    they are reported by the view itself.
+    """
+
+    def decorator(view_func):
+        view_func.prepare = prepare
+        return view_func
+
+    return decorator
+
+
+def prepare_request(view_func):
+    """Start the background work of `view_func` for the current request, if it has any"""
+    prepare = getattr(view_func, "prepare", None)
+    if prepare is None:
+        return
+    try:
+        prepare()
+    except Exception:  # pylint: disable=broad-except
+        pass
+
+
+def _is_marked(view_func, marker_name: str) -> bool:
+    marker = getattr(view_func, marker_name, False)
+    return marker() if callable(marker) else marker
+
+
+def block_etag(block: StarknetBlock) -> Optional[str]:
+    """
+    Return the entity tag of an accepted (or aborted) block and resources derived from it;
+    pending blocks aren't tagged since they change.
+    """
+    if block.block_hash is None:
+        return None
+    return f"block-{hex(block.block_hash)}-{block.status.name}"
+
+
+def class_etag(class_hash: int) -> str:
+    """Return the entity tag of a class, which is immutable given its hash"""
+    return f"class-{hex(class_hash)}"
+
+
+def is_not_modified(etag: Optional[str]) -> bool:
+    """Return `True` if the client already has the representation tagged with `etag`"""
+    return etag is not None and request.if_none_match.contains_weak(etag)
+
+
+def not_modified_response(etag: str) -> Response:
+    """Return an empty 304 response"""
+    response = Response(status=304)
+    response.set_etag(etag, weak=True)
+    return response
+
+
+def tag_response(response: Response, etag: Optional[str]) -> Response:
+    """Add the entity tag to `response` so that clients can make conditional requests"""
+    if etag is not None:
+        response.set_etag(etag, weak=True)
+    return response
@@ -9,6 +9,7 @@
 
 import logging
 import sys
+from functools import lru_cache
 from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union, cast
 
 from cairo_rs_py import CairoRunner, RelocatableValue
@@ -77,8 +78,47 @@ from starkware.starkware_utils.error_handling import (
     wrap_with_stark_exception,
 )
 
+from .constants import DUMPED_PROGRAM_CACHE_SIZE
+from .util import LRUCache
+
 logger = logging.getLogger(__name__)
 
+# The Rust VM receives programs serialized to JSON, which is costly for large classes.
+# Class hashes are derived from the classes, so their serialized programs never change.
+dumped_programs = LRUCache(maxsize=DUMPED_PROGRAM_CACHE_SIZE)
+
+
+def _dump_version0_program(
+    class_hash: int, compiled_class: DeprecatedCompiledClass
+) -> str:
+    key = (class_hash, None)
+    dumped_program = dumped_programs.get(key)
+    if dumped_program is None:
+        dumped_program = compiled_class.program.dumps()
+        dumped_programs.set(key, dumped_program)
+    return dumped_program
+
+
+def _dump_runnable_program(
+    class_hash: int, compiled_class: CompiledClass, entrypoint_builtins: List[str]
+) -> Tuple[str, int]:
+    """Return the serialized runnable program of the entry point and its data length"""
+    key = (class_hash, tuple(entrypoint_builtins))
+    entry = dumped_programs.get(key)
+    if entry is None:
+        program = compiled_class.get_runnable_program(
+            entrypoint_builtins=entrypoint_builtins
+        )
+        entry = (program.dumps(), len(program.data))
+        dumped_programs.set(key, entry)
+    return entry
+
+
+@lru_cache
+def _dump_os_program(load: Callable[[], Program]) -> str:
+    """Serialize the (constant) program returned by `load`"""
+    return load().dumps()
+
 
 def cairo_rs_py_execute_version0_class(
     self,
@@ -94,7 +134,9 @@ def cairo_rs_py_execute_version0_class(
 
     # Prepare runner.
     with wrap_with_stark_exception(code=StarknetErrorCode.SECURITY_ERROR):
-        runner = CairoRunner(program=compiled_class.program.dumps(), entrypoint=None)
+        runner = CairoRunner(
+            program=_dump_version0_program(class_hash, compiled_class), entrypoint=None
+        )
         runner.initialize_function_runner(add_segment_arena_builtin=False)
 
     # Prepare implicit arguments.
@@ -179,12 +221,12 @@ def cairo_rs_py_execute(
     entry_point = self._get_selected_entry_point(
         compiled_class=compiled_class, class_hash=class_hash
     )
-    program = compiled_class.get_runnable_program(
-        entrypoint_builtins=as_non_optional(entry_point.builtins)
+    dumped_program, program_length = _dump_runnable_program(
+        class_hash, compiled_class, as_non_optional(entry_point.builtins)
     )
     with wrap_with_stark_exception(code=StarknetErrorCode.SECURITY_ERROR):
         runner = CairoRunner(  # pylint: disable=no-member
-            program=program.dumps(), entrypoint=None
+            program=dumped_program, entrypoint=None
         )
     runner.initialize_function_runner(add_segment_arena_builtin=True)
 
@@ -208,7 +250,7 @@ def cairo_rs_py_execute(
 
     # Load the builtin costs; Cairo 1.0 programs are expected to end with a `ret` opcode
     # followed by a pointer to the builtin costs.
-    core_program_end_ptr = runner.program_base + len(program.data)
+    core_program_end_ptr = runner.program_base + program_length
     builtin_costs = [0, 0, 0, 0, 0]
     # Use allocate_segment to mark it as read-only.
     builtin_cost_ptr = syscall_handler.allocate_segment(data=builtin_costs)
@@ -233,7 +275,7 @@ def cairo_rs_py_execute(
         entry_point_args=entry_point_args,
         hint_locals={"syscall_handler": syscall_handler},
         run_resources=tx_execution_context.run_resources,
-        program_segment_size=len(program.data) + len(program_extra_data),
+        program_segment_size=program_length + len(program_extra_data),
     )
 
     # We should not count (possibly) unsued code as holes.
@@ -340,7 +382,7 @@ def cairo_rs_py_compute_class_hash_inner(
     )
 
     runner = CairoRunner(  # pylint: disable=no-member
-        program=program.dumps(), entrypoint=None
+        program=_dump_os_program(load_contract_class_cairo_program), entrypoint=None
     )
     runner.initialize_function_runner(add_segment_arena_builtin=False)
     poseidon_ptr = runner.get_poseidon_builtin_base()
@@ -366,7 +408,7 @@ def cairo_rs_py_compute_compiled_class_hash_inner(compiled_class: CompiledClass)
         identifiers=program.identifiers, compiled_class=compiled_class
     )
     runner = CairoRunner(  # pylint: disable=no-member
-        program=program.dumps(), entrypoint=None
+        program=_dump_os_program(load_compiled_class_cairo_program), entrypoint=None
     )
     runner.initialize_function_runner(add_segment_arena_builtin=False)
     poseidon_ptr = runner.get_poseidon_builtin_base()
@@ -394,7 +436,7 @@ def cairo_rs_py_compute_deprecated_class_hash_inner(
         identifiers=program.identifiers, contract_class=contract_class
     )
     runner = CairoRunner(  # pylint: disable=no-member
-        program=program.dumps(), entrypoint=None
+        program=_dump_os_program(load_program), entrypoint=None
     )
     runner.initialize_function_runner(add_segment_arena_builtin=False)
     hash_ptr = runner.get_hash_builtin_base()
@@ -0,0 +1,81 @@
+"""
+Memoization of class hash computations, keyed by a digest of the class content.
+"""
+
+import hashlib
+import importlib
+import inspect
+from functools import wraps
+from typing import Callable, Hashable, Union
+
+from starkware.starknet.services.api.contract_class.contract_class import (
+    CompiledClassBase,
+    ContractClass,
+)
+
+from .constants import CLASS_HASH_CACHE_SIZE
+from .util import LRUCache
+
+AnyContractClass = Union[ContractClass, CompiledClassBase]
+
+class_hashes = LRUCache(maxsize=CLASS_HASH_CACHE_SIZE)
+
+
+def content_digest(contract_class: AnyContractClass) -> str:
+    """Return a digest of the content of `contract_class`, much cheaper to compute than its hash"""
+    content = contract_class.dumps(sort_keys=True)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def memoized_class_hash(
+    kind: Hashable, contract_class: AnyContractClass, compute: Callable[[], int]
+) -> int:
+    """
+    Return the hash of `kind` (e.g. class hash or compiled class hash) of `contract_class`,
+    computed by `compute` unless a class of the same content was hashed before
+    """
+    key = (kind, content_digest(contract_class))
+    class_hash = class_hashes.get(key)
+    if class_hash is None:
+        class_hash = compute()
+        class_hashes.set(key, class_hash)
+    return class_hash
+
+
+def _memoize(module_name: str, function_name: str):
+    module = importlib.import_module(module_name)
+    compute_inner = getattr(module, function_name)
+    signature = inspect.signature(compute_inner)
+    class_param = next(iter(signature.parameters))
+
+    @wraps(compute_inner)
+    def memoized(*args, **kwargs) -> int:
+        arguments = dict(signature.bind(*args, **kwargs).arguments)
+        contract_class = arguments.pop(class_param)
+        # e.g. the hash function of a deprecated class hash
+        kind = (function_name, tuple(sorted(arguments.items())))
+        return memoized_class_hash(
+            kind, contract_class, lambda: compute_inner(*args, **kwargs)
+        )
+
+    setattr(module, function_name, memoized)
+
+
+def memoize_class_hash_computations():
+    """
+    Replace the functions computing class hashes in cairo-lang with their memoized versions.
+    They are called by their modules, so all computations (e.g. of declared classes,
+    of classes of the forked origin, of predeclared classes) go through them.
+    """
+    _memoize(
+        "starkware.starknet.core.os.contract_class.class_hash",
+        "_compute_class_hash_inner",
+    )
+    _memoize(
+        "starkware.starknet.core.os.contract_class.compiled_class_hash",
+        "_compute_compiled_class_hash_inner",
+    )
+    _memoize(
+        "starkware.starknet.core.os.contract_class.deprecated_class_hash",
+        "compute_deprecated_class_hash_inner",
+    )
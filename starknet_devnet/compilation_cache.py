@@ -0,0 +1,135 @@
+"""
+Persistent cache of Sierra to CASM compilation results.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Optional
+
+from marshmallow import ValidationError
+from starkware.starknet.services.api.contract_class.contract_class import (
+    CompiledClass,
+    ContractClass,
+)
+
+_SUFFIX = ".casm.json"
+_TMP_SUFFIX = ".tmp"
+# temporary files older than this (in seconds) were left by a crashed writer
+_STALE_TMP_AGE = 600
+
+
+def compilation_key(
+    contract_class: ContractClass, compiler_identity: str, compiler_args: str
+) -> str:
+    """
+    Return the key under which the compilation of `contract_class` is stored:
+    a digest of its content, of the compiler (name and version) and of the compilation args.
+    """
+    digest = hashlib.sha256()
+    for part in [
+        json.dumps(contract_class.dump(), sort_keys=True),
+        compiler_identity,
+        compiler_args,
+    ]:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class CompilationCache:
+    """
+    Compiled classes stored as files in `directory`, which may be shared by Devnet instances.
+    Once the files take more than `max_size` bytes, the least recently used ones are removed.
+    Temporary files count towards the size; those left by crashed writers are removed.
+    """
+
+    def __init__(self, directory: str, max_size: int):
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(directory, exist_ok=True)
+
+    def __path(self, key: str) -> str:
+        return os.path.join(self.directory, key + _SUFFIX)
+
+    def get(self, key: str) -> Optional[CompiledClass]:
+        """Return the compiled class stored under `key`, if any"""
+        path = self.__path(key)
+        try:
+            with open(path, encoding="utf-8") as casm_file:
+                content = casm_file.read()
+        except FileNotFoundError:
+            return None
+
+        try:
+            compiled_class = CompiledClass.loads(content)
+        except (ValueError, ValidationError):
+            # e.g. written by an incompatible version of Devnet
+            self.__remove(path)
+            return None
+
+        # the modification time marks the last use
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # evicted by another instance in the meantime
+            pass
+
+        return compiled_class
+
+    def set(self, key: str, compiled_class: CompiledClass):
+        """Store `compiled_class` under `key` and evict the files over the size limit"""
+        # written under a temporary name and renamed, so that readers never see a partial file
+        tmp_file = tempfile.NamedTemporaryFile(
+            mode="w",
+            dir=self.directory,
+            suffix=_TMP_SUFFIX,
+            delete=False,
+            encoding="utf-8",
+        )
+        try:
+            with tmp_file:
+                tmp_file.write(compiled_class.dumps())
+            os.replace(tmp_file.name, self.__path(key))
+        finally:
+            # only still present if writing or renaming failed
+            self.__remove(tmp_file.name)
+
+        self.__evict()
+
+    def __evict(self):
+        entries = []
+        tmp_size = 0
+        now = time.time()
+        for entry in os.scandir(self.directory):
+            is_tmp = entry.name.endswith(_TMP_SUFFIX)
+            if not is_tmp and not entry.name.endswith(_SUFFIX):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+
+            if not is_tmp:
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+            elif now - stat.st_mtime > _STALE_TMP_AGE:
+                self.__remove(entry.path)
+            else:
+                # possibly being written by another instance
+                tmp_size += stat.st_size
+
+        total_size = tmp_size + sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            self.__remove(path)
+            total_size -= size
+
+    @staticmethod
+    def __remove(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -5,7 +5,8 @@ import os
 import subprocess
 import tempfile
 from abc import ABC, abstractmethod
-from typing import List
+from functools import lru_cache
+from typing import List, Optional
 
 from starkware.starknet.definitions.error_codes import StarknetErrorCode
 from starkware.starknet.services.api.contract_class.contract_class import (
@@ -17,17 +18,49 @@ from starkware.starknet.services.api.contract_class.contract_class_utils import
 )
 from starkware.starkware_utils.error_handling import StarkException
 
+from starknet_devnet.compilation_cache import CompilationCache, compilation_key
+from starknet_devnet.constants import CAIRO_LANG_VERSION
 from starknet_devnet.devnet_config import DevnetConfig
 from starknet_devnet.util import StarknetDevnetException
 
+COMPILER_ARGS = [
+    "--allowed-libfuncs-list-name",
+    "experimental_v0.1.0",
+    "--add-pythonic-hints",
+]
+
 
 class ContractClassCompiler(ABC):
     """Base class of contract class compilers"""
 
-    def compile_contract_class(self, contract_class: ContractClass) -> CompiledClass:
-        """Take the sierra and return the compiled instance"""
+    def compile_contract_class(
+        self, contract_class: ContractClass, timeout: Optional[float] = None
+    ) -> CompiledClass:
+        """
+        Take the sierra and return the compiled instance;
+        compilation is aborted after `timeout` seconds, if the compiler supports it
+        """
+        raise NotImplementedError
+
+    def get_identity(self) -> str:
+        """Return the name and the version of the compiler, distinguishing its output"""
         raise NotImplementedError
 
+    def get_compilation_key(self, contract_class: ContractClass) -> str:
+        """Return the key identifying the compilation of `contract_class` by this compiler"""
+        return compilation_key(
+            contract_class, self.get_identity(), " ".join(COMPILER_ARGS)
+        )
+
+    def compile_contract_class_with_key(
+        self, contract_class: ContractClass, key: str, timeout: Optional[float] = None
+    ) -> CompiledClass:
+        """
+        Like `compile_contract_class`, for callers which already computed
+        `get_compilation_key(contract_class)` as `key`
+        """
+        return self.compile_contract_class(contract_class, timeout)
+
 
 COMPILATION_ERROR_MSG = """
 Failed compilation from Sierra to Casm! Make sure you compiled the contract with the same compiler version Devnet is using for recompilation.
@@ -37,11 +70,13 @@ Find more info in https://0xspaceshard.github.io/starknet-devnet/docs/guide/cair
 class DefaultContractClassCompiler(ContractClassCompiler):
     """Uses the default internal cairo-lang compiler"""
 
-    def compile_contract_class(self, contract_class: ContractClass) -> CompiledClass:
+    def compile_contract_class(
+        self, contract_class: ContractClass, timeout: Optional[float] = None
+    ) -> CompiledClass:
+        # the internal compiler can't be aborted, so `timeout` is only enforced by waiters
         try:
             return compile_contract_class(
-                contract_class,
-                compiler_args="--add-pythonic-hints --allowed-libfuncs-list-name experimental_v0.1.0",
+                contract_class, compiler_args=" ".join(COMPILER_ARGS)
             )
         except PermissionError as permission_error:
             raise StarknetDevnetException(
@@ -54,6 +89,9 @@ class DefaultContractClassCompiler(ContractClassCompiler):
                 message=(stark_exception.message or "") + COMPILATION_ERROR_MSG,
             ) from stark_exception
 
+    def get_identity(self) -> str:
+        return f"cairo-lang {CAIRO_LANG_VERSION}"
+
 
 class CustomContractClassCompiler(ContractClassCompiler):
     """Uses the compiler according to the compiler_manifest provided in initialization"""
@@ -62,7 +100,9 @@ class CustomContractClassCompiler(ContractClassCompiler):
     def get_sierra_compiler_command(self) -> List[str]:
         """Returns the shell command of the sierra compiler"""
 
-    def compile_contract_class(self, contract_class: ContractClass) -> CompiledClass:
+    def compile_contract_class(
+        self, contract_class: ContractClass, timeout: Optional[float] = None
+    ) -> CompiledClass:
         with tempfile.TemporaryDirectory() as tmp_dir:
             contract_json = os.path.join(tmp_dir, "contract.json")
             contract_casm = os.path.join(tmp_dir, "contract.casm")
@@ -74,15 +114,20 @@ class CustomContractClassCompiler(ContractClassCompiler):
 
             compilation_args = [
                 *self.get_sierra_compiler_command(),
-                "--allowed-libfuncs-list-name",
-                "experimental_v0.1.0",
-                "--add-pythonic-hints",
+                *COMPILER_ARGS,
                 contract_json,
                 contract_casm,
             ]
-            compilation = subprocess.run(
-                compilation_args, capture_output=True, check=False
-            )
+            try:
+                compilation = subprocess.run(
+                    compilation_args, capture_output=True, check=False, timeout=timeout
+                )
+            except subprocess.TimeoutExpired as timeout_error:
+                # the compiler process is killed by now
+                raise StarknetDevnetException(
+                    code=StarknetErrorCode.COMPILATION_FAILED,
+                    message=f"Compilation timed out after {timeout} seconds.",
+                ) from timeout_error
             if compilation.returncode:
                 stderr = compilation.stderr.decode("utf-8")
                 raise StarknetDevnetException(
@@ -94,25 +139,62 @@ class CustomContractClassCompiler(ContractClassCompiler):
                 compiled_class = CompiledClass.loads(casm_file.read())
             return compiled_class
 
+    @lru_cache
+    def get_identity(self) -> str:
+        command = self.get_sierra_compiler_command()
+        version = subprocess.run(
+            [*command, "--version"], capture_output=True, check=False
+        ).stdout.decode("utf-8")
+        return f"{' '.join(command)} {version.strip()}"
+
 
 class ManifestContractClassCompiler(CustomContractClassCompiler):
     """Sierra compiler relying on the compiler repo manifest"""
 
     def __init__(self, compiler_manifest: str):
         super().__init__()
-        self._compiler_command = [
+        self.compiler_manifest = compiler_manifest
+
+    @lru_cache
+    def get_sierra_compiler_command(self) -> List[str]:
+        # built once and then executed directly, sparing cargo's checks on every compilation
+        build = subprocess.run(
+            [
+                "cargo",
+                "build",
+                "--bin",
+                "starknet-sierra-compile",
+                "--manifest-path",
+                self.compiler_manifest,
+                "--message-format=json",
+            ],
+            capture_output=True,
+            check=False,
+        )
+        if not build.returncode:
+            for line in build.stdout.decode("utf-8").splitlines():
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    continue
+                if (
+                    message.get("reason") == "compiler-artifact"
+                    and message.get("target", {}).get("name")
+                    == "starknet-sierra-compile"
+                    and message.get("executable")
+                ):
+                    return [message["executable"]]
+
+        return [
             "cargo",
             "run",
             "--bin",
             "starknet-sierra-compile",
             "--manifest-path",
-            compiler_manifest,
+            self.compiler_manifest,
             "--",
         ]
 
-    def get_sierra_compiler_command(self) -> List[str]:
-        return self._compiler_command
-
 
 class BinaryContractClassCompiler(CustomContractClassCompiler):
     """Sierra compiler relying on the starknet-sierra-compile binary executable"""
@@ -123,9 +205,42 @@ class BinaryContractClassCompiler(CustomContractClassCompiler):
     def get_sierra_compiler_command(self) -> List[str]:
         return self._compiler_command
 
+    def get_identity(self) -> str:
+        # a rebuilt binary may report the same version
+        stat = os.stat(self._compiler_command[0])
+        return f"{super().get_identity()} {stat.st_size} {stat.st_mtime_ns}"
 
-def select_compiler(config: DevnetConfig) -> ContractClassCompiler:
-    """Selects the compiler class according to the specification in the config object"""
+
+class CachingContractClassCompiler(ContractClassCompiler):
+    """Looks up the compilations of `compiler` in `cache` before compiling"""
+
+    def __init__(self, compiler: ContractClassCompiler, cache: CompilationCache):
+        self.compiler = compiler
+        self.cache = cache
+
+    def compile_contract_class(
+        self, contract_class: ContractClass, timeout: Optional[float] = None
+    ) -> CompiledClass:
+        return self.compile_contract_class_with_key(
+            contract_class, self.get_compilation_key(contract_class), timeout
+        )
+
+    def compile_contract_class_with_key(
+        self, contract_class: ContractClass, key: str, timeout: Optional[float] = None
+    ) -> CompiledClass:
+        compiled_class = self.cache.get(key)
+        if compiled_class is None:
+            compiled_class = self.compiler.compile_contract_class(
+                contract_class, timeout
+            )
+            self.cache.set(key, compiled_class)
+        return compiled_class
+
+    def get_identity(self) -> str:
+        return self.compiler.get_identity()
+
+
+def _select_uncached_compiler(config: DevnetConfig) -> ContractClassCompiler:
     if config.cairo_compiler_manifest:
         return ManifestContractClassCompiler(config.cairo_compiler_manifest)
 
@@ -133,3 +248,15 @@ def select_compiler(config: DevnetConfig) -> ContractClassCompiler:
         return BinaryContractClassCompiler(config.sierra_compiler_path)
 
     return DefaultContractClassCompiler()
+
+
+def select_compiler(config: DevnetConfig) -> ContractClassCompiler:
+    """Selects the compiler class according to the specification in the config object"""
+    compiler = _select_uncached_compiler(config)
+    if config.compilation_cache_dir:
+        cache = CompilationCache(
+            config.compilation_cache_dir, max_size=config.compilation_cache_size
+        )
+        return CachingContractClassCompiler(compiler, cache)
+
+    return compiler
@@ -0,0 +1,107 @@
+"""
+Compilation of contract classes in long-lived worker threads, off the request thread.
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict
+
+from starkware.starknet.definitions.error_codes import StarknetErrorCode
+from starkware.starknet.services.api.contract_class.contract_class import (
+    CompiledClass,
+    ContractClass,
+)
+
+from .compiler import ContractClassCompiler
+from .constants import (
+    COMPILED_CLASSES_CACHE_SIZE,
+    DEFAULT_COMPILATION_TIMEOUT,
+    DEFAULT_COMPILER_WORKERS,
+)
+from .util import LRUCache, StarknetDevnetException
+
+
+class CompilerPool:
+    """
+    Compiles contract classes with at most `size` compilations running at once.
+    A class may be submitted ahead of its declaration (e.g. while the declaration waits for
+    access to the state); concurrent and recent submissions of the same class share the result.
+    """
+
+    def __init__(self):
+        self.size = DEFAULT_COMPILER_WORKERS
+        self.timeout = DEFAULT_COMPILATION_TIMEOUT
+        self.__lock = threading.Lock()
+        self.__executor: ThreadPoolExecutor = None
+        self.__executor_pid: int = None
+        self.__in_progress: Dict[str, Future] = {}
+        self.__compiled = LRUCache(maxsize=COMPILED_CLASSES_CACHE_SIZE)
+
+    def configure(self, size: int, timeout: float):
+        """Set the number of workers and the timeout of a compilation (in seconds)"""
+        self.size = size
+        self.timeout = timeout
+
+    def __get_executor(self) -> ThreadPoolExecutor:
+        # threads don't survive forking, so a forked process creates its own
+        if self.__executor is None or self.__executor_pid != os.getpid():
+            self.__executor = ThreadPoolExecutor(
+                max_workers=self.size, thread_name_prefix="devnet-compiler"
+            )
+            self.__executor_pid = os.getpid()
+        return self.__executor
+
+    def submit(
+        self, compiler: ContractClassCompiler, contract_class: ContractClass
+    ) -> "Future[CompiledClass]":
+        """Start compiling `contract_class` with `compiler` unless it's already compiled"""
+        # computed once, it's passed on to the compiler (e.g. for looking up the cache)
+        key = compiler.get_compilation_key(contract_class)
+        with self.__lock:
+            compiled_class = self.__compiled.get(key)
+            if compiled_class is not None:
+                future = Future()
+                future.set_result(compiled_class)
+                return future
+
+            future = self.__in_progress.get(key)
+            if future is not None:
+                return future
+
+            future = self.__get_executor().submit(
+                compiler.compile_contract_class_with_key,
+                contract_class,
+                key,
+                self.timeout,
+            )
+            self.__in_progress[key] = future
+
+        future.add_done_callback(
+            lambda done_future: self.__store_result(key, done_future)
+        )
+        return future
+
+    def __store_result(self, key: str, future: Future):
+        with self.__lock:
+            self.__in_progress.pop(key, None)
+            if not future.cancelled() and future.exception() is None:
+                self.__compiled.set(key, future.result())
+
+    async def compile(
+        self, compiler: ContractClassCompiler, contract_class: ContractClass
+    ) -> CompiledClass:
+        """Compile `contract_class` with `compiler` in a worker and wait for the result"""
+        future = asyncio.wrap_future(self.submit(compiler, contract_class))
+        try:
+            # shielded so that other waiters for the same class aren't affected
+            return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except asyncio.TimeoutError as error:
+            raise StarknetDevnetException(
+                code=StarknetErrorCode.COMPILATION_FAILED,
+                message=f"Compilation timed out after {self.timeout} seconds.",
+            ) from error
+
+
+compiler_pool = CompilerPool()
@@ -0,0 +1,58 @@
+"""
+Compression of responses, negotiated through the Accept-Encoding header.
+Brotli is supported if the brotli package is installed, gzip always.
+"""
+
+import gzip
+from typing import List, Optional
+
+from flask import Request, Response
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# favor speed over ratio, responses are compressed on every request
+_GZIP_LEVEL = 5
+_BROTLI_QUALITY = 4
+
+
+def _supported_encodings() -> List[str]:
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def _compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=_BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=_GZIP_LEVEL)
+
+
+def compress_response(
+    request: Request, response: Response, threshold: Optional[int]
+) -> Response:
+    """
+    Compress the JSON body of `response` with the best encoding accepted by the client,
+    if it's at least `threshold` bytes long; no threshold disables compression.
+    Streamed responses are left intact.
+    """
+    if (
+        threshold is None
+        or response.mimetype != "application/json"
+        or response.direct_passthrough
+        or response.is_streamed
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    if response.status_code != 200 or len(response.get_data()) < threshold:
+        return response
+
+    encoding = request.accept_encodings.best_match(_supported_encodings())
+    if encoding is None:
+        return response
+
+    response.set_data(_compress(response.get_data(), encoding))
+    response.headers["Content-Encoding"] = encoding
+    return response
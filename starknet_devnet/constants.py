@@ -42,3 +42,47 @@ REPLACE_CLASS_SELECTOR = (
 
 LEGACY_RPC_TX_VERSION = 0
 LEGACY_TX_VERSION = 0
+
+DEFAULT_MAX_SUBSCRIBERS = 16
+DEFAULT_SUBSCRIPTION_QUEUE_SIZE = 1000
+SUBSCRIPTION_HEARTBEAT_INTERVAL = 15  # seconds
+# threads serving regular requests, in addition to one thread per subscriber
+DEFAULT_REQUEST_THREADS = 8
+
+DEFAULT_WAIT_FOR_TRANSACTION_TIMEOUT = 30  # seconds
+MAX_WAIT_FOR_TRANSACTION_TIMEOUT = 300  # seconds
+# threads reserved for requests waiting for transactions
+MAX_TRANSACTION_WAITERS = 32
+
+RPC_RECEIPT_CACHE_SIZE = 1024
+BLOCK_TRACES_CACHE_SIZE = 64
+RPC_BLOCK_RESPONSE_CACHE_SIZE = 256
+RPC_CONTRACT_CLASS_CACHE_SIZE = 128
+# serialized programs passed to the Rust VM, per class (and entry point builtins)
+DUMPED_PROGRAM_CACHE_SIZE = 256
+# hashes of classes by their content, and compiled class hashes of forked classes
+CLASS_HASH_CACHE_SIZE = 1024
+
+# in MB
+DEFAULT_COMPILATION_CACHE_SIZE = 256
+
+DEFAULT_COMPILER_WORKERS = 4
+DEFAULT_COMPILATION_TIMEOUT = 300  # seconds
+# compiled classes kept in memory, e.g. compiled ahead of their declaration
+COMPILED_CLASSES_CACHE_SIZE = 32
+
+# independent simulations of fewer transactions aren't worth pickling the state for workers
+MIN_TXS_FOR_PARALLEL_SIMULATION = 8
+# archived states pickled for the historical workers, by block
+STATE_SNAPSHOTS_CACHE_SIZE = 8
+# states unpickled by a worker process, kept for later tasks at the same state
+LOADED_SNAPSHOTS_CACHE_SIZE = 8
+
+# simulated executions kept for reuse by the same transactions, once submitted
+SIMULATED_EXECUTIONS_CACHE_SIZE = 64
+
+# results of calls, by the block or the state version they were computed at
+CALL_RESULTS_CACHE_SIZE = 1024
+
+# response header with the version of the state after the request was served
+STATE_VERSION_HEADER = "X-Devnet-State-Version"
@@ -28,9 +28,13 @@ from starknet_devnet.util import suppress_feeder_gateway_client_logger
 from . import __version__
 from .constants import (
     DEFAULT_ACCOUNTS,
+    DEFAULT_COMPILATION_CACHE_SIZE,
+    DEFAULT_COMPILATION_TIMEOUT,
+    DEFAULT_COMPILER_WORKERS,
     DEFAULT_GAS_PRICE,
     DEFAULT_HOST,
     DEFAULT_INITIAL_BALANCE,
+    DEFAULT_MAX_SUBSCRIBERS,
     DEFAULT_PORT,
     DEFAULT_TIMEOUT,
 )
@@ -387,6 +391,13 @@ def parse_args(raw_args: List[str]):
         action="store_true",
         help="Disable RPC schema validation for devnet responses",
     )
+    parser.add_argument(
+        "--rpc-response-validation-sampling",
+        action=PositiveAction,
+        default=1,
+        help="Validate only every N-th RPC response against the schema; "
+        "defaults to 1 (every response is validated)",
+    )
     parser.add_argument(
         "--cairo-compiler-manifest",
         type=_parse_cairo_compiler_manifest,
@@ -398,6 +409,97 @@ def parse_args(raw_args: List[str]):
         type=_parse_sierra_compiler_path,
         help="Specify the path to the binary executable of starknet-sierra-compile",
     )
+    parser.add_argument(
+        "--compilation-cache-dir",
+        help="Specify the directory in which classes compiled from Sierra to CASM are stored, "
+        "to be reused on redeclaration by this or other Devnet instances; "
+        "if omitted, every declaration is compiled",
+    )
+    parser.add_argument(
+        "--compilation-cache-size",
+        action=PositiveAction,
+        default=DEFAULT_COMPILATION_CACHE_SIZE,
+        help="Specify the maximum size (in MB) of the compilation cache; "
+        f"the least recently used classes are removed; defaults to {DEFAULT_COMPILATION_CACHE_SIZE}",
+    )
+    parser.add_argument(
+        "--compiler-workers",
+        action=PositiveAction,
+        default=DEFAULT_COMPILER_WORKERS,
+        help="Specify the maximum number of classes compiled from Sierra to CASM at once; "
+        f"defaults to {DEFAULT_COMPILER_WORKERS}",
+    )
+    parser.add_argument(
+        "--compilation-timeout",
+        action=PositiveAction,
+        default=DEFAULT_COMPILATION_TIMEOUT,
+        help="Specify the time (in seconds) after which a compilation from Sierra to CASM fails; "
+        f"defaults to {DEFAULT_COMPILATION_TIMEOUT}",
+    )
+
+    parser.add_argument(
+        "--compression-threshold",
+        action=NonNegativeAction,
+        help="Compress JSON responses of at least this size (in bytes) "
+        "if the client accepts gzip or br encoding; responses aren't compressed by default",
+    )
+    parser.add_argument(
+        "--persistent-event-loop",
+        action="store_true",
+        help="Run all requests on a single persistent event loop, "
+        "instead of creating an event loop for each request",
+    )
+    parser.add_argument(
+        "--read-replicas",
+        action=NonNegativeAction,
+        default=0,
+        help="Specify the number of worker processes serving read-only requests "
+        "(calls, fee estimations, storage and block queries) with a replicated state; "
+        "defaults to 0 (all requests are served by the main process)",
+    )
+    parser.add_argument(
+        "--historical-workers",
+        action=NonNegativeAction,
+        default=0,
+        help="Specify the maximum number of worker processes executing calls, fee estimations "
+        "and simulations at past blocks, in parallel with the main process; "
+        "defaults to 0 (executed in the main process)",
+    )
+    parser.add_argument(
+        "--max-queued-writes",
+        action=NonNegativeAction,
+        default=0,
+        help="Specify the maximum number of requests waiting for exclusive access to the state; "
+        "requests over it are rejected with 503; defaults to 0 (unlimited)",
+    )
+    parser.add_argument(
+        "--max-concurrent-executions",
+        action=NonNegativeAction,
+        default=0,
+        help="Specify the maximum number of state-modifying requests in progress; "
+        "requests over it are rejected with 429; defaults to 0 (unlimited)",
+    )
+    parser.add_argument(
+        "--max-concurrent-simulations",
+        action=NonNegativeAction,
+        default=0,
+        help="Specify the maximum number of fee estimation and simulation requests in progress; "
+        "requests over it are rejected with 429; defaults to 0 (unlimited)",
+    )
+    parser.add_argument(
+        "--max-concurrent-reads",
+        action=NonNegativeAction,
+        default=0,
+        help="Specify the maximum number of read-only requests in progress; "
+        "requests over it are rejected with 429; defaults to 0 (unlimited)",
+    )
+    parser.add_argument(
+        "--max-subscribers",
+        action=NonNegativeAction,
+        default=DEFAULT_MAX_SUBSCRIBERS,
+        help="Specify the maximum number of simultaneous subscribers to /subscribe; "
+        f"defaults to {DEFAULT_MAX_SUBSCRIBERS}",
+    )
 
     parsed_args = parser.parse_args(raw_args)
     if parsed_args.dump_on and not parsed_args.dump_path:
@@ -443,5 +545,11 @@ class DevnetConfig:
         self.chain_id = self.args.chain_id
         self.validate_rpc_requests = not self.args.disable_rpc_request_validation
         self.validate_rpc_responses = not self.args.disable_rpc_response_validation
+        self.compression_threshold = self.args.compression_threshold
+        self.rpc_response_validation_sampling = (
+            self.args.rpc_response_validation_sampling
+        )
         self.cairo_compiler_manifest = self.args.cairo_compiler_manifest
         self.sierra_compiler_path = self.args.sierra_compiler_path
+        self.compilation_cache_dir = self.args.compilation_cache_dir
+        self.compilation_cache_size = self.args.compilation_cache_size * 2**20
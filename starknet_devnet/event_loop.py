@@ -0,0 +1,47 @@
+"""
+A persistent event loop for running async views.
+"""
+
+import asyncio
+import threading
+from functools import wraps
+from typing import Any, Awaitable, Callable
+
+
+class PersistentEventLoop:
+    """
+    An event loop running in a daemon thread for the lifetime of the process.
+    Coroutines submitted from request threads all run on it, instead of each request
+    creating and closing its own loop. The loop is started lazily, so that it's created
+    in the server worker process rather than in the process that forks it.
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__loop: asyncio.AbstractEventLoop = None
+
+    def __get_loop(self) -> asyncio.AbstractEventLoop:
+        with self.__lock:
+            if self.__loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever, name="devnet-event-loop", daemon=True
+                ).start()
+                self.__loop = loop
+            return self.__loop
+
+    def run(self, coroutine: Awaitable) -> Any:
+        """
+        Run `coroutine` on the loop and block the calling thread until it's done.
+        The coroutine sees the context (e.g. the request) of the calling thread.
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self.__get_loop()).result()
+
+    def to_sync(self, func: Callable[..., Awaitable]) -> Callable:
+        """Return a blocking function running the async `func` on the loop"""
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return self.run(func(*args, **kwargs))
+
+        return wrapper
@@ -137,6 +137,7 @@ class FeeToken(PredeployedContractWrapper):
                 transaction, starknet.state.general_config
             )
             await starknet.state.execute_tx(internal_tx)
+            self.starknet_wrapper.state_changed()
         else:
             _, tx_hash_int = await self.starknet_wrapper.invoke(transaction)
             tx_hash = hex(tx_hash_int)
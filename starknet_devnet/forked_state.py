@@ -24,8 +24,16 @@ from starkware.starknet.testing.state import StarknetState
 from starkware.starkware_utils.error_handling import StarkException
 
 from .block_info_generator import now
+from .constants import CLASS_HASH_CACHE_SIZE
 from .general_config import build_devnet_general_config
-from .util import StarknetDevnetException, suppress_feeder_gateway_client_logger
+from .util import (
+    LRUCache,
+    StarknetDevnetException,
+    suppress_feeder_gateway_client_logger,
+)
+
+# by (origin url, forked block number, class hash); saves downloading and hashing a class
+_forked_compiled_class_hashes = LRUCache(maxsize=CLASS_HASH_CACHE_SIZE)
 
 
 def is_originally_starknet_exception(exc: BadRequest):
@@ -124,6 +132,15 @@ class ForkedStateReader(StateReader):
             raise
 
     async def get_compiled_class_hash(self, class_hash: int) -> int:
+        # the origin doesn't change at the forked block, so neither do its compiled class hashes
+        key = (self.__feeder_gateway_client.url, self.__block_number, class_hash)
+        compiled_class_hash = _forked_compiled_class_hashes.get(key)
+        if compiled_class_hash is None:
+            compiled_class_hash = await self.__fetch_compiled_class_hash(class_hash)
+            _forked_compiled_class_hashes.set(key, compiled_class_hash)
+        return compiled_class_hash
+
+    async def __fetch_compiled_class_hash(self, class_hash: int) -> int:
         try:
             with suppress_feeder_gateway_client_logger:
                 compiled_class_dict = (
@@ -0,0 +1,113 @@
+"""
+Encoding of JSON responses. If installed, orjson is used for speed; otherwise, or if forced
+through the STARKNET_DEVNET_JSON_ENCODER environment variable, the standard library is used.
+"""
+
+import dataclasses
+import json
+from typing import Any, Callable, Optional
+
+from flask import Response
+from starkware.starkware_utils.error_handling import StarkErrorCode
+
+from starknet_devnet.util import StarknetDevnetException
+
+try:
+    # orjson older than 3.9 has no Fragment, which is needed for integers beyond 64 bits
+    import orjson
+    from orjson import Fragment
+except ImportError:
+    orjson = None
+
+ENCODER_VAR = "STARKNET_DEVNET_JSON_ENCODER"
+
+_ORJSON_OPTIONS = (
+    0 if orjson is None else orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+)
+_ORJSON_MIN_INT = -(2**63)
+_ORJSON_MAX_INT = 2**64 - 1
+_ORJSON_BIG_INT_ERROR = "Integer exceeds 64-bit range"
+
+
+def _default(obj: Any) -> Any:
+    """Encode objects not supported natively, like Flask's encoder does"""
+    if dataclasses.is_dataclass(obj):
+        return dataclasses.asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(
+        obj, separators=(",", ":"), sort_keys=True, default=_default
+    ).encode("utf-8")
+
+
+def _with_big_ints_as_fragments(obj: Any) -> Any:
+    """
+    Return `obj` with integers outside of the range supported by orjson (felts, balances)
+    replaced by fragments holding their JSON representation.
+    """
+    if isinstance(obj, dict):
+        return {key: _with_big_ints_as_fragments(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_with_big_ints_as_fragments(value) for value in obj]
+    if isinstance(obj, int) and not _ORJSON_MIN_INT <= obj <= _ORJSON_MAX_INT:
+        return Fragment(str(obj))
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return _with_big_ints_as_fragments(dataclasses.asdict(obj))
+    return obj
+
+
+def _orjson_dumps(obj: Any) -> bytes:
+    try:
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+    except orjson.JSONEncodeError as error:
+        if str(error) != _ORJSON_BIG_INT_ERROR:
+            raise
+
+    # integers beyond 64 bits are rare in responses, so they are only looked for on failure
+    return orjson.dumps(
+        _with_big_ints_as_fragments(obj), default=_default, option=_ORJSON_OPTIONS
+    )
+
+
+class JsonEncoder:
+    """Serializes responses with the encoder selected on startup"""
+
+    def __init__(self):
+        self.dumps: Callable[[Any], bytes] = (
+            _stdlib_dumps if orjson is None else _orjson_dumps
+        )
+
+    def configure(self, encoder: Optional[str]):
+        """
+        Select the encoder by name ("json" or "orjson"); if not given, the default is kept.
+        Raises if the encoder is unknown or unavailable.
+        """
+        if encoder == "json":
+            self.dumps = _stdlib_dumps
+        elif encoder == "orjson":
+            if orjson is None:
+                raise StarknetDevnetException(
+                    code=StarkErrorCode.MALFORMED_REQUEST,
+                    message=f"Error: {ENCODER_VAR} is set to orjson, but orjson>=3.9 isn't installed",
+                )
+            self.dumps = _orjson_dumps
+        elif encoder:
+            raise StarknetDevnetException(
+                code=StarkErrorCode.MALFORMED_REQUEST,
+                message=f"Error: Invalid value of environment variable {ENCODER_VAR}: '{encoder}'",
+            )
+
+
+json_encoder = JsonEncoder()
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize `obj` to JSON with the configured encoder"""
+    return json_encoder.dumps(obj)
+
+
+def json_response(obj: Any, status: int = 200) -> Response:
+    """Serialize `obj` to a JSON response in a single pass"""
+    return Response(response=dumps(obj), status=status, mimetype="application/json")
@@ -52,3 +52,5 @@ class PredeployedContractWrapper(ABC):
             abi=self.contract_class.abi,
             contract_address=self.address,
         )
+
+        self.starknet_wrapper.state_changed()
@@ -0,0 +1,156 @@
+"""
+Running tasks in long-lived worker processes, in parallel with the serving process.
+"""
+
+import asyncio
+import itertools
+import os
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import current_process, get_context
+from typing import Any, Awaitable, Callable, List, Optional
+
+from starkware.starkware_utils.error_handling import StarkErrorCode, StarkException
+
+from .constants import LOADED_SNAPSHOTS_CACHE_SIZE
+from .util import LRUCache, StarknetDevnetException
+
+TaskFunction = Callable[..., Awaitable[Any]]
+
+# imported once by the fork server instead of by each worker forked from it
+_PRELOADED_MODULES = ["starknet_devnet.starknet_wrapper"]
+
+_snapshot_ids = itertools.count()
+# in a worker, the snapshots unpickled for previous tasks
+_loaded_snapshots = LRUCache(maxsize=LOADED_SNAPSHOTS_CACHE_SIZE)
+
+
+class Snapshot:
+    """
+    An object (e.g. a state) pickled once in the serving process, to be passed to any number
+    of tasks. Each worker unpickles a snapshot once and reuses it for later tasks, which must
+    therefore not modify it.
+    """
+
+    def __init__(self, value: Any):
+        self.snapshot_id = (os.getpid(), next(_snapshot_ids))
+        self.dump = pickle.dumps(value)
+
+    def load(self) -> Any:
+        """Return the unpickled object, unpickling it only on the first call in a process"""
+        value = _loaded_snapshots.get(self.snapshot_id)
+        if value is None:
+            value = pickle.loads(self.dump)
+            _loaded_snapshots.set(self.snapshot_id, value)
+        return value
+
+
+def _run_task(function: TaskFunction, args: tuple) -> tuple:
+    """Run in a worker; a raised StarkException is returned, since it can't be unpickled"""
+    args = [arg.load() if isinstance(arg, Snapshot) else arg for arg in args]
+    try:
+        return asyncio.run(function(*args)), None
+    except StarkException as error:
+        return None, (error.code, error.message, getattr(error, "status_code", 500))
+
+
+class WorkerPool:
+    """
+    Runs coroutine functions in at most `size` worker processes, started on first use by the
+    serving process and reused afterwards. The workers are forked from a fork server rather
+    than from the multi-threaded serving process, so tasks are pickled along with their arguments.
+    A task running longer than `timeout` seconds fails, and the workers are replaced.
+    """
+
+    def __init__(self):
+        self.size = 0
+        self.timeout: Optional[float] = None
+        self.__lock = threading.Lock()
+        self.__executor: ProcessPoolExecutor = None
+        self.__executor_pid: int = None
+
+    def configure(self, size: int, timeout: float):
+        """Set the number of workers (0 disables them) and the timeout of a task (0 for none)"""
+        self.size = size
+        self.timeout = timeout or None
+
+    @property
+    def enabled(self) -> bool:
+        """`True` if tasks should be submitted to the workers"""
+        # daemonic processes (e.g. read replicas) are not allowed to have children
+        return self.size > 0 and not current_process().daemon
+
+    def __get_executor(self) -> ProcessPoolExecutor:
+        with self.__lock:
+            # workers don't survive forking, so a forked process starts its own
+            if self.__executor is None or self.__executor_pid != os.getpid():
+                context = get_context("forkserver")
+                context.set_forkserver_preload(_PRELOADED_MODULES)
+                self.__executor = ProcessPoolExecutor(
+                    max_workers=self.size, mp_context=context
+                )
+                self.__executor_pid = os.getpid()
+            return self.__executor
+
+    def __discard(self, executor: ProcessPoolExecutor):
+        """Terminate the workers of `executor`; tasks still running on them fail"""
+        with self.__lock:
+            if self.__executor is executor:
+                self.__executor = None
+
+        # there is no public way of terminating the workers before Python 3.14
+        # pylint: disable=protected-access
+        for process in list((executor._processes or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False)
+
+    async def run(self, function: TaskFunction, *args) -> Any:
+        """
+        Run the coroutine function `function` with `args` in a worker and return its result.
+        Arguments passed as a `Snapshot` are unpickled before the call.
+        """
+        executor = self.__get_executor()
+        future = asyncio.wrap_future(executor.submit(_run_task, function, args))
+        try:
+            result, error = await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError as timeout_error:
+            self.__discard(executor)
+            raise StarknetDevnetException(
+                code=StarkErrorCode.REQUEST_FAILED,
+                message=f"Execution in a worker process timed out after {self.timeout} seconds.",
+            ) from timeout_error
+        except BrokenProcessPool as broken_error:
+            self.__discard(executor)
+            raise StarknetDevnetException(
+                code=StarkErrorCode.REQUEST_FAILED,
+                message="A worker process terminated during the execution.",
+            ) from broken_error
+
+        if error is not None:
+            code, message, status_code = error
+            raise StarknetDevnetException(
+                code=code, message=message, status_code=status_code
+            )
+        return result
+
+    async def run_all(self, function: TaskFunction, args_list: List[tuple]) -> list:
+        """
+        Run `function` with each of `args_list` in parallel and return the results in order.
+        If any call fails, the exception of the first failed one (in order) is raised.
+        """
+        outcomes = await asyncio.gather(
+            *[self.run(function, *args) for args in args_list], return_exceptions=True
+        )
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                raise outcome
+        return outcomes
+
+
+# simulating many transactions independently, in parallel
+simulation_workers = WorkerPool()
+
+# executing calls and simulations against archived states
+historical_workers = WorkerPool()
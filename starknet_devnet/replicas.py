@@ -0,0 +1,359 @@
+"""
+Read replicas: forked processes serving read-only requests, each against its own copy of the state.
+The primary process executes all writes and streams the resulting changes to the replicas.
+"""
+
+import queue
+from dataclasses import dataclass
+from multiprocessing import get_context
+from multiprocessing.connection import Connection
+from typing import Any, Dict, List, Optional, Tuple
+
+import cloudpickle as pickle
+from flask import Flask, Request, Response
+from starkware.starknet.business_logic.state.state import BlockInfo
+from starkware.starknet.services.api.feeder_gateway.response_objects import (
+    BlockStateUpdate,
+    StarknetBlock,
+)
+
+BLOCK_NUMBER_HEADER = "X-Devnet-Block-Number"
+"""Response header with the number of the latest block visible to the request"""
+
+MIN_BLOCK_NUMBER_HEADER = "X-Devnet-Min-Block-Number"
+"""Request header with the number of the block which the response must reflect"""
+
+_REQUEST = "request"
+_STATE = "state"
+_BLOCK = "block"
+_SNAPSHOT = "snapshot"
+
+
+@dataclass
+class StateChanges:
+    """Writes to the state since the previous synchronization of the replicas"""
+
+    class_hashes: Dict[int, int]
+    compiled_class_hashes: Dict[int, int]
+    nonces: Dict[int, int]
+    storage: Dict[Tuple[int, int], int]
+    compiled_classes: Dict[int, Any]
+    contract_classes: Dict[int, Any]
+    block_info: BlockInfo
+    state_version: int
+
+    def is_empty(self) -> bool:
+        """Return `True` if there are no writes to the state"""
+        return not any(
+            [
+                self.class_hashes,
+                self.compiled_class_hashes,
+                self.nonces,
+                self.storage,
+                self.compiled_classes,
+                self.contract_classes,
+            ]
+        )
+
+
+@dataclass
+class ReplicatedBlock:
+    """A block accepted by the primary process"""
+
+    block: StarknetBlock
+    state_update: BlockStateUpdate
+    transactions: list
+
+
+class _WriteRecorder(dict):
+    """A `dict` which records the keys written to it since they were last collected"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.written: Optional[set] = set()
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        if self.written is not None:
+            self.written.add(key)
+
+    def update(self, *args, **kwargs):
+        other = dict(*args, **kwargs)
+        super().update(other)
+        if self.written is not None:
+            self.written.update(other)
+
+    def collect(self) -> dict:
+        """Return the entries written since the previous call"""
+        written = {key: self[key] for key in self.written}
+        self.written = set()
+        return written
+
+    def __reduce__(self):
+        # copies (e.g. states preserved per block) and pickles are plain dicts
+        return dict, (dict(self),)
+
+
+# pylint: disable=protected-access
+class _StateTracker:
+    """
+    Tracks the writes to the state of `starknet_wrapper` since they were last collected.
+    The write mappings of the current state are replaced with recorders, so collecting
+    the writes takes time proportional to their number, not to the size of the state.
+    """
+
+    def __init__(self, starknet_wrapper):
+        self.starknet_wrapper = starknet_wrapper
+        self.__cached_state = starknet_wrapper.get_state().state
+        cache = self.__cached_state.cache
+        self.__recorders: List[_WriteRecorder] = []
+        for writes_attribute, view in (
+            ("_class_hash_writes", cache.address_to_class_hash),
+            ("_compiled_class_hash_writes", cache.class_hash_to_compiled_class_hash),
+            ("_nonce_writes", cache.address_to_nonce),
+            ("_storage_writes", cache.storage_view),
+        ):
+            recorder = _WriteRecorder(getattr(cache, writes_attribute))
+            setattr(cache, writes_attribute, recorder)
+            view.maps[0] = recorder
+            self.__recorders.append(recorder)
+
+        compiled_classes = _WriteRecorder(self.__cached_state.compiled_classes)
+        self.__cached_state._compiled_classes = compiled_classes
+        contract_classes = _WriteRecorder(starknet_wrapper._contract_classes)
+        starknet_wrapper._contract_classes = contract_classes
+        self.__recorders += [compiled_classes, contract_classes]
+
+        self.__block_info = self.__cached_state.block_info
+        self.__state_version = starknet_wrapper.state_version
+
+    def is_tracking(self, starknet_wrapper) -> bool:
+        """Return `True` if the current state of `starknet_wrapper` is tracked"""
+        return (
+            self.starknet_wrapper is starknet_wrapper
+            and self.__cached_state is starknet_wrapper.get_state().state
+        )
+
+    def stop(self):
+        """Stop recording the writes, e.g. in a replica, where they are never collected"""
+        for recorder in self.__recorders:
+            recorder.written = None
+
+    def collect(self) -> Optional[StateChanges]:
+        """Return the writes since the previous call, or `None` if there are none"""
+        changes = StateChanges(
+            *[recorder.collect() for recorder in self.__recorders],
+            block_info=self.__cached_state.block_info,
+            state_version=self.starknet_wrapper.state_version,
+        )
+        if (
+            changes.is_empty()
+            and changes.block_info == self.__block_info
+            and changes.state_version == self.__state_version
+        ):
+            return None
+
+        self.__block_info = changes.block_info
+        self.__state_version = changes.state_version
+        return changes
+
+
+def _apply_state_changes(starknet_wrapper, changes: StateChanges):
+    cached_state = starknet_wrapper.get_state().state
+    cached_state.cache.update_writes(
+        address_to_class_hash=changes.class_hashes,
+        address_to_nonce=changes.nonces,
+        class_hash_to_compiled_class_hash=changes.compiled_class_hashes,
+        storage_updates=changes.storage,
+    )
+    cached_state.compiled_classes.update(changes.compiled_classes)
+    starknet_wrapper._contract_classes.update(changes.contract_classes)
+    cached_state.update_block_info(changes.block_info)
+    # so that replicas report the same version as the primary process
+    starknet_wrapper.state_version = changes.state_version
+
+
+# pylint: enable=protected-access
+
+
+def _forwarded_request(request: Request) -> dict:
+    return {
+        "path": request.path,
+        "method": request.method,
+        "query_string": request.query_string,
+        "headers": list(request.headers.items()),
+        "data": request.get_data(),
+    }
+
+
+def _dispatch(app: Flask, forwarded_request: dict) -> tuple:
+    with app.test_client() as client:
+        response = client.open(**forwarded_request)
+    return response.status_code, list(response.headers.items()), response.get_data()
+
+
+class ReadReplicas:
+    """
+    Pool of read replicas. Replicas are forked from the primary process once its state
+    is initialized; then, each block accepted by the primary is streamed to all replicas,
+    together with its state diff and transactions. Writes not resulting in a new block
+    (e.g. lite minting) are streamed as state diffs, and when the chain is rewritten
+    (restart, load, block abortion) the whole state is sent instead.
+
+    Changes are streamed while no read is in progress and over the same connection as the
+    forwarded requests, so a replica always serves a request against the state as of
+    the last completed write.
+    """
+
+    def __init__(self):
+        self.__connections: List[Connection] = []
+        self.__idle: "queue.SimpleQueue[Connection]" = queue.SimpleQueue()
+        self.__tracker: _StateTracker = None
+        self.__block_number: int = None
+
+    @property
+    def enabled(self) -> bool:
+        """`True` in the primary process if replicas were started"""
+        return bool(self.__connections)
+
+    def start(self, app: Flask, global_state, number_of_replicas: int):
+        """Fork `number_of_replicas` processes serving `app` with a copy of `global_state`"""
+        # before forking, so that the replicas can stop recording the writes
+        self.__reset(global_state.starknet_wrapper)
+        context = get_context("fork")
+        for i in range(number_of_replicas):
+            primary_end, replica_end = context.Pipe()
+            self.__connections.append(primary_end)
+            context.Process(
+                target=self.__serve,
+                args=(replica_end, app, global_state),
+                name=f"devnet-read-replica-{i}",
+                daemon=True,
+            ).start()
+            replica_end.close()
+            self.__idle.put(primary_end)
+
+    def __serve(self, connection: Connection, app: Flask, global_state):
+        """Main loop of a replica process"""
+        for primary_end in self.__connections:
+            primary_end.close()
+        self.__connections = []
+        self.__tracker.stop()
+
+        while True:
+            try:
+                kind, payload = pickle.loads(connection.recv_bytes())
+            except EOFError:
+                return
+
+            if kind == _REQUEST:
+                connection.send_bytes(pickle.dumps(_dispatch(app, payload)))
+            elif kind == _STATE:
+                _apply_state_changes(global_state.starknet_wrapper, payload)
+            elif kind == _BLOCK:
+                global_state.starknet_wrapper.store_replicated_block(
+                    payload.block, payload.state_update, payload.transactions
+                )
+            elif kind == _SNAPSHOT:
+                global_state.set_starknet_wrapper(payload)
+
+    def __reset(self, starknet_wrapper):
+        self.__tracker = _StateTracker(starknet_wrapper)
+        self.__block_number = (
+            starknet_wrapper.blocks.get_number_of_accepted_blocks() - 1
+        )
+
+    def __broadcast(self, message: tuple):
+        data = pickle.dumps(message)
+        for connection in list(self.__connections):
+            try:
+                connection.send_bytes(data)
+            except OSError:
+                self.__remove(connection)
+
+    def __remove(self, connection: Connection):
+        """Stop using a replica which is no longer reachable"""
+        connection.close()
+        if connection in self.__connections:
+            self.__connections.remove(connection)
+
+    def __send_state_changes(self):
+        changes = self.__tracker.collect()
+        if changes is not None:
+            self.__broadcast((_STATE, changes))
+
+    async def publish_block(self, starknet_wrapper, block: StarknetBlock, transactions):
+        """Stream a newly accepted block to all replicas"""
+        if not self.enabled or not self.__tracker.is_tracking(starknet_wrapper):
+            return
+
+        state_update = await starknet_wrapper.blocks.get_state_update(
+            block_hash=hex(block.block_hash)
+        )
+        self.__send_state_changes()
+        self.__broadcast(
+            (_BLOCK, ReplicatedBlock(block, state_update, list(transactions)))
+        )
+        self.__block_number = block.block_number
+
+    def synchronize(self, starknet_wrapper):
+        """
+        Stream the changes not streamed with blocks. Must be called after each request
+        which might have modified the state, before any other request is served.
+        If the chain was rewritten, the whole `starknet_wrapper` is pickled (once for all
+        replicas) and sent to each replica, which takes time proportional to the size
+        of the state, during which no other request is served.
+        """
+        if not self.enabled:
+            return
+
+        if (
+            not self.__tracker.is_tracking(starknet_wrapper)
+            or starknet_wrapper.blocks.get_number_of_accepted_blocks() - 1
+            < self.__block_number
+        ):
+            self.__broadcast((_SNAPSHOT, starknet_wrapper))
+            self.__reset(starknet_wrapper)
+            return
+
+        self.__send_state_changes()
+
+    def forward(self, request: Request, starknet_wrapper) -> Optional[Response]:
+        """
+        Serve the read-only `request` on an idle replica and return the response.
+        Return `None` if it should be served by the primary process instead: if all replicas
+        are busy, if there is a pending block, or if the requested block isn't replicated yet.
+        """
+        if not self.enabled or starknet_wrapper.blocks.is_block_pending():
+            return None
+
+        min_block_number = request.headers.get(MIN_BLOCK_NUMBER_HEADER, type=int)
+        if min_block_number is not None and min_block_number > self.__block_number:
+            return None
+
+        try:
+            connection = self.__idle.get_nowait()
+        except queue.Empty:
+            return None
+
+        if connection.closed:
+            return None
+
+        # a replica which failed in any way is dropped, it might be out of sync
+        succeeded = False
+        try:
+            connection.send_bytes(pickle.dumps((_REQUEST, _forwarded_request(request))))
+            status, headers, body = pickle.loads(connection.recv_bytes())
+            succeeded = True
+        except (EOFError, OSError):
+            return None
+        finally:
+            if succeeded:
+                self.__idle.put(connection)
+            else:
+                self.__remove(connection)
+
+        return Response(body, status=status, headers=headers)
+
+
+replicas = ReadReplicas()
@@ -6,23 +6,59 @@ import asyncio
 import json
 import os
 import sys
+from typing import Optional
 
-from flask import Flask, jsonify
+from flask import Flask, g, jsonify, request
 from flask_cors import CORS
 from gunicorn.app.base import BaseApplication
 from starkware.starkware_utils.error_handling import StarkErrorCode, StarkException
 
+from .admission import RequestClass, admission
 from .blueprints.base import base
 from .blueprints.feeder_gateway import feeder_gateway
 from .blueprints.gateway import gateway
 from .blueprints.postman import postman
 from .blueprints.rpc.routes import rpc
+from .blueprints.shared import (
+    is_historical,
+    is_lock_free,
+    is_read_only,
+    is_simulation,
+    prepare_request,
+)
+from .compiler_pool import compiler_pool
+from .compression import compress_response
+from .constants import (
+    DEFAULT_REQUEST_THREADS,
+    MAX_TRANSACTION_WAITERS,
+    STATE_VERSION_HEADER,
+)
 from .devnet_config import DevnetConfig, DumpOn, parse_args
+from .event_loop import PersistentEventLoop
+from .json_encoding import ENCODER_VAR, json_encoder
+from .process_pool import historical_workers, simulation_workers
+from .replicas import BLOCK_NUMBER_HEADER, replicas
 from .starknet_wrapper import StarknetWrapper
 from .state import state
-from .util import StarknetDevnetException
+from .subscriptions import subscriptions
+from .util import OverloadedDevnetException, ReadWriteLock, StarknetDevnetException
 
-app = Flask(__name__)
+
+class DevnetFlask(Flask):
+    """
+    Flask application which can run async views on a persistent event loop.
+    By default, each async view runs on its own event loop, created for the request.
+    """
+
+    event_loop: Optional[PersistentEventLoop] = None
+
+    def async_to_sync(self, func):
+        if self.event_loop is None:
+            return super().async_to_sync(func)
+        return self.event_loop.to_sync(func)
+
+
+app = DevnetFlask(__name__)
 CORS(app)
 
 # if this is removed, the tests which don't run the main function will fail
@@ -38,6 +74,91 @@ app.register_blueprint(feeder_gateway)
 app.register_blueprint(postman)
 app.register_blueprint(rpc)
 
+# Requests are served by multiple threads (so that long-lived responses don't block the server).
+# Views only reading the global state run concurrently, all others get exclusive access to it.
+_state_lock = ReadWriteLock()
+
+
+def _request_class(view_func, read_only: bool) -> RequestClass:
+    if is_simulation(view_func):
+        return RequestClass.SIMULATE
+    return RequestClass.READ if read_only else RequestClass.EXECUTE
+
+
+@app.before_request
+def acquire_state_lock():
+    """
+    Admit the request and acquire shared or exclusive access to the global state,
+    unless the view needs neither. Read-only requests (including those only reading archived
+    states) are forwarded to a read replica if possible.
+    Background work of the request (e.g. compilation) is started before waiting.
+    """
+    view_func = app.view_functions.get(request.endpoint)
+    if is_lock_free(view_func):
+        return None
+
+    prepare_request(view_func)
+
+    read_only = is_historical(view_func) or is_read_only(view_func)
+    g.admission_ticket = admission.admit(
+        _request_class(view_func, read_only), exclusive=not read_only
+    )
+
+    if read_only:
+        _state_lock.acquire_read()
+        g.state_lock_mode = "read"
+        admission.granted(g.admission_ticket)
+        return replicas.forward(request, state.starknet_wrapper)
+
+    _state_lock.acquire_write()
+    g.state_lock_mode = "write"
+    admission.granted(g.admission_ticket)
+    return None
+
+
+@app.teardown_request
+def release_state_lock(_exception):
+    """Release the access acquired in `acquire_state_lock`."""
+    mode = g.pop("state_lock_mode", None)
+    if mode == "read":
+        _state_lock.release_read()
+    elif mode == "write":
+        try:
+            replicas.synchronize(state.starknet_wrapper)
+        finally:
+            _state_lock.release_write()
+
+    ticket = g.pop("admission_ticket", None)
+    if ticket is not None:
+        admission.release(ticket)
+
+
+@app.after_request
+def add_block_number(response):
+    """With read replicas, report the latest block visible to the request."""
+    if replicas.enabled:
+        latest_block_number = (
+            state.starknet_wrapper.blocks.get_number_of_accepted_blocks() - 1
+        )
+        response.headers[BLOCK_NUMBER_HEADER] = str(latest_block_number)
+    return response
+
+
+@app.after_request
+def add_state_version(response):
+    """Report the version of the state as of the end of the request."""
+    response.headers[STATE_VERSION_HEADER] = str(state.starknet_wrapper.state_version)
+    return response
+
+
+@app.after_request
+def compress(response):
+    """Compress large responses if the client accepts it."""
+    return compress_response(
+        request, response, state.starknet_wrapper.config.compression_threshold
+    )
+
+
 # We don't need init method here.
 # pylint: disable=W0223
 class GunicornServer(BaseApplication):
@@ -51,6 +172,13 @@ class GunicornServer(BaseApplication):
     def load_config(self):
         self.cfg.set("bind", f"{self.args.host}:{self.args.port}")
         self.cfg.set("workers", 1)
+        self.cfg.set("worker_class", "gthread")
+        self.cfg.set(
+            "threads",
+            self.args.max_subscribers
+            + MAX_TRANSACTION_WAITERS
+            + DEFAULT_REQUEST_THREADS,
+        )
         self.cfg.set("timeout", self.args.timeout)
         self.cfg.set(
             "logconfig_dict",
@@ -90,10 +218,29 @@ def main():
             state.set_starknet_wrapper(StarknetWrapper(DevnetConfig(args)))
 
         state.set_dump_options(args.dump_path, args.dump_on)
+        subscriptions.max_subscribers = args.max_subscribers
+        admission.configure(
+            max_queued_writes=args.max_queued_writes,
+            limits={
+                RequestClass.EXECUTE: args.max_concurrent_executions,
+                RequestClass.SIMULATE: args.max_concurrent_simulations,
+                RequestClass.READ: args.max_concurrent_reads,
+            },
+        )
+        historical_workers.configure(args.historical_workers, args.timeout)
+        # a single worker would only add the cost of pickling the state
+        cpu_count = os.cpu_count() or 1
+        simulation_workers.configure(cpu_count if cpu_count > 1 else 0, args.timeout)
+        compiler_pool.configure(args.compiler_workers, args.compilation_timeout)
+        json_encoder.configure(os.environ.get(ENCODER_VAR))
+        if args.persistent_event_loop:
+            app.event_loop = PersistentEventLoop()
     except StarknetDevnetException as error:
         sys.exit(error.message)
 
     asyncio.run(state.starknet_wrapper.initialize())
+    if args.read_replicas:
+        replicas.start(app, state, args.read_replicas)
 
     main_pid = os.getpid()
     print(f" * Listening on http://{args.host}:{args.port}/ (Press CTRL+C to quit)")
@@ -111,10 +258,18 @@ def main():
 @app.errorhandler(StarkException)
 def handle_stark_exception(error: StarkException):
     """Handles the error and responds in JSON."""
-    return {
-        "message": error.message,
-        "code": str(error.code),
-    }, error.status_code
+    headers = {}
+    if isinstance(error, OverloadedDevnetException):
+        headers["Retry-After"] = str(error.retry_after)
+
+    return (
+        {
+            "message": error.message,
+            "code": str(error.code),
+        },
+        error.status_code,
+        headers,
+    )
 
 
 @app.errorhandler(json.decoder.JSONDecodeError)
@@ -0,0 +1,200 @@
+"""
+Reuse of simulated executions by the identical transactions submitted after them,
+e.g. when a client estimates the fee of a signed transaction and then sends it.
+"""
+
+import asyncio
+import dataclasses
+from dataclasses import dataclass
+from functools import partial
+from typing import Hashable, Optional
+
+from starkware.starknet.business_logic.state.state import (
+    BlockInfo,
+    CachedState,
+    StateCache,
+    StateSyncifier,
+)
+from starkware.starknet.business_logic.transaction.objects import (
+    InternalAccountTransaction,
+    TransactionExecutionInfo,
+)
+from starkware.starknet.definitions.general_config import StarknetGeneralConfig
+from starkware.starknet.definitions.transaction_type import TransactionType
+from starkware.starknet.testing.state import StarknetState
+
+from .constants import SIMULATED_EXECUTIONS_CACHE_SIZE
+from .util import Invalidation, LRUCache
+
+
+@dataclass
+class SimulatedExecution:
+    """The outcome of the validation and the execution of a simulated transaction"""
+
+    execution_info: TransactionExecutionInfo
+    """Without the fee transfer, which isn't performed in simulations"""
+
+    writes: StateCache
+    block_info: BlockInfo
+
+
+class _BlockNumberRecordingInfo(BlockInfo):
+    """
+    A block info recording whether its block number was read after its creation,
+    whichever way (e.g. by a syscall, by dumping or by comparing it)
+    """
+
+    @property
+    def block_number(self) -> int:
+        object.__setattr__(self, "block_number_read", True)
+        return self.__dict__["_block_number"]
+
+    @block_number.setter
+    def block_number(self, block_number: int):
+        # only set by the initializer, the block info being frozen
+        object.__setattr__(self, "_block_number", block_number)
+
+    def __post_init__(self):
+        super().__post_init__()
+        # not counting the validation
+        object.__setattr__(self, "block_number_read", False)
+
+    @classmethod
+    def of(cls, block_info: BlockInfo) -> "_BlockNumberRecordingInfo":
+        """Return a recording copy of `block_info`"""
+        return cls(
+            **{
+                field.name: getattr(block_info, field.name)
+                for field in dataclasses.fields(block_info)
+            }
+        )
+
+
+def _execution_key(
+    internal_tx: InternalAccountTransaction, skip_validate: bool
+) -> Hashable:
+    # the hash covers all the fields of the transaction visible to the execution except the signature
+    return (internal_tx.hash_value, tuple(internal_tx.signature), skip_validate)
+
+
+class SimulatedExecutions:
+    """
+    Executions of simulated transactions, by the version of the state they were simulated on.
+    A transaction, submitted when the state is still of that version, only needs to be charged.
+    """
+
+    def __init__(self):
+        self.__executions = LRUCache(
+            maxsize=SIMULATED_EXECUTIONS_CACHE_SIZE, invalidation=Invalidation.VERSION
+        )
+
+    async def simulate(
+        self,
+        internal_tx: InternalAccountTransaction,
+        state: CachedState,
+        general_config: StarknetGeneralConfig,
+        state_version: Optional[int],
+    ) -> TransactionExecutionInfo:
+        """
+        Apply `internal_tx` (created for simulation) to `state`, like `apply_state_updates`.
+        If `state` is of `state_version`, the execution is recorded for reuse.
+        """
+        if (
+            state_version is None
+            or internal_tx.skip_validate
+            # only invocations are looked up
+            or internal_tx.tx_type != TransactionType.INVOKE_FUNCTION
+        ):
+            return await internal_tx.apply_state_updates(state, general_config)
+
+        loop = asyncio.get_running_loop()
+
+        # The two stages of `InternalStateTransaction.sync_apply_state_updates` are applied
+        # separately, like it does; the first one (the validation and the execution)
+        # to a copy of the state, so that its writes are known.
+        block_info = _BlockNumberRecordingInfo.of(state.block_info)
+        with state.copy_and_apply() as execution_state:
+            execution_state.block_info = block_info
+            execution_info = await loop.run_in_executor(
+                None,
+                partial(
+                    internal_tx.apply_concurrent_changes,
+                    state=StateSyncifier(async_state=execution_state, loop=loop),
+                    general_config=general_config,
+                ),
+            )
+            # the block info of the copy is applied to `state` on exit
+            execution_state.block_info = state.block_info
+
+        fee_transfer_info, actual_fee = await loop.run_in_executor(
+            None,
+            partial(
+                internal_tx.apply_sequential_changes,
+                state=StateSyncifier(async_state=state, loop=loop),
+                general_config=general_config,
+                actual_resources=execution_info.actual_resources,
+            ),
+        )
+
+        # a submitted transaction is executed in the next block, so its block number differs
+        if not block_info.block_number_read:
+            self.__executions.set(
+                _execution_key(internal_tx, skip_validate=False),
+                SimulatedExecution(
+                    execution_info=execution_info,
+                    writes=execution_state.cache,
+                    block_info=state.block_info,
+                ),
+                source=state_version,
+            )
+
+        return TransactionExecutionInfo.from_concurrent_stage_execution_info(
+            concurrent_execution_info=execution_info,
+            fee_transfer_info=fee_transfer_info,
+            actual_fee=actual_fee,
+        )
+
+    async def execute(
+        self,
+        internal_tx: InternalAccountTransaction,
+        state: StarknetState,
+        state_version: int,
+    ) -> TransactionExecutionInfo:
+        """
+        Execute `internal_tx` on `state`, of `state_version`, like `StarknetState.execute_tx`.
+        If the same transaction was simulated on the state of the same version, only the
+        sequential part (the nonce and the fee) is executed, the rest is taken from the simulation.
+        """
+        key = _execution_key(internal_tx, skip_validate=False)
+        simulated: Optional[SimulatedExecution] = self.__executions.get(
+            key, source=state_version
+        )
+        block_info = state.state.block_info
+        if simulated is None or block_info != dataclasses.replace(
+            simulated.block_info, block_number=block_info.block_number
+        ):
+            return await state.execute_tx(internal_tx)
+
+        loop = asyncio.get_running_loop()
+        with state.state.copy_and_apply() as state_copy:
+            state_copy.cache.update_writes_from_other(simulated.writes)
+            fee_transfer_info, actual_fee = await loop.run_in_executor(
+                None,
+                partial(
+                    internal_tx.apply_sequential_changes,
+                    state=StateSyncifier(async_state=state_copy, loop=loop),
+                    general_config=state.general_config,
+                    actual_resources=simulated.execution_info.actual_resources,
+                ),
+            )
+
+        execution_info = TransactionExecutionInfo.from_concurrent_stage_execution_info(
+            concurrent_execution_info=simulated.execution_info,
+            fee_transfer_info=fee_transfer_info,
+            actual_fee=actual_fee,
+        )
+        state.add_messages_and_events(execution_info=execution_info)
+        return execution_info
+
+
+simulated_executions = SimulatedExecutions()
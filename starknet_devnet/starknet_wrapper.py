@@ -4,6 +4,7 @@ This module introduces `StarknetWrapper`, a wrapper class of
 starkware.starknet.testing.starknet.Starknet.
 """
 from copy import deepcopy
+from itertools import count
 from types import TracebackType
 from typing import Dict, List, Optional, Set, Tuple, Type, Union
 
@@ -27,6 +28,7 @@ from starkware.starknet.core.os.contract_class.compiled_class_hash import (
     compute_compiled_class_hash,
 )
 from starkware.starknet.definitions.error_codes import StarknetErrorCode
+from starkware.starknet.definitions.general_config import StarknetGeneralConfig
 from starkware.starknet.definitions.transaction_type import TransactionType
 from starkware.starknet.services.api.contract_class.contract_class import (
     CompiledClass,
@@ -44,6 +46,7 @@ from starkware.starknet.services.api.feeder_gateway.response_objects import (
     BlockStateUpdate,
     ClassHashPair,
     ContractAddressHashPair,
+    FeeEstimationInfo,
     StarknetBlock,
     StateDiff,
     StorageEntry,
@@ -62,6 +65,7 @@ from starkware.starknet.services.utils.sequencer_api_utils import (
 )
 from starkware.starknet.testing.objects import FunctionInvocation
 from starkware.starknet.testing.starknet import Starknet
+from starkware.starknet.testing.state import StarknetState
 from starkware.starknet.third_party.open_zeppelin.starknet_contracts import (
     account_contract as oz_account_class,
 )
@@ -73,11 +77,15 @@ from .blocks import DevnetBlocks
 from .blueprints.rpc.structures.types import BlockId, Felt
 from .chargeable_account import ChargeableAccount
 from .compiler import select_compiler
+from .compiler_pool import compiler_pool
 from .constants import (
+    CALL_RESULTS_CACHE_SIZE,
     DUMMY_PENDING_BLOCK_HASH,
     DUMMY_STATE_ROOT,
     LEGACY_TX_VERSION,
+    MIN_TXS_FOR_PARALLEL_SIMULATION,
     STARKNET_CLI_ACCOUNT_CLASS_HASH,
+    STATE_SNAPSHOTS_CACHE_SIZE,
 )
 from .devnet_config import DevnetConfig
 from .fee_token import FeeToken
@@ -85,19 +93,27 @@ from .forked_state import get_forked_starknet
 from .general_config import build_devnet_general_config
 from .origin import ForkedOrigin, NullOrigin
 from .postman_wrapper import DevnetL1L2
+from .process_pool import Snapshot, historical_workers, simulation_workers
+from .replicas import replicas
+from .simulated_executions import simulated_executions
+from .subscriptions import subscriptions
 from .transactions import (
     DevnetTransaction,
     DevnetTransactions,
     create_empty_internal_declare,
     create_empty_internal_deploy,
     create_genesis_block_transaction,
+    transaction_waiters,
 )
 from .udc import UDC
 from .util import (
+    Invalidation,
+    LRUCache,
     StarknetDevnetException,
     UndeclaredClassDevnetException,
     assert_not_declared,
     assert_recompiled_class_hash,
+    create_overlay_state,
     enable_pickling,
     get_all_declared_cairo0_classes,
     get_all_declared_cairo1_classes,
@@ -112,6 +128,138 @@ enable_pickling()
 
 DEFAULT_BLOCK_ID = LATEST_BLOCK_ID
 
+# versions of states are unique within the process, even across restarts and loads
+_state_versions = count()
+
+# results of calls at accepted blocks, valid as long as the archived state of the block
+_call_results = LRUCache(
+    maxsize=CALL_RESULTS_CACHE_SIZE, invalidation=Invalidation.OWNER
+)
+# results of calls at the latest and the pending block, valid for a single state version
+_versioned_call_results = LRUCache(
+    maxsize=CALL_RESULTS_CACHE_SIZE, invalidation=Invalidation.VERSION
+)
+# archived states of accepted blocks, pickled for the historical workers
+_state_snapshots = LRUCache(
+    maxsize=STATE_SNAPSHOTS_CACHE_SIZE, invalidation=Invalidation.OWNER
+)
+
+
+async def _simulate_tx(
+    cached_state: CachedState,
+    general_config: StarknetGeneralConfig,
+    external_tx: InvokeFunction,
+    skip_validate: bool,
+    state_version: Optional[int] = None,
+) -> Tuple[TransactionTrace, FeeEstimationInfo, TransactionType]:
+    """
+    Simulate `external_tx` on `cached_state`, which is modified.
+    If `cached_state` is a copy of the global state of `state_version`, the execution is recorded.
+    """
+    try:
+        internal_tx = InternalInvokeFunctionForSimulate.create_for_simulate(
+            external_tx,
+            general_config,
+            skip_validate=skip_validate,
+        )
+    except AssertionError as error:
+        raise StarknetDevnetException(
+            code=StarkErrorCode.MALFORMED_REQUEST,
+            status_code=400,
+            message="Invalid format of fee estimation request",
+        ) from error
+
+    execution_info = await simulated_executions.simulate(
+        internal_tx, cached_state, general_config, state_version
+    )
+
+    trace = TransactionTrace(
+        validate_invocation=FunctionInvocation.from_optional_internal(
+            execution_info.validate_info
+        ),
+        function_invocation=FunctionInvocation.from_optional_internal(
+            execution_info.call_info
+        ),
+        fee_transfer_invocation=FunctionInvocation.from_optional_internal(
+            execution_info.fee_transfer_info
+        ),
+        signature=external_tx.signature,
+    )
+
+    fee_estimation_info = get_fee_estimation_info(
+        execution_info.actual_fee, cached_state.block_info.gas_price
+    )
+    return trace, fee_estimation_info, internal_tx.tx_type
+
+
+async def _simulate_txs(
+    state: StarknetState,
+    external_txs: List[InvokeFunction],
+    skip_validate: bool,
+    independent: bool,
+    state_version: Optional[int] = None,
+) -> List[Tuple[TransactionTrace, FeeEstimationInfo, TransactionType]]:
+    """
+    Simulate `external_txs` one by one, each on the state resulting from the previous one,
+    or on `state` if `independent`. `state_version` is the version of `state`, if it's global.
+    """
+    results = []
+    base_state = state.state
+    for external_tx in external_txs:
+        # pylint: disable=protected-access
+        tx_state = base_state._copy()
+        results.append(
+            await _simulate_tx(
+                tx_state,
+                state.general_config,
+                external_tx,
+                skip_validate,
+                state_version if base_state is state.state else None,
+            )
+        )
+        if not independent:
+            base_state = tx_state
+    return results
+
+
+async def _execute_call(
+    state: StarknetState, address: int, selector: int, calldata: List[int]
+) -> List[int]:
+    """Call the function of `address` on an overlay of `state`; return the retdata"""
+    call_info = await create_overlay_state(state).execute_entry_point_raw(
+        contract_address=address,
+        selector=selector,
+        calldata=calldata,
+        caller_address=0,
+    )
+    return call_info.retdata
+
+
+def _is_historical(block_id: BlockId) -> bool:
+    """Return `True` if `block_id` refers to an accepted block, whose state is archived"""
+    return isinstance(block_id, dict)
+
+
+def _get_state_snapshot(block_hash: int, state: StarknetState) -> Snapshot:
+    """Return the snapshot of `state`, the archived state of the block `block_hash`"""
+    snapshot = _state_snapshots.get(block_hash, source=state)
+    if snapshot is None:
+        snapshot = Snapshot(state)
+        _state_snapshots.set(block_hash, snapshot, source=state)
+    return snapshot
+
+
+def _split(items: list, number_of_parts: int) -> List[list]:
+    """Split `items` into `number_of_parts` consecutive parts of (nearly) equal lengths"""
+    part_length, longer_parts = divmod(len(items), number_of_parts)
+    parts = []
+    start = 0
+    for i in range(number_of_parts):
+        end = start + part_length + (1 if i < longer_parts else 0)
+        parts.append(items[start:end])
+        start = end
+    return parts
+
 
 # pylint: disable=too-many-instance-attributes
 # pylint: disable=too-many-public-methods
@@ -147,6 +295,9 @@ class StarknetWrapper:
         """If v2 - store sierra, otherwise store old class; needed for get_class_by_hash"""
         self.genesis_block_number = None
         self._compiler = select_compiler(config)
+        self.state_version = next(_state_versions)
+        """Increases whenever the global (pending) state changes"""
+        self.__latest_state_version = None
 
         if config.start_time is not None:
             self.set_block_time(config.start_time)
@@ -157,7 +308,11 @@ class StarknetWrapper:
     def load(path: str) -> "StarknetWrapper":
         """Load a serialized instance of this class from `path`."""
         with open(path, "rb") as file:
-            return pickle.load(file)
+            starknet_wrapper: StarknetWrapper = pickle.load(file)
+
+        # versions are only unique within the process which assigned them
+        starknet_wrapper.__renew_state_versions()
+        return starknet_wrapper
 
     async def initialize(self):
         """Initialize the underlying starknet instance, fee_token and accounts."""
@@ -177,6 +332,7 @@ class StarknetWrapper:
             await self.__preserve_current_state(starknet.state.state)
             await self.__create_genesis_block()
             self.__latest_state = self.get_state().copy()
+            self.__latest_state_version = self.state_version
             self.__initialized = True
 
     async def __create_genesis_block(self):
@@ -239,10 +395,21 @@ class StarknetWrapper:
         self._update_block_number()
         state_update = await self.update_pending_state()
         self.__latest_state = self.get_state().copy()
+        self.__latest_state_version = self.state_version
         return await self.blocks.generate_empty_block(self.get_state(), state_update)
 
     async def __preserve_current_state(self, state: CachedState):
         self.__current_cached_state = deepcopy(state)
+        self.state_changed()
+
+    def state_changed(self):
+        """Mark the global state as changed; to be called on changes outside transactions"""
+        self.state_version = next(_state_versions)
+
+    def __renew_state_versions(self):
+        self.state_changed()
+        if self.__latest_state_version is not None:
+            self.__latest_state_version = next(_state_versions)
 
     async def __init_starknet(self):
         """
@@ -344,6 +511,7 @@ class StarknetWrapper:
             transaction.set_failure_reason(error_message)
 
         self.transactions.store(transaction.transaction_hash, transaction)
+        subscriptions.publish_transaction(transaction)
 
     async def declare(
         self, external_tx: Union[Declare, DeprecatedDeclare]
@@ -368,8 +536,8 @@ class StarknetWrapper:
             if isinstance(external_tx, Declare):
                 await assert_not_declared(class_hash, compiled_class_hash)
                 compiled_class_hash = tx_handler.internal_tx.compiled_class_hash
-                compiled_class = self._compiler.compile_contract_class(
-                    external_tx.contract_class
+                compiled_class = await compiler_pool.compile(
+                    self._compiler, external_tx.contract_class
                 )
                 compiled_class_hash_computed = compute_compiled_class_hash(
                     compiled_class
@@ -403,6 +571,13 @@ class StarknetWrapper:
 
         return class_hash, tx_handler.internal_tx.hash_value
 
+    def precompile(self, contract_class: ContractClass):
+        """
+        Start compiling `contract_class` in the background,
+        so that its declaration finds it compiled (or being compiled)
+        """
+        compiler_pool.submit(self._compiler, contract_class)
+
     def _update_block_number(self):
         """Updates just the block number. Returns the old block info to allow reverting"""
         current_cached_state = self.get_state().state
@@ -552,7 +727,9 @@ class StarknetWrapper:
             tx_handler.internal_tx = InternalInvokeFunction.from_external(
                 external_tx, state.general_config
             )
-            tx_handler.execution_info = await state.execute_tx(tx_handler.internal_tx)
+            tx_handler.execution_info = await simulated_executions.execute(
+                tx_handler.internal_tx, state, self.state_version
+            )
             tx_handler.internal_calls = (
                 tx_handler.execution_info.call_info.internal_calls
             )
@@ -568,15 +745,18 @@ class StarknetWrapper:
         if block_id == LATEST_BLOCK_ID:
             return self.__latest_state
 
+        return self.blocks.get_state(await self.__get_query_block_hash(block_id))
+
+    async def __get_query_block_hash(self, block_id: BlockId) -> int:
+        """Return the hash of the accepted block referred to by `block_id`"""
         assert isinstance(block_id, dict)
         if block_id.get("block_hash"):
-            numeric_hash = self.blocks.get_numeric_hash(block_id.get("block_hash"))
-            return self.blocks.get_state(numeric_hash)
+            return self.blocks.get_numeric_hash(block_id.get("block_hash"))
 
         try:
             block_number = block_id.get("block_number")
             block = await self.blocks.get_by_number(int(block_number))
-            return self.blocks.get_state(block.block_hash)
+            return block.block_hash
         except ValueError:
             pass
 
@@ -585,30 +765,65 @@ class StarknetWrapper:
             message=f"Invalid block id: {block_id}",
         )
 
+    def __get_query_state_version(self, block_id: BlockId) -> Optional[int]:
+        """Return the version of the global state the query state is a copy of, if any"""
+        if block_id == PENDING_BLOCK_ID:
+            return self.state_version
+        if block_id == LATEST_BLOCK_ID:
+            return self.__latest_state_version
+        return None
+
     async def call(
         self,
         transaction: Union[CallFunction, InvokeFunction],
         block_id: BlockId = DEFAULT_BLOCK_ID,
     ):
-        """Perform call according to specifications in `transaction`."""
-        state = await self.__get_query_state(block_id)
-
+        """
+        Perform call according to specifications in `transaction`.
+        Results are reused by identical calls at the same accepted block, or at the same
+        version of the state for `latest` and `pending`.
+        """
         # property name different since starknet 0.11
         address = (
             transaction.contract_address
             if isinstance(transaction, CallFunction)
             else transaction.sender_address
         )
-
-        call_info = await state.copy().execute_entry_point_raw(
-            contract_address=address,
-            selector=transaction.entry_point_selector,
-            calldata=transaction.calldata,
-            caller_address=0,
+        call_key = (
+            address,
+            transaction.entry_point_selector,
+            tuple(transaction.calldata),
         )
 
-        result = list(map(hex, call_info.retdata))
-        return {"result": result}
+        # both caches take the key and what the result was computed from
+        if _is_historical(block_id):
+            block_hash = await self.__get_query_block_hash(block_id)
+            state = self.blocks.get_state(block_hash)
+            cache, cache_key, source = _call_results, (block_hash, *call_key), state
+        else:
+            state = await self.__get_query_state(block_id)
+            state_version = self.__get_query_state_version(block_id)
+            cache, cache_key, source = _versioned_call_results, call_key, state_version
+
+        result = cache.get(cache_key, source=source)
+        if result is None:
+            call_args = (
+                address,
+                transaction.entry_point_selector,
+                transaction.calldata,
+            )
+            if _is_historical(block_id) and historical_workers.enabled:
+                retdata = await historical_workers.run(
+                    _execute_call, _get_state_snapshot(block_hash, state), *call_args
+                )
+            else:
+                retdata = await _execute_call(state, *call_args)
+
+            result = tuple(map(hex, retdata))
+            if source is not None:
+                cache.set(cache_key, result, source=source)
+
+        return {"result": list(result)}
 
     async def __deploy(self, deploy_tx: Union[InternalDeploy, InternalDeployAccount]):
         """
@@ -637,6 +852,12 @@ class StarknetWrapper:
                 internal_call.internal_calls, tx_hash, deployed_contracts
             )
 
+    def get_local_contract_class(
+        self, class_hash: int
+    ) -> Optional[Union[ContractClass, DeprecatedCompiledClass]]:
+        """Return contract class declared in devnet, not looking it up in the origin"""
+        return self._contract_classes.get(class_hash)
+
     async def get_class_by_hash(self, class_hash: int) -> dict:
         """Return contract class given class hash"""
         if class_hash in self._contract_classes:
@@ -811,16 +1032,38 @@ class StarknetWrapper:
             block = await self.create_empty_block()
 
         for transaction in self.pending_txs:
-            transaction.status = TransactionStatus.ACCEPTED_ON_L2
+            # block first, so that an accepted transaction is never seen without it
             transaction.set_block(block=block)
+            transaction.status = TransactionStatus.ACCEPTED_ON_L2
 
         # Update latest state before block generation
         self.__latest_state = state.copy()
+        self.__latest_state_version = self.state_version
+        await replicas.publish_block(self, block, self.pending_txs)
+
+        subscriptions.publish_block(block)
+        for transaction in self.pending_txs:
+            subscriptions.publish_transaction(transaction)
+            transaction_waiters.notify(transaction.transaction_hash)
 
         self.pending_txs = []
 
         return block
 
+    def store_replicated_block(
+        self,
+        block: StarknetBlock,
+        state_update: BlockStateUpdate,
+        transactions: List[DevnetTransaction],
+    ):
+        """Store a block accepted by the primary process; used by read replicas"""
+        state = self.get_state()
+        self.blocks.store_replicated(block, state_update, state)
+        for transaction in transactions:
+            self.transactions.store(transaction.transaction_hash, transaction)
+        self.__latest_state = state.copy()
+        self.__latest_state_version = self.state_version
+
     async def calculate_trace_and_fee(
         self,
         external_tx: InvokeFunction,
@@ -839,57 +1082,52 @@ class StarknetWrapper:
         external_txs: List[InvokeFunction],
         skip_validate: bool,
         block_id: BlockId = DEFAULT_BLOCK_ID,
+        independent: bool = False,
     ):
         """Calculates traces and fees by simulating tx on state copy.
-        Uses the resulting state for each consecutive estimation"""
+        Uses the resulting state for each consecutive estimation, unless `independent`,
+        in which case each tx is simulated on the same state, in parallel if there are many."""
         state = await self.__get_query_state(block_id)
-        cached_state_copy = state.state
-
-        traces = []
-        fee_estimation_infos = []
-        transaction_types = []
-
-        for external_tx in external_txs:
-            # pylint: disable=protected-access
-            cached_state_copy = cached_state_copy._copy()
-            try:
-                internal_tx = InternalInvokeFunctionForSimulate.create_for_simulate(
-                    external_tx,
-                    state.general_config,
-                    skip_validate=skip_validate,
-                )
-            except AssertionError as error:
-                raise StarknetDevnetException(
-                    code=StarkErrorCode.MALFORMED_REQUEST,
-                    status_code=400,
-                    message="Invalid format of fee estimation request",
-                ) from error
-
-            execution_info = await internal_tx.apply_state_updates(
-                cached_state_copy,
-                state.general_config,
-            )
 
-            trace = TransactionTrace(
-                validate_invocation=FunctionInvocation.from_optional_internal(
-                    execution_info.validate_info
-                ),
-                function_invocation=FunctionInvocation.from_optional_internal(
-                    execution_info.call_info
-                ),
-                fee_transfer_invocation=FunctionInvocation.from_optional_internal(
-                    execution_info.fee_transfer_info
-                ),
-                signature=external_tx.signature,
+        # historical queries, even large independent ones, are bound by their own workers
+        if _is_historical(block_id) and historical_workers.enabled:
+            block_hash = await self.__get_query_block_hash(block_id)
+            results = await historical_workers.run(
+                _simulate_txs,
+                _get_state_snapshot(block_hash, state),
+                external_txs,
+                skip_validate,
+                independent,
             )
-            traces.append(trace)
-
-            fee_estimation_info = get_fee_estimation_info(
-                execution_info.actual_fee, state.state.block_info.gas_price
+        elif (
+            independent
+            and len(external_txs) >= MIN_TXS_FOR_PARALLEL_SIMULATION
+            and simulation_workers.enabled
+        ):
+            # the state is pickled once, for all the workers
+            snapshot = Snapshot(state)
+            parts = _split(
+                external_txs, min(simulation_workers.size, len(external_txs))
+            )
+            part_results = await simulation_workers.run_all(
+                _simulate_txs,
+                [(snapshot, part, skip_validate, independent) for part in parts],
+            )
+            results = [result for part in part_results for result in part]
+        else:
+            results = await _simulate_txs(
+                state,
+                external_txs,
+                skip_validate,
+                independent,
+                state_version=self.__get_query_state_version(block_id),
             )
-            fee_estimation_infos.append(fee_estimation_info)
 
-            transaction_types.append(internal_tx.tx_type)
+        traces = [trace for trace, _, _ in results]
+        fee_estimation_infos = [
+            fee_estimation_info for _, fee_estimation_info, _ in results
+        ]
+        transaction_types = [transaction_type for _, _, transaction_type in results]
 
         assert len(traces) == len(fee_estimation_infos) == len(external_txs)
         return traces, fee_estimation_infos, transaction_types
@@ -904,8 +1142,7 @@ class StarknetWrapper:
         )
 
         execution_info = await internal_call.apply_state_updates(
-            # pylint: disable=protected-access
-            state.state._copy(),
+            create_overlay_state(state).state,
             state.general_config,
         )
 
@@ -950,10 +1187,12 @@ class StarknetWrapper:
         else:
             await ChargeableAccount(self).deploy()
 
-    async def is_deployed(self, address: int) -> bool:
+    async def is_deployed(
+        self, address: int, block_id: BlockId = PENDING_BLOCK_ID
+    ) -> bool:
         """Check if the contract is deployed."""
         assert isinstance(address, int)
-        cached_state = self.get_state().state
+        cached_state = (await self.__get_query_state(block_id)).state
         class_hash = await cached_state.get_class_hash_at(address)
         return bool(class_hash)
 
@@ -1008,9 +1247,10 @@ class StarknetWrapper:
 
             # Reject transactions.
             for transaction in last_block.transactions:
-                await self.transactions.reject_transaction(
+                rejected = await self.transactions.reject_transaction(
                     tx_hash=transaction.transaction_hash
                 )
+                subscriptions.publish_transaction(rejected)
 
             aborted_blocks.append(hex(aborted_block_hash))
             parent = await self.blocks.get_by_hash(hex(last_block.parent_block_hash))
@@ -1022,5 +1262,6 @@ class StarknetWrapper:
 
         # Revert state.
         self.starknet.state = self.blocks.get_state(last_block.block_hash)
+        self.state_changed()
 
         return aborted_blocks
@@ -0,0 +1,281 @@
+"""
+Push-based notifications of new blocks, transaction status changes and events.
+"""
+
+import json
+import queue
+import threading
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Iterator, List, Optional, Set
+
+from starkware.starknet.services.api.feeder_gateway.response_objects import (
+    StarknetBlock,
+)
+from starkware.starkware_utils.error_handling import StarkErrorCode
+
+from .constants import (
+    DEFAULT_MAX_SUBSCRIBERS,
+    DEFAULT_SUBSCRIPTION_QUEUE_SIZE,
+    SUBSCRIPTION_HEARTBEAT_INTERVAL,
+)
+from .transactions import DevnetTransaction
+from .util import StarknetDevnetException
+
+
+class Topic(Enum):
+    """Kinds of notifications a subscriber can ask for."""
+
+    BLOCKS = "blocks"
+    TRANSACTIONS = "transactions"
+    EVENTS = "events"
+
+
+class DropPolicy(Enum):
+    """What to do with a notification when the send queue of a subscriber is full."""
+
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+    DISCONNECT = "disconnect"
+
+
+@dataclass
+class SubscriptionFilter:
+    """Per-subscriber filter of notifications"""
+
+    topics: Set[Topic] = field(default_factory=lambda: set(Topic))
+    address: Optional[int] = None
+    keys: List[List[int]] = field(default_factory=list)
+    transaction_hashes: Optional[Set[int]] = None
+
+    def accepts_event(self, from_address: int, keys: List[int]) -> bool:
+        """
+        Same semantics as the filter of `starknet_getEvents`: n-th list in `self.keys`
+        lists the accepted values of the n-th event key; an empty list accepts any value.
+        """
+        if Topic.EVENTS not in self.topics:
+            return False
+
+        if self.address is not None and self.address != from_address:
+            return False
+
+        for event_key, accepted_keys in zip(keys, self.keys):
+            if accepted_keys and event_key not in accepted_keys:
+                return False
+
+        return True
+
+    def accepts_transaction(self, transaction_hash: int) -> bool:
+        """Return `True` if status changes of the transaction should be sent"""
+        if Topic.TRANSACTIONS not in self.topics:
+            return False
+
+        return (
+            self.transaction_hashes is None
+            or transaction_hash in self.transaction_hashes
+        )
+
+
+def _format_message(topic: str, payload: dict) -> str:
+    """Format a Server-Sent Events message"""
+    return f"event: {topic}\ndata: {json.dumps(payload)}\n\n"
+
+
+class Subscription:
+    """A single subscriber with its own bounded send queue"""
+
+    def __init__(
+        self,
+        subscription_filter: SubscriptionFilter,
+        queue_size: int = DEFAULT_SUBSCRIPTION_QUEUE_SIZE,
+        drop_policy: DropPolicy = DropPolicy.DROP_OLDEST,
+    ):
+        self.filter = subscription_filter
+        self.drop_policy = drop_policy
+        self.__queue = queue.Queue(maxsize=queue_size)
+        self.__lock = threading.Lock()
+        self.__dropped = 0
+        self.__overflowed = False
+
+    def offer(self, topic: Topic, payload: dict):
+        """
+        Enqueue a notification without ever blocking the publisher.
+        If the queue is full, the drop policy of the subscription is applied.
+        """
+        with self.__lock:
+            if self.__overflowed:
+                return
+
+            try:
+                self.__queue.put_nowait((topic, payload))
+                return
+            except queue.Full:
+                pass
+
+            if self.drop_policy == DropPolicy.DISCONNECT:
+                self.__overflowed = True
+                return
+
+            self.__dropped += 1
+            if self.drop_policy == DropPolicy.DROP_NEWEST:
+                return
+
+            try:
+                self.__queue.get_nowait()
+                self.__queue.put_nowait((topic, payload))
+            except (queue.Empty, queue.Full):
+                pass
+
+    def __pop_dropped(self) -> int:
+        with self.__lock:
+            dropped = self.__dropped
+            self.__dropped = 0
+            return dropped
+
+    def stream(
+        self, heartbeat_interval: float = SUBSCRIPTION_HEARTBEAT_INTERVAL
+    ) -> Iterator[str]:
+        """
+        Yield Server-Sent Events messages until the subscription overflows.
+        A comment line is sent if idle, so that disconnected clients are detected.
+        """
+        yield _format_message(
+            "subscribed",
+            {"topics": sorted(topic.value for topic in self.filter.topics)},
+        )
+
+        while True:
+            try:
+                topic, payload = self.__queue.get(timeout=heartbeat_interval)
+            except queue.Empty:
+                if self.__overflowed:
+                    break
+                yield ": heartbeat\n\n"
+                continue
+
+            dropped = self.__pop_dropped()
+            if dropped:
+                yield _format_message("dropped", {"count": dropped})
+
+            yield _format_message(topic.value, payload)
+
+            if self.__overflowed and self.__queue.empty():
+                break
+
+        yield _format_message(
+            "disconnected", {"reason": "Send queue of the subscriber overflowed."}
+        )
+
+
+def _block_payload(block: StarknetBlock) -> dict:
+    return {
+        "block_hash": hex(block.block_hash),
+        "block_number": block.block_number,
+        "parent_block_hash": hex(block.parent_block_hash),
+        "timestamp": block.timestamp,
+        "status": block.status.name,
+        "transaction_hashes": [hex(tx.transaction_hash) for tx in block.transactions],
+    }
+
+
+def _transaction_payload(transaction: DevnetTransaction) -> dict:
+    payload = {
+        "transaction_hash": hex(transaction.transaction_hash),
+        "status": transaction.status.name,
+    }
+
+    if transaction.block is not None:
+        payload["block_hash"] = hex(transaction.block.block_hash)
+        payload["block_number"] = transaction.block.block_number
+
+    if transaction.transaction_failure_reason is not None:
+        payload[
+            "tx_failure_reason"
+        ] = transaction.transaction_failure_reason.error_message
+
+    return payload
+
+
+class SubscriptionManager:
+    """
+    Keeps track of subscribers and fans out notifications to them.
+    Publishing never blocks on a subscriber, so slow clients can't stall the chain.
+    """
+
+    def __init__(self, max_subscribers: int = DEFAULT_MAX_SUBSCRIBERS):
+        self.max_subscribers = max_subscribers
+        self.__lock = threading.Lock()
+        self.__subscriptions: Set[Subscription] = set()
+
+    def subscribe(
+        self,
+        subscription_filter: SubscriptionFilter,
+        queue_size: int = DEFAULT_SUBSCRIPTION_QUEUE_SIZE,
+        drop_policy: DropPolicy = DropPolicy.DROP_OLDEST,
+    ) -> Subscription:
+        """Register a new subscriber"""
+        with self.__lock:
+            if len(self.__subscriptions) >= self.max_subscribers:
+                raise StarknetDevnetException(
+                    code=StarkErrorCode.INVALID_REQUEST,
+                    message=f"Maximum number of subscribers ({self.max_subscribers}) reached.",
+                    status_code=503,
+                )
+
+            subscription = Subscription(subscription_filter, queue_size, drop_policy)
+            self.__subscriptions.add(subscription)
+            return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Remove a subscriber; does nothing if already removed"""
+        with self.__lock:
+            self.__subscriptions.discard(subscription)
+
+    def __get_subscriptions(self) -> List[Subscription]:
+        with self.__lock:
+            return list(self.__subscriptions)
+
+    def publish_transaction(self, transaction: DevnetTransaction):
+        """Notify about the current status of `transaction`"""
+        subscriptions = self.__get_subscriptions()
+        if not subscriptions:
+            return
+
+        payload = _transaction_payload(transaction)
+        for subscription in subscriptions:
+            if subscription.filter.accepts_transaction(transaction.transaction_hash):
+                subscription.offer(Topic.TRANSACTIONS, payload)
+
+    def publish_block(self, block: StarknetBlock):
+        """Notify about a newly generated block and the events emitted in it"""
+        subscriptions = self.__get_subscriptions()
+        if not subscriptions:
+            return
+
+        payload = _block_payload(block)
+        for subscription in subscriptions:
+            if Topic.BLOCKS in subscription.filter.topics:
+                subscription.offer(Topic.BLOCKS, payload)
+
+        for receipt in block.transaction_receipts or []:
+            for event in receipt.events:
+                event_payload = None
+                for subscription in subscriptions:
+                    if not subscription.filter.accepts_event(
+                        event.from_address, event.keys
+                    ):
+                        continue
+
+                    if event_payload is None:
+                        event_payload = {
+                            "from_address": hex(event.from_address),
+                            "keys": [hex(key) for key in event.keys],
+                            "data": [hex(value) for value in event.data],
+                            "block_hash": hex(block.block_hash),
+                            "block_number": block.block_number,
+                            "transaction_hash": hex(receipt.transaction_hash),
+                        }
+                    subscription.offer(Topic.EVENTS, event_payload)
+
+
+subscriptions = SubscriptionManager()
@@ -2,7 +2,11 @@
 Classes for storing and handling transactions.
 """
 
-from typing import Dict, List
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
 
 from services.everest.business_logic.transaction_execution_objects import (
     TransactionFailureReason,
@@ -10,6 +14,7 @@ from services.everest.business_logic.transaction_execution_objects import (
 from starkware.python.utils import to_bytes
 from starkware.starknet.business_logic.execution.objects import TransactionExecutionInfo
 from starkware.starknet.business_logic.transaction.objects import (
+    InternalAccountTransaction,
     InternalDeclare,
     InternalDeploy,
     InternalTransaction,
@@ -30,8 +35,90 @@ from starkware.starknet.testing.objects import StarknetCallInfo
 from starkware.starkware_utils.error_handling import StarkErrorCode
 from web3 import Web3
 
+from .constants import MAX_TRANSACTION_WAITERS
 from .origin import Origin
-from .util import StarknetDevnetException
+from .util import StarknetDevnetException, parse_hex_string
+
+FINAL_TX_STATUSES = {
+    TransactionStatus.ACCEPTED_ON_L2,
+    TransactionStatus.ACCEPTED_ON_L1,
+    TransactionStatus.REJECTED,
+}
+
+
+class TransactionWaiter:
+    """Wakes up a coroutine, possibly running in the event loop of another thread"""
+
+    def __init__(self):
+        self.__loop = asyncio.get_running_loop()
+        self.__event = asyncio.Event()
+
+    def wake_up(self):
+        """Thread-safe; may be called after the waiting coroutine is done"""
+        try:
+            self.__loop.call_soon_threadsafe(self.__event.set)
+        except RuntimeError:
+            # loop of the request is already closed
+            pass
+
+    async def wait(self, timeout: float) -> bool:
+        """Wait for `wake_up` at most `timeout` seconds. Returns `False` on timeout."""
+        try:
+            await asyncio.wait_for(self.__event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+
+        self.__event.clear()
+        return True
+
+
+class TransactionWaiters:
+    """
+    Requests waiting for status changes of transactions.
+    Kept outside of the devnet state since waiters can't be dumped.
+    """
+
+    def __init__(self, max_waiters: int = MAX_TRANSACTION_WAITERS):
+        self.max_waiters = max_waiters
+        self.__lock = threading.Lock()
+        self.__count = 0
+        self.__waiters: Dict[int, List[TransactionWaiter]] = {}
+
+    @contextmanager
+    def register(self, tx_hash: int) -> Iterator[TransactionWaiter]:
+        """Register a waiter for `tx_hash`; must be called from a running event loop"""
+        waiter = TransactionWaiter()
+        with self.__lock:
+            if self.__count >= self.max_waiters:
+                raise StarknetDevnetException(
+                    code=StarkErrorCode.INVALID_REQUEST,
+                    message=f"Maximum number of waiting requests ({self.max_waiters}) reached.",
+                    status_code=503,
+                )
+            self.__count += 1
+            self.__waiters.setdefault(tx_hash, []).append(waiter)
+
+        try:
+            yield waiter
+        finally:
+            with self.__lock:
+                self.__count -= 1
+                waiters = self.__waiters.get(tx_hash, [])
+                if waiter in waiters:
+                    waiters.remove(waiter)
+                if not waiters:
+                    self.__waiters.pop(tx_hash, None)
+
+    def notify(self, tx_hash: int):
+        """Wake up the requests waiting for `tx_hash`"""
+        with self.__lock:
+            waiters = list(self.__waiters.get(tx_hash, []))
+
+        for waiter in waiters:
+            waiter.wake_up()
+
+
+transaction_waiters = TransactionWaiters()
 
 
 # pylint: disable=too-many-instance-attributes
@@ -132,9 +219,10 @@ class DevnetTransaction:
             transaction_failure_reason=self.transaction_failure_reason,
         )
 
-    def get_receipt(self) -> TransactionReceipt:
-        """Returns the transaction receipt"""
-        tx_info = self.get_tx_info()
+    def get_receipt(self, tx_info: TransactionInfo = None) -> TransactionReceipt:
+        """Returns the transaction receipt; `tx_info` can be passed if already known"""
+        if tx_info is None:
+            tx_info = self.get_tx_info()
 
         return TransactionReceipt.from_tx_info(
             transaction_hash=self.transaction_hash,
@@ -192,6 +280,11 @@ class DevnetTransactions:
         self.origin = origin
         self.__instances: Dict[int, DevnetTransaction] = {}
 
+        # secondary indexes, maintained in `store`
+        self.__account_transactions: Dict[int, List[int]] = {}
+        self.__sender_nonce_to_hash: Dict[Tuple[int, int], int] = {}
+        self.__class_hash_to_declare: Dict[int, int] = {}
+
     def __get_transaction_by_hash(self, tx_hash: str) -> DevnetTransaction or None:
         """
         Get a transaction by hash.
@@ -207,6 +300,12 @@ class DevnetTransactions:
             message=f"Transaction hash should be a hexadecimal string starting with 0x, or 'null'; got: '{tx_hash}'.",
         )
 
+    def get_local_transaction(self, tx_hash: str) -> DevnetTransaction or None:
+        """
+        Get a transaction stored in devnet, not looking it up in the origin.
+        """
+        return self.__get_transaction_by_hash(tx_hash)
+
     def get_count(self):
         """
         Get the number of transactions.
@@ -217,7 +316,47 @@ class DevnetTransactions:
         """
         Store a transaction.
         """
+        if tx_hash not in self.__instances:
+            self.__index(tx_hash, transaction)
+
         self.__instances[tx_hash] = transaction
+        transaction_waiters.notify(tx_hash)
+
+    def __index(self, tx_hash: int, transaction: DevnetTransaction):
+        internal_tx = transaction.internal_tx
+        if not isinstance(internal_tx, InternalAccountTransaction):
+            return
+
+        sender_address = internal_tx.sender_address
+        self.__account_transactions.setdefault(sender_address, []).append(tx_hash)
+
+        if internal_tx.nonce is not None:
+            self.__set_unique_index(
+                self.__sender_nonce_to_hash,
+                (sender_address, internal_tx.nonce),
+                tx_hash,
+                transaction,
+            )
+
+        if isinstance(internal_tx, InternalDeclare):
+            self.__set_unique_index(
+                self.__class_hash_to_declare,
+                internal_tx.class_hash,
+                tx_hash,
+                transaction,
+            )
+
+    def __set_unique_index(
+        self, index: dict, key, tx_hash: int, transaction: DevnetTransaction
+    ):
+        """A rejected transaction doesn't replace an indexed non-rejected one"""
+        indexed_hash = index.get(key)
+        if (
+            indexed_hash is None
+            or self.__instances[indexed_hash].status == TransactionStatus.REJECTED
+            or transaction.status != TransactionStatus.REJECTED
+        ):
+            index[key] = tx_hash
 
     async def get_transaction(self, tx_hash: str):
         """
@@ -230,6 +369,38 @@ class DevnetTransactions:
 
         return transaction.get_tx_info()
 
+    def get_transactions_by_account(self, address: int) -> List[TransactionInfo]:
+        """
+        Get infos of transactions sent by the account at `address`, in the order of receiving.
+        """
+        return [
+            self.__instances[tx_hash].get_tx_info()
+            for tx_hash in self.__account_transactions.get(address, [])
+        ]
+
+    def get_transaction_by_sender_and_nonce(
+        self, sender_address: int, nonce: int
+    ) -> TransactionInfo:
+        """
+        Get info of the transaction sent by `sender_address` with `nonce`.
+        If there are more, an accepted transaction takes precedence over rejected ones.
+        """
+        tx_hash = self.__sender_nonce_to_hash.get((sender_address, nonce))
+        if tx_hash is None:
+            return TransactionInfo.create(status=TransactionStatus.NOT_RECEIVED)
+
+        return self.__instances[tx_hash].get_tx_info()
+
+    def get_declare_transaction(self, class_hash: int) -> TransactionInfo:
+        """
+        Get info of the transaction which declared `class_hash`.
+        """
+        tx_hash = self.__class_hash_to_declare.get(class_hash)
+        if tx_hash is None:
+            return TransactionInfo.create(status=TransactionStatus.NOT_RECEIVED)
+
+        return self.__instances[tx_hash].get_tx_info()
+
     async def get_transaction_trace(self, tx_hash: str):
         """
         Get a transaction trace.
@@ -286,16 +457,38 @@ class DevnetTransactions:
 
         return status_response
 
-    async def reject_transaction(self, tx_hash: int):
+    async def wait_for_transaction_status(self, tx_hash: str, timeout: float) -> dict:
+        """
+        Wait until the transaction is accepted or rejected, or until `timeout` seconds pass.
+        Returns the last known status, in the format of `get_transaction_status`.
+        """
+        deadline = time.monotonic() + timeout
+        with transaction_waiters.register(parse_hex_string(tx_hash)) as waiter:
+            while True:
+                status_response = await self.get_transaction_status(tx_hash)
+                remaining = deadline - time.monotonic()
+                if (
+                    TransactionStatus[status_response["tx_status"]] in FINAL_TX_STATUSES
+                    or remaining <= 0
+                ):
+                    return status_response
+
+                await waiter.wait(remaining)
+
+    async def reject_transaction(self, tx_hash: int) -> DevnetTransaction:
         """
-        Reject transaction in aborted block.
+        Reject transaction in aborted block. Returns the rejected transaction.
         """
-        self.__instances[tx_hash].status = TransactionStatus.REJECTED
-        self.__instances[tx_hash].block = None
-        self.__instances[tx_hash].transaction_failure_reason = TransactionFailureReason(
+        transaction = self.__instances[tx_hash]
+        transaction.block = None
+        transaction.transaction_failure_reason = TransactionFailureReason(
             code=StarknetErrorCode.TRANSACTION_FAILED.name,
             error_message="Block aborted.",
         )
+        # status last, so that a rejected transaction is never seen with its old block
+        transaction.status = TransactionStatus.REJECTED
+        transaction_waiters.notify(tx_hash)
+        return transaction
 
 
 def create_empty_internal_declare(tx_hash: int, class_hash: int) -> InternalDeclare:
@@ -4,8 +4,12 @@ Utility functions used across the project.
 import logging
 import os
 import sys
+import threading
+import weakref
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Dict, List, Set, Tuple
+from enum import Enum
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple
 
 from starkware.starknet.business_logic.state.state import CachedState
 from starkware.starknet.definitions.error_codes import StarknetErrorCode
@@ -16,6 +20,7 @@ from starkware.starknet.services.api.feeder_gateway.response_objects import (
     StorageEntry,
 )
 from starkware.starknet.testing.contract import StarknetContract
+from starkware.starknet.testing.state import StarknetState
 from starkware.starkware_utils.error_handling import StarkErrorCode, StarkException
 
 
@@ -75,6 +80,19 @@ class StarknetDevnetException(StarkException):
         self.status_code = status_code
 
 
+class OverloadedDevnetException(StarknetDevnetException):
+    """Exception raised when a request is rejected because Devnet is saturated"""
+
+    def __init__(self, status_code: int, message: str, retry_after: int):
+        super().__init__(
+            code=StarkErrorCode.INVALID_REQUEST,
+            status_code=status_code,
+            message=message,
+        )
+        self.retry_after = retry_after
+        """Number of seconds after which the client may retry"""
+
+
 class UndeclaredClassDevnetException(StarknetDevnetException):
     """Exception raised when Devnet has to return an undeclared class"""
 
@@ -263,3 +281,116 @@ class LogSuppressor:
 # FeederGatewayClient is implemented in such a way that it logs and raises;
 # this suppresses the logging
 suppress_feeder_gateway_client_logger = LogSuppressor("services.external_api.client")
+
+
+def create_overlay_state(state: StarknetState) -> StarknetState:
+    """
+    Return a throwaway state reading through to `state`, meant for read-only execution.
+    Writes to it are discarded and nothing is copied upfront, unlike with `state.copy()`,
+    so the cost is proportional to what the execution touches.
+    """
+    # pylint: disable=protected-access
+    return StarknetState(state=state.state._copy(), general_config=state.general_config)
+
+
+class Invalidation(Enum):
+    """What an entry of an `LRUCache` stays valid for, given the source it was computed from"""
+
+    # values derived from their keys alone (e.g. from a class hash) never become invalid
+    NEVER = "never"
+    # values computed from an owner object (e.g. a transaction or a block) are only valid for
+    # that very object, so values of objects replaced on restart, load or block abortion are never served
+    OWNER = "owner"
+    # values computed from a version of the global state are only valid for that very version,
+    # so values computed before any change of the state are never served
+    VERSION = "version"
+
+
+class LRUCache:
+    """
+    Bounded, thread-safe LRU cache. Entries are stored with the source their value was computed
+    from and are only served for a matching source, as selected by `invalidation`.
+    """
+
+    def __init__(self, maxsize: int, invalidation: Invalidation = Invalidation.NEVER):
+        self.maxsize = maxsize
+        self.invalidation = invalidation
+        self.__lock = threading.Lock()
+        self.__entries: Dict[Hashable, Tuple[Any, Any]] = OrderedDict()
+
+    def __is_valid(self, stored_source: Any, source: Any) -> bool:
+        if self.invalidation is Invalidation.OWNER:
+            return stored_source() is source
+        if self.invalidation is Invalidation.VERSION:
+            return stored_source == source
+        return True
+
+    def get(self, key: Hashable, source: Any = None) -> Optional[Any]:
+        """Return the value stored under `key` for `source`, if any"""
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None or not self.__is_valid(entry[0], source):
+                return None
+
+            self.__entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, source: Any = None):
+        """Store `value` computed from `source` under `key`"""
+        if self.invalidation is Invalidation.OWNER:
+            # the owner is not kept alive by the cache
+            source = weakref.ref(source)
+
+        with self.__lock:
+            self.__entries[key] = (source, value)
+            self.__entries.move_to_end(key)
+            if len(self.__entries) > self.maxsize:
+                self.__entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all entries"""
+        with self.__lock:
+            self.__entries.clear()
+
+
+class ReadWriteLock:
+    """
+    A lock allowing either many concurrent readers or a single writer.
+    Writers are preferred: once a writer is waiting, new readers wait too, so a steady
+    stream of reads can't starve writes.
+    """
+
+    def __init__(self):
+        self.__condition = threading.Condition()
+        self.__readers = 0
+        self.__waiting_writers = 0
+        self.__writing = False
+
+    def acquire_read(self):
+        """Block until no writer holds or awaits the lock, then acquire it for reading"""
+        with self.__condition:
+            self.__condition.wait_for(
+                lambda: not self.__writing and not self.__waiting_writers
+            )
+            self.__readers += 1
+
+    def release_read(self):
+        """Release the lock acquired with `acquire_read`"""
+        with self.__condition:
+            self.__readers -= 1
+            if not self.__readers:
+                self.__condition.notify_all()
+
+    def acquire_write(self):
+        """Block until the lock is free, then acquire it exclusively"""
+        with self.__condition:
+            self.__waiting_writers += 1
+            self.__condition.wait_for(lambda: not self.__writing and not self.__readers)
+            self.__waiting_writers -= 1
+            self.__writing = True
+
+    def release_write(self):
+        """Release the lock acquired with `acquire_write`"""
+        with self.__condition:
+            self.__writing = False
+            self.__condition.notify_all()
@@ -0,0 +1,82 @@
+"""
+Tests RPC batch requests
+"""
+
+from __future__ import annotations
+
+from test.rpc.rpc_utils import BackgroundDevnetClient, make_rpc_payload
+from test.shared import PREDEPLOY_ACCOUNT_CLI_ARGS, PREDEPLOYED_ACCOUNT_ADDRESS
+from test.util import devnet_in_background, mint
+
+from starknet_devnet.blueprints.rpc.structures.types import PredefinedRpcErrorCode
+from starknet_devnet.blueprints.rpc.utils import rpc_felt
+from starknet_devnet.general_config import DEFAULT_GENERAL_CONFIG
+
+
+def _rpc_batch(batch: list):
+    return BackgroundDevnetClient.post("/rpc", batch).json()
+
+
+def _batch_entry(method: str, params, message_id: int) -> dict:
+    return {**make_rpc_payload(method, params), "id": message_id}
+
+
+@devnet_in_background(*PREDEPLOY_ACCOUNT_CLI_ARGS)
+def test_batch():
+    """Responses should be returned in the order of calls"""
+    tx_hash = mint(PREDEPLOYED_ACCOUNT_ADDRESS, amount=10)["tx_hash"]
+
+    responses = _rpc_batch(
+        [
+            _batch_entry("starknet_blockNumber", {}, 0),
+            _batch_entry("starknet_chainId", {}, 1),
+            _batch_entry(
+                "starknet_getTransactionByHash",
+                {"transaction_hash": rpc_felt(tx_hash)},
+                2,
+            ),
+        ]
+    )
+
+    assert [response["id"] for response in responses] == [0, 1, 2]
+    assert isinstance(responses[0]["result"], int)
+    assert responses[1]["result"] == hex(DEFAULT_GENERAL_CONFIG.chain_id.value)
+    assert responses[2]["result"]["transaction_hash"] == rpc_felt(tx_hash)
+
+
+@devnet_in_background()
+def test_batch_errors():
+    """Invalid calls shouldn't affect other calls of the batch"""
+    responses = _rpc_batch(
+        [
+            _batch_entry("starknet_unknownMethod", {}, 0),
+            "invalid",
+            _batch_entry("starknet_blockNumber", {}, 2),
+        ]
+    )
+
+    assert (
+        responses[0]["error"]["code"] == PredefinedRpcErrorCode.METHOD_NOT_FOUND.value
+    )
+    assert responses[1]["error"]["code"] == PredefinedRpcErrorCode.INVALID_REQUEST.value
+    assert isinstance(responses[2]["result"], int)
+
+    empty_batch_response = _rpc_batch([])
+    assert (
+        empty_batch_response["error"]["code"]
+        == PredefinedRpcErrorCode.INVALID_REQUEST.value
+    )
+
+
+@devnet_in_background()
+def test_batch_notifications():
+    """Calls without an id should be executed, but not answered"""
+    notification = make_rpc_payload("starknet_blockNumber", {})
+    del notification["id"]
+
+    responses = _rpc_batch([notification, _batch_entry("starknet_chainId", {}, 1)])
+    assert [response["id"] for response in responses] == [1]
+
+    response = BackgroundDevnetClient.post("/rpc", [notification, notification])
+    assert response.status_code == 204
+    assert response.content == b""
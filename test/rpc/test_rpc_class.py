@@ -184,3 +184,26 @@ def test_get_deprecated_class_at(deploy_info):
     assert isinstance(contract_class["program"], str)
     decompress_program(contract_class["program"])
     assert contract_class["abi"] == expected_abi_json
+
+
+@pytest.mark.usefixtures("run_devnet_in_background")
+def test_get_class_and_class_at_consistent(deploy_info, class_hash):
+    """
+    Test repeated class retrieval by hash and by address returning the same class
+    """
+    by_hash = [
+        rpc_call(
+            "starknet_getClass",
+            params={"block_id": "latest", "class_hash": class_hash},
+        )["result"]
+        for _ in range(2)
+    ]
+    by_address = rpc_call(
+        "starknet_getClassAt",
+        params={
+            "block_id": "latest",
+            "contract_address": rpc_felt(deploy_info["address"]),
+        },
+    )["result"]
+
+    assert by_hash[0] == by_hash[1] == by_address
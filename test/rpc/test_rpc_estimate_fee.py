@@ -257,6 +257,45 @@ def test_estimate_multiple_transactions():
     common_estimate_response(response)
 
 
+@pytest.mark.usefixtures("devnet_with_account")
+def test_estimate_independent_transactions():
+    """Estimate fees for multiple transactions, each against the state of the block"""
+    contract_address = deploy_empty_contract()["address"]
+    nonce = get_nonce(PREDEPLOYED_ACCOUNT_ADDRESS)
+
+    # all use the same nonce, so they can only be estimated independently
+    invoke_transactions = []
+    for i in range(10):
+        calls = [(contract_address, "sum_point_array", [1, i, i])]
+        signature, execute_calldata = get_predeployed_acc_execute_args(calls)
+        invoke_transactions.append(
+            RpcBroadcastedInvokeTxnV1(
+                type="INVOKE",
+                max_fee=rpc_felt(0),
+                version=hex(DEPRECATED_RPC_DECLARE_TX_VERSION),
+                signature=[rpc_felt(sig) for sig in signature],
+                nonce=rpc_felt(nonce),
+                sender_address=rpc_felt(PREDEPLOYED_ACCOUNT_ADDRESS),
+                calldata=[rpc_felt(data) for data in execute_calldata],
+            )
+        )
+
+    response = rpc_call_background_devnet(
+        "starknet_estimateFee",
+        {"request": invoke_transactions, "block_id": "latest", "independent": True},
+    )
+    common_estimate_response(response)
+    estimates = response["result"]
+    assert len(estimates) == len(invoke_transactions)
+
+    for invoke_transaction, estimate in zip(invoke_transactions, estimates):
+        single_response = rpc_call_background_devnet(
+            "starknet_estimateFee",
+            {"request": [invoke_transaction], "block_id": "latest"},
+        )
+        assert single_response["result"] == [estimate]
+
+
 @pytest.mark.usefixtures("run_devnet_in_background")
 @pytest.mark.parametrize(
     "run_devnet_in_background",
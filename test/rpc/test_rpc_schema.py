@@ -3,6 +3,7 @@ Test RPC schema validation
 """
 from test.rpc.rpc_utils import rpc_call
 from test.util import devnet_in_background
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -10,6 +11,7 @@ from starkware.starknet.public.abi import get_selector_from_name
 
 from starknet_devnet.blueprints.rpc.schema import (
     _assert_valid_rpc_request,
+    _should_validate_response,
     felt_pattern_from_schema,
 )
 from starknet_devnet.blueprints.rpc.structures.types import PredefinedRpcErrorCode
@@ -345,3 +347,17 @@ def test_felt_pattern_from_schema():
     pattern = felt_pattern_from_schema()
 
     assert pattern != ""
+
+
+def test_response_validation_sampling():
+    """
+    Test that only every n-th response is validated if sampling is configured.
+    """
+    config = SimpleNamespace(
+        validate_rpc_responses=True, rpc_response_validation_sampling=3
+    )
+    validated = [_should_validate_response(config) for _ in range(6)]
+    assert validated.count(True) == 2
+
+    config.validate_rpc_responses = False
+    assert not _should_validate_response(config)
@@ -5,7 +5,7 @@ Tests RPC traces
 from __future__ import annotations
 
 import copy
-from test.account import _get_signature, get_nonce
+from test.account import _get_signature, get_nonce, invoke
 from test.rpc.conftest import prepare_deploy_account_tx, rpc_deploy_account_from_gateway
 from test.rpc.rpc_utils import (
     get_predeployed_acc_execute_args,
@@ -279,3 +279,83 @@ def test_simulate_transaction_deploy_account(deploy_account_details):
     assert response_skip_flag["transaction_trace"][0]["constructor_invocation"][
         "contract_address"
     ] == rpc_felt(deploy_account_contract_address)
+
+
+def _invoke_increase_balance() -> tuple:
+    """Invoke a contract through the predeployed account, return (contract address, tx hash)"""
+    contract_address = deploy_empty_contract()["address"]
+    tx_hash = invoke(
+        calls=[(contract_address, "increase_balance", [10, 20])],
+        account_address=PREDEPLOYED_ACCOUNT_ADDRESS,
+        private_key=PREDEPLOYED_ACCOUNT_PRIVATE_KEY,
+    )
+    return contract_address, tx_hash
+
+
+@devnet_in_background(*PREDEPLOY_ACCOUNT_CLI_ARGS)
+def test_trace_transaction():
+    """Test trace of an invoke transaction and its filtering"""
+    contract_address, tx_hash = _invoke_increase_balance()
+
+    trace = rpc_call_background_devnet(
+        "starknet_traceTransaction", {"transaction_hash": rpc_felt(tx_hash)}
+    )["result"]
+    execute_invocation = trace["execute_invocation"]
+    assert execute_invocation["contract_address"] == rpc_felt(
+        PREDEPLOYED_ACCOUNT_ADDRESS
+    )
+    assert execute_invocation["calls"][0]["contract_address"] == rpc_felt(
+        contract_address
+    )
+    assert "validate_invocation" in trace
+
+    shallow_trace = rpc_call_background_devnet(
+        "starknet_traceTransaction",
+        {"transaction_hash": rpc_felt(tx_hash), "max_depth": 0},
+    )["result"]
+    assert shallow_trace["execute_invocation"]["calls"] == []
+
+    contract_trace = rpc_call_background_devnet(
+        "starknet_traceTransaction",
+        {
+            "transaction_hash": rpc_felt(tx_hash),
+            "contract_address": rpc_felt(contract_address),
+        },
+    )["result"]
+    assert contract_trace["validate_invocation"] is None
+    assert contract_trace["execute_invocation"]["calls"][0]["contract_address"] == (
+        rpc_felt(contract_address)
+    )
+
+
+@devnet_in_background(*PREDEPLOY_ACCOUNT_CLI_ARGS)
+def test_trace_block_transactions():
+    """Test traces of a block match traces of its transactions"""
+    _, tx_hash = _invoke_increase_balance()
+    block_hash = rpc_call_background_devnet(
+        "starknet_getTransactionReceipt", {"transaction_hash": rpc_felt(tx_hash)}
+    )["result"]["block_hash"]
+
+    block_traces = rpc_call_background_devnet(
+        "starknet_traceBlockTransactions", {"block_hash": block_hash}
+    )["result"]
+    assert [trace["transaction_hash"] for trace in block_traces] == [rpc_felt(tx_hash)]
+
+    trace = rpc_call_background_devnet(
+        "starknet_traceTransaction", {"transaction_hash": rpc_felt(tx_hash)}
+    )["result"]
+    assert block_traces[0]["trace_root"] == trace
+
+
+@devnet_in_background()
+def test_trace_unknown():
+    """Test tracing unknown transactions and blocks"""
+    response = rpc_call_background_devnet(
+        "starknet_traceTransaction", {"transaction_hash": rpc_felt(0x123)}
+    )
+    assert response["error"]["code"] == 25  # INVALID_TXN_HASH
+
+    response = rpc_call_background_devnet(
+        "starknet_traceBlockTransactions", {"block_hash": rpc_felt(0x123)}
+    )
+    assert response["error"]["code"] == 24  # INVALID_BLOCK_HASH
@@ -23,13 +23,21 @@ from test.shared import (
     CONTRACT_PATH,
     EXPECTED_UDC_ADDRESS,
     INCORRECT_GENESIS_BLOCK_HASH,
+    PREDEPLOY_ACCOUNT_CLI_ARGS,
     PREDEPLOYED_ACCOUNT_ADDRESS,
     PREDEPLOYED_ACCOUNT_PRIVATE_KEY,
     STARKNET_CLI_ACCOUNT_ABI_PATH,
     SUPPORTED_RPC_TX_VERSION,
 )
 from test.test_declare_v2 import load_cairo1_contract
-from test.util import assert_tx_status, call, load_contract_class, mint, send_tx
+from test.util import (
+    assert_tx_status,
+    call,
+    demand_block_creation,
+    load_contract_class,
+    mint,
+    send_tx,
+)
 from typing import List
 
 import pytest
@@ -365,6 +373,35 @@ def test_get_invoke_transaction_receipt():
     }
 
 
+@pytest.mark.usefixtures("run_devnet_in_background")
+@pytest.mark.parametrize(
+    "run_devnet_in_background",
+    [[*PREDEPLOY_ACCOUNT_CLI_ARGS, "--blocks-on-demand"]],
+    indirect=True,
+)
+def test_get_transaction_receipt_after_status_change():
+    """
+    Receipt of a transaction should reflect its status after the block is created
+    """
+    tx_hash = mint(PREDEPLOYED_ACCOUNT_ADDRESS, amount=10)["tx_hash"]
+
+    def get_receipt():
+        return rpc_call(
+            "starknet_getTransactionReceipt",
+            params={"transaction_hash": rpc_felt(tx_hash)},
+        )["result"]
+
+    pending_receipt = get_receipt()
+    assert pending_receipt["status"] == "PENDING"
+    assert get_receipt() == pending_receipt
+
+    block = demand_block_creation().json()
+    accepted_receipt = get_receipt()
+    assert accepted_receipt["status"] == "ACCEPTED_ON_L2"
+    assert accepted_receipt["block_hash"] == rpc_felt(block["block_hash"])
+    assert accepted_receipt["events"] == pending_receipt["events"]
+
+
 @pytest.mark.usefixtures("run_devnet_in_background", "deploy_info")
 def test_get_transaction_receipt_on_incorrect_hash():
     """
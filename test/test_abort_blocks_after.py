@@ -57,6 +57,13 @@ def test_abort_single_block_single_transaction():
     assert contract_deploy_block["status"] == "ACCEPTED_ON_L2"
     assert_tx_status(contract_deploy_info["tx_hash"], "ACCEPTED_ON_L2")
 
+    # RPC response of the accepted block is cached until the block is aborted
+    rpc_block_id = {"block_hash": rpc_felt(contract_deploy_block["block_hash"])}
+    rpc_accepted_block = rpc_call(
+        "starknet_getBlockWithTxs", params={"block_id": rpc_block_id}
+    )
+    assert rpc_accepted_block["result"]["status"] == "ACCEPTED_ON_L2"
+
     # Blocks should be aborted and transactions should be rejected
     response = abort_blocks(contract_deploy_block["block_hash"])
     assert response.status_code == 200
@@ -74,10 +81,7 @@ def test_abort_single_block_single_transaction():
 
     # Test RPC get block status mapping from ABORTED to REJECTED
     rpc_aborted_block = rpc_call(
-        "starknet_getBlockWithTxs",
-        params={
-            "block_id": {"block_hash": rpc_felt(contract_deploy_block["block_hash"])}
-        },
+        "starknet_getBlockWithTxs", params={"block_id": rpc_block_id}
     )
     assert rpc_aborted_block["result"]["status"] == "REJECTED"
 
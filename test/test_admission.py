@@ -0,0 +1,84 @@
+"""
+Test admission control of requests.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from .settings import APP_URL
+from .shared import PREDEPLOY_ACCOUNT_CLI_ARGS, PREDEPLOYED_ACCOUNT_ADDRESS
+from .util import devnet_in_background
+
+CONCURRENT_MINTS = 20
+
+
+def _mint() -> requests.Response:
+    return requests.post(
+        f"{APP_URL}/mint", json={"address": PREDEPLOYED_ACCOUNT_ADDRESS, "amount": 10}
+    )
+
+
+def _get_admission_metrics() -> dict:
+    response = requests.get(f"{APP_URL}/admission_metrics")
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.admission
+@devnet_in_background(*PREDEPLOY_ACCOUNT_CLI_ARGS)
+def test_unlimited_by_default():
+    """All requests should be admitted and reported in metrics"""
+    with ThreadPoolExecutor(max_workers=CONCURRENT_MINTS) as executor:
+        responses = list(executor.map(lambda _: _mint(), range(CONCURRENT_MINTS)))
+    assert all(response.status_code == 200 for response in responses)
+
+    metrics = _get_admission_metrics()
+    assert metrics["write_queue"]["depth"] == 0
+    assert metrics["write_queue"]["limit"] == 0
+    execute_metrics = metrics["classes"]["execute"]
+    assert execute_metrics["in_flight"] == 0
+    assert execute_metrics["admitted"] >= CONCURRENT_MINTS
+    assert execute_metrics["rejected"] == 0
+
+
+@pytest.mark.admission
+@devnet_in_background(*PREDEPLOY_ACCOUNT_CLI_ARGS, "--max-queued-writes", "1")
+def test_full_write_queue():
+    """Writes over the bounded queue should be rejected fast with Retry-After"""
+    with ThreadPoolExecutor(max_workers=CONCURRENT_MINTS) as executor:
+        responses = list(executor.map(lambda _: _mint(), range(CONCURRENT_MINTS)))
+
+    rejected = [response for response in responses if response.status_code == 503]
+    assert rejected
+    assert all(response.status_code in (200, 503) for response in responses)
+    for response in rejected:
+        assert int(response.headers["Retry-After"]) >= 1
+        assert "Write queue is full" in response.json()["message"]
+
+    metrics = _get_admission_metrics()
+    assert metrics["write_queue"]["limit"] == 1
+    assert metrics["write_queue"]["max_depth"] == 1
+    assert metrics["classes"]["execute"]["rejected"] == len(rejected)
+
+
+@pytest.mark.admission
+@devnet_in_background(*PREDEPLOY_ACCOUNT_CLI_ARGS, "--max-concurrent-reads", "1")
+def test_read_limit():
+    """Reads over the limit of their class should be rejected with 429"""
+
+    def get_block(_):
+        return requests.get(f"{APP_URL}/feeder_gateway/get_block")
+
+    with ThreadPoolExecutor(max_workers=CONCURRENT_MINTS) as executor:
+        responses = list(executor.map(get_block, range(CONCURRENT_MINTS * 5)))
+
+    assert all(response.status_code in (200, 429) for response in responses)
+    for response in responses:
+        if response.status_code == 429:
+            assert int(response.headers["Retry-After"]) >= 1
+
+    metrics = _get_admission_metrics()["classes"]["read"]
+    assert metrics["limit"] == 1
+    assert metrics["admitted"] + metrics["rejected"] == CONCURRENT_MINTS * 5
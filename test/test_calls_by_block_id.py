@@ -221,6 +221,39 @@ def test_old_block_generated_on_demand():
     )
 
 
+@devnet_in_background(*PREDEPLOY_ACCOUNT_CLI_ARGS, "--blocks-on-demand")
+def test_repeated_calls_reflect_state_changes():
+    """Repeated calls should return the same results until the state changes"""
+
+    initial_balance = 10
+    deploy_info = declare_and_deploy_with_chargeable(
+        contract=CONTRACT_PATH, inputs=[str(initial_balance)]
+    )
+    contract_address = deploy_info["address"]
+    demand_block_creation()
+
+    increment_value = 5
+    for _ in range(2):
+        assert _get_value(contract_address, block_number="pending") == initial_balance
+        assert _get_value(contract_address, block_number="latest") == initial_balance
+        assert _get_value(contract_address, block_number="1") == initial_balance
+
+    _increment(contract_address, increment_value)
+    for _ in range(2):
+        assert (
+            _get_value(contract_address, block_number="pending")
+            == initial_balance + increment_value
+        )
+        assert _get_value(contract_address, block_number="latest") == initial_balance
+
+    demand_block_creation()
+    assert (
+        _get_value(contract_address, block_number="latest")
+        == initial_balance + increment_value
+    )
+    assert _get_value(contract_address, block_number="1") == initial_balance
+
+
 @devnet_in_background(*PREDEPLOY_ACCOUNT_CLI_ARGS)
 def test_getting_storage_at_old_block():
     """Call get_storage_at on old block"""
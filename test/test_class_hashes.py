@@ -0,0 +1,39 @@
+"""
+Test memoization of class hashes.
+"""
+
+from starkware.starknet.core.os.contract_class.compiled_class_hash import (
+    compute_compiled_class_hash,
+)
+from starkware.starknet.services.api.contract_class.contract_class import CompiledClass
+
+from starknet_devnet.class_hashes import memoized_class_hash
+
+from .shared import CONTRACT_1_CASM_PATH
+
+
+def _load_compiled_class() -> CompiledClass:
+    with open(CONTRACT_1_CASM_PATH, encoding="utf-8") as casm_file:
+        return CompiledClass.loads(casm_file.read())
+
+
+def test_class_hash_memoized_by_content():
+    """Hashes should be reused for classes of the same content, even if loaded separately"""
+    computations = []
+
+    def compute():
+        computations.append(None)
+        return 42
+
+    assert memoized_class_hash("test", _load_compiled_class(), compute) == 42
+    assert memoized_class_hash("test", _load_compiled_class(), compute) == 42
+    assert len(computations) == 1
+
+    # hashes of a different kind are computed separately
+    assert memoized_class_hash("other", _load_compiled_class(), lambda: 43) == 43
+
+
+def test_memoized_compiled_class_hash():
+    """Memoized computation should return the same hash as the first computation"""
+    compiled_class_hash = compute_compiled_class_hash(_load_compiled_class())
+    assert compute_compiled_class_hash(_load_compiled_class()) == compiled_class_hash
@@ -1,7 +1,10 @@
 """Test cairo recompilers"""
 
+import asyncio
 import os
 import subprocess
+import tempfile
+import time
 from typing import List
 
 import pytest
@@ -10,12 +13,16 @@ from starkware.starknet.services.api.contract_class.contract_class_utils import
     load_sierra,
 )
 
+from starknet_devnet.compilation_cache import CompilationCache
 from starknet_devnet.compiler import (
     BinaryContractClassCompiler,
+    CachingContractClassCompiler,
     ContractClassCompiler,
     DefaultContractClassCompiler,
     ManifestContractClassCompiler,
 )
+from starknet_devnet.compiler_pool import CompilerPool
+from starknet_devnet.util import StarknetDevnetException
 
 from .account import send_declare_v2
 from .shared import (
@@ -41,6 +48,8 @@ SIERRA_COMPILER_PATH = os.path.join(
     CAIRO_1_COMPILER_REPO, "target", "debug", "starknet-sierra-compile"
 )
 
+COMPILATION_CACHE_DIR = tempfile.mkdtemp()
+
 ACTIVE_DEVNET = DevnetBackgroundProc()
 
 
@@ -176,3 +185,172 @@ def test_manifest_and_sierra_compiler_specified():
         "Only one of {--cairo-compiler-manifest,--sierra-compiler-path} can be provided"
         in read_stream(execution.stderr)
     )
+
+
+class CountingCompiler(DefaultContractClassCompiler):
+    """Default compiler counting its compilations"""
+
+    def __init__(self):
+        self.compilations = 0
+
+    def compile_contract_class(self, contract_class, timeout=None):
+        self.compilations += 1
+        return super().compile_contract_class(contract_class, timeout)
+
+
+def test_compilation_cache(tmp_path):
+    """Compilations should be reused by compilers of the same identity"""
+    contract_class = load_sierra(CONTRACT_1_PATH)
+    with open(CONTRACT_1_CASM_PATH, encoding="utf-8") as casm_file:
+        expected_compiled = CompiledClass.loads(casm_file.read())
+
+    first_compiler = CountingCompiler()
+    cache = CompilationCache(str(tmp_path), max_size=2**20)
+    compiled = CachingContractClassCompiler(
+        first_compiler, cache
+    ).compile_contract_class(contract_class)
+    assert compiled == expected_compiled
+    assert first_compiler.compilations == 1
+
+    # e.g. after a restart or in another instance
+    second_compiler = CountingCompiler()
+    cache = CompilationCache(str(tmp_path), max_size=2**20)
+    compiled = CachingContractClassCompiler(
+        second_compiler, cache
+    ).compile_contract_class(contract_class)
+    assert compiled == expected_compiled
+    assert second_compiler.compilations == 0
+
+
+def test_compilation_cache_eviction(tmp_path):
+    """The least recently used compilations should be removed once over the size limit"""
+    with open(CONTRACT_1_CASM_PATH, encoding="utf-8") as casm_file:
+        compiled_class = CompiledClass.loads(casm_file.read())
+    entry_size = len(compiled_class.dumps())
+
+    cache = CompilationCache(str(tmp_path), max_size=entry_size * 2)
+    cache.set("first", compiled_class)
+    cache.set("second", compiled_class)
+    os.utime(tmp_path / "first.casm.json", (0, 0))
+    os.utime(tmp_path / "second.casm.json", (1, 1))
+
+    # using "first" makes "second" the least recently used
+    assert cache.get("first") == compiled_class
+    cache.set("third", compiled_class)
+
+    assert cache.get("second") is None
+    assert cache.get("first") == compiled_class
+    assert cache.get("third") == compiled_class
+
+
+def test_corrupted_compilation_cache_entry(tmp_path):
+    """A corrupted entry should be treated as missing"""
+    cache = CompilationCache(str(tmp_path), max_size=2**20)
+    (tmp_path / "corrupted.casm.json").write_text("{", encoding="utf-8")
+
+    assert cache.get("corrupted") is None
+    assert not (tmp_path / "corrupted.casm.json").exists()
+
+
+def test_leftover_compilation_cache_files(tmp_path):
+    """Temporary files of failed and crashed writes shouldn't be left behind"""
+    with open(CONTRACT_1_CASM_PATH, encoding="utf-8") as casm_file:
+        compiled_class = CompiledClass.loads(casm_file.read())
+
+    class UnserializableClass:
+        """Compiled class failing to serialize"""
+
+        def dumps(self):
+            raise ValueError("Unserializable")
+
+    cache = CompilationCache(str(tmp_path), max_size=2**20)
+    with pytest.raises(ValueError):
+        cache.set("failed", UnserializableClass())
+    assert list(tmp_path.iterdir()) == []
+
+    # e.g. left by a crashed instance
+    (tmp_path / "crashed.tmp").write_text("{", encoding="utf-8")
+    os.utime(tmp_path / "crashed.tmp", (0, 0))
+    cache.set("stored", compiled_class)
+    assert [path.name for path in tmp_path.iterdir()] == ["stored.casm.json"]
+
+
+class KeyCountingCompiler(CachingContractClassCompiler):
+    """Caching compiler counting the computations of compilation keys"""
+
+    def __init__(self, compiler, cache):
+        super().__init__(compiler, cache)
+        self.key_computations = 0
+
+    def get_compilation_key(self, contract_class):
+        self.key_computations += 1
+        return super().get_compilation_key(contract_class)
+
+
+def test_compiler_pool_computes_key_once(tmp_path):
+    """The key computed by the pool should be reused by the caching compiler"""
+    compiler = KeyCountingCompiler(
+        CountingCompiler(), CompilationCache(str(tmp_path), max_size=2**20)
+    )
+    CompilerPool().submit(compiler, load_sierra(CONTRACT_1_PATH)).result()
+
+    assert compiler.key_computations == 1
+    assert compiler.compiler.compilations == 1
+
+
+def test_compiler_pool_compiles_class_once():
+    """Submissions of the same class should share a single compilation"""
+    contract_class = load_sierra(CONTRACT_1_PATH)
+    with open(CONTRACT_1_CASM_PATH, encoding="utf-8") as casm_file:
+        expected_compiled = CompiledClass.loads(casm_file.read())
+
+    compiler = CountingCompiler()
+    pool = CompilerPool()
+    futures = [pool.submit(compiler, contract_class) for _ in range(3)]
+    assert [future.result() for future in futures] == [expected_compiled] * 3
+
+    assert asyncio.run(pool.compile(compiler, contract_class)) == expected_compiled
+    assert compiler.compilations == 1
+
+
+class SlowCompiler(DefaultContractClassCompiler):
+    """Default compiler taking at least a second"""
+
+    def compile_contract_class(self, contract_class, timeout=None):
+        time.sleep(1)
+        return super().compile_contract_class(contract_class, timeout)
+
+
+def test_compiler_pool_timeout():
+    """Waiting for a compilation should fail after the timeout"""
+    pool = CompilerPool()
+    pool.configure(size=1, timeout=0.1)
+
+    with pytest.raises(StarknetDevnetException) as error:
+        asyncio.run(pool.compile(SlowCompiler(), load_sierra(CONTRACT_1_PATH)))
+    assert "Compilation timed out" in error.value.message
+
+
+@pytest.mark.usefixtures("run_devnet_in_background")
+@pytest.mark.parametrize(
+    "run_devnet_in_background",
+    [(*PREDEPLOY_ACCOUNT_CLI_ARGS, "--compilation-cache-dir", COMPILATION_CACHE_DIR)],
+    indirect=True,
+)
+def test_declaring_with_compilation_cache():
+    """Declared classes should be stored in the compilation cache"""
+    contract_class, _, compiled_class_hash = load_cairo1_contract()
+    resp = send_declare_v2(
+        contract_class=contract_class,
+        compiled_class_hash=compiled_class_hash,
+        sender_address=PREDEPLOYED_ACCOUNT_ADDRESS,
+        sender_key=PREDEPLOYED_ACCOUNT_PRIVATE_KEY,
+    )
+    assert_declare_v2_accepted(resp)
+
+    cached_files = [
+        name
+        for name in os.listdir(COMPILATION_CACHE_DIR)
+        if name.endswith(".casm.json")
+    ]
+    assert len(cached_files) == 1
@@ -0,0 +1,117 @@
+"""
+Test response compression and conditional requests.
+"""
+
+import pytest
+import requests
+
+from starknet_devnet.contract_class_wrapper import DEFAULT_ACCOUNT_HASH
+
+from .settings import APP_URL
+from .shared import PREDEPLOY_ACCOUNT_CLI_ARGS
+from .util import assert_undeclared_class, create_empty_block, devnet_in_background
+
+CLASS_URL = f"{APP_URL}/feeder_gateway/get_class_by_hash"
+CLASS_PARAMS = {"classHash": hex(DEFAULT_ACCOUNT_HASH)}
+
+
+@pytest.mark.compression
+@devnet_in_background(*PREDEPLOY_ACCOUNT_CLI_ARGS, "--compression-threshold", "1024")
+def test_gzip_compression():
+    """Large response should be compressed if the client accepts it"""
+    response = requests.get(
+        CLASS_URL, CLASS_PARAMS, headers={"Accept-Encoding": "gzip"}
+    )
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert "program" in response.json()
+
+    uncompressed = requests.get(
+        CLASS_URL, CLASS_PARAMS, headers={"Accept-Encoding": "identity"}
+    )
+    assert "Content-Encoding" not in uncompressed.headers
+    assert uncompressed.json() == response.json()
+
+
+@pytest.mark.compression
+@devnet_in_background(
+    *PREDEPLOY_ACCOUNT_CLI_ARGS, "--compression-threshold", str(10**9)
+)
+def test_compression_threshold():
+    """Response smaller than the threshold shouldn't be compressed"""
+    response = requests.get(
+        CLASS_URL, CLASS_PARAMS, headers={"Accept-Encoding": "gzip"}
+    )
+    assert response.status_code == 200
+    assert "Content-Encoding" not in response.headers
+
+
+@pytest.mark.compression
+@devnet_in_background(*PREDEPLOY_ACCOUNT_CLI_ARGS)
+def test_compression_disabled_by_default():
+    """Response shouldn't be compressed without a threshold"""
+    response = requests.get(
+        CLASS_URL, CLASS_PARAMS, headers={"Accept-Encoding": "gzip"}
+    )
+    assert response.status_code == 200
+    assert "Content-Encoding" not in response.headers
+
+
+@pytest.mark.compression
+@devnet_in_background(*PREDEPLOY_ACCOUNT_CLI_ARGS)
+def test_class_not_modified():
+    """Class fetched again with its entity tag shouldn't be resent"""
+    response = requests.get(CLASS_URL, CLASS_PARAMS)
+    etag = response.headers["ETag"]
+
+    not_modified = requests.get(
+        CLASS_URL, CLASS_PARAMS, headers={"If-None-Match": etag}
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+    modified = requests.get(
+        CLASS_URL, CLASS_PARAMS, headers={"If-None-Match": 'W/"other"'}
+    )
+    assert modified.status_code == 200
+    assert modified.headers["ETag"] == etag
+
+
+@pytest.mark.compression
+@devnet_in_background(*PREDEPLOY_ACCOUNT_CLI_ARGS)
+def test_unknown_class_with_entity_tag():
+    """Class unknown to devnet should be reported even if the client sends its entity tag"""
+    unknown_class_params = {"classHash": "0x123"}
+    response = requests.get(
+        CLASS_URL, unknown_class_params, headers={"If-None-Match": 'W/"class-0x123"'}
+    )
+    assert_undeclared_class(response)
+
+    # a cairo 0 class has no compiled class
+    etag = requests.get(CLASS_URL, CLASS_PARAMS).headers["ETag"]
+    response = requests.get(
+        f"{APP_URL}/feeder_gateway/get_compiled_class_by_class_hash",
+        CLASS_PARAMS,
+        headers={"If-None-Match": etag},
+    )
+    assert_undeclared_class(response)
+
+
+@pytest.mark.compression
+@devnet_in_background()
+def test_block_not_modified():
+    """Accepted block fetched again with its entity tag shouldn't be resent"""
+    block_hash = create_empty_block()["block_hash"]
+    block_url = f"{APP_URL}/feeder_gateway/get_block"
+
+    response = requests.get(block_url, {"blockHash": block_hash})
+    etag = response.headers["ETag"]
+
+    not_modified = requests.get(
+        block_url, {"blockHash": block_hash}, headers={"If-None-Match": etag}
+    )
+    assert not_modified.status_code == 304
+
+    pending = requests.get(block_url, {"blockNumber": "pending"})
+    assert pending.status_code == 200
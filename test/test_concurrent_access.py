@@ -0,0 +1,49 @@
+"""
+Test concurrent access to the global state by reading and writing requests.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from .rpc.rpc_utils import rpc_call
+from .settings import APP_URL
+from .shared import PREDEPLOY_ACCOUNT_CLI_ARGS, PREDEPLOYED_ACCOUNT_ADDRESS
+from .test_account import get_account_balance
+from .util import devnet_in_background, get_block, mint
+
+MINTS = 5
+READS_PER_MINT = 4
+MINT_AMOUNT = 10
+
+
+def _read():
+    rpc_block = rpc_call("starknet_getBlockWithTxHashes", {"block_id": "latest"})
+    feeder_block = requests.get(f"{APP_URL}/feeder_gateway/get_block").json()
+    return rpc_block["result"]["block_number"], feeder_block["block_number"]
+
+
+@pytest.mark.concurrent_access
+@devnet_in_background(*PREDEPLOY_ACCOUNT_CLI_ARGS)
+def test_concurrent_reads_and_writes():
+    """Reads served concurrently with each other should not interfere with writes"""
+    initial_balance = get_account_balance(PREDEPLOYED_ACCOUNT_ADDRESS)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        writes = [
+            executor.submit(mint, PREDEPLOYED_ACCOUNT_ADDRESS, MINT_AMOUNT)
+            for _ in range(MINTS)
+        ]
+        reads = [executor.submit(_read) for _ in range(MINTS * READS_PER_MINT)]
+
+        for write in writes:
+            assert write.result()["tx_hash"]
+
+        for read in reads:
+            for block_number in read.result():
+                assert 0 <= block_number <= MINTS
+
+    final_balance = get_account_balance(PREDEPLOYED_ACCOUNT_ADDRESS)
+    assert final_balance == initial_balance + MINTS * MINT_AMOUNT
+    assert get_block(parse=True)["block_number"] == MINTS
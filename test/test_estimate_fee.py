@@ -1,18 +1,27 @@
 """Fee estimation tests"""
 
+import asyncio
 import json
 import typing
 
 import pytest
 import requests
+from starkware.starknet.business_logic.transaction.objects import InternalInvokeFunction
 from starkware.starknet.definitions.error_codes import StarknetErrorCode
 from starkware.starknet.public.abi import get_selector_from_name
 from starkware.starknet.services.api.feeder_gateway.response_objects import (
     FeeEstimationInfo,
 )
 from starkware.starknet.services.api.gateway.transaction import AccountTransaction
+from starkware.starkware_utils.error_handling import StarkErrorCode
 
+from starknet_devnet.account_util import get_execute_args
 from starknet_devnet.constants import DEFAULT_GAS_PRICE
+from starknet_devnet.devnet_config import DevnetConfig, parse_args
+from starknet_devnet.fee_token import FeeToken
+from starknet_devnet.server import app
+from starknet_devnet.starknet_wrapper import StarknetWrapper
+from starknet_devnet.state import state
 
 from .account import (
     declare_and_deploy_with_chargeable,
@@ -24,13 +33,22 @@ from .shared import (
     ABI_PATH,
     CONTRACT_PATH,
     EXPECTED_CLASS_HASH,
+    GENESIS_BLOCK_NUMBER,
     L1L2_ABI_PATH,
     L1L2_CONTRACT_PATH,
     PREDEPLOY_ACCOUNT_CLI_ARGS,
     PREDEPLOYED_ACCOUNT_ADDRESS,
     PREDEPLOYED_ACCOUNT_PRIVATE_KEY,
+    SUPPORTED_TX_VERSION,
+)
+from .test_block_number import BLOCK_NUMBER_ABI_PATH, BLOCK_NUMBER_CONTRACT_PATH
+from .util import (
+    call,
+    devnet_in_background,
+    estimate_message_fee,
+    get_transaction_receipt,
+    load_file_content,
 )
-from .util import call, devnet_in_background, estimate_message_fee, load_file_content
 
 DEPRECATED_DEPLOY_CONTENT = load_file_content("deprecated_deploy.json")
 INVOKE_CONTENT = load_file_content("invoke.json")
@@ -302,3 +320,168 @@ def test_estimate_fee_bulk():
         function="get_balance", address=deploy_info["address"], abi_path=ABI_PATH
     )
     assert balance_after == initial_balance
+
+
+@devnet_in_background(*PREDEPLOY_ACCOUNT_CLI_ARGS)
+def test_estimate_fee_bulk_independent():
+    """Test estimating fee in a bulk of transactions which are independent of each other"""
+    deploy_info = declare_and_deploy_with_chargeable(
+        contract=CONTRACT_PATH, inputs=["10"], salt="0x42"
+    )
+    contract_address = deploy_info["address"]
+
+    # enough to be simulated in parallel; all use the same nonce, so they can't be chained
+    tx_dicts = [
+        get_estimate_fee_request_dict(
+            calls=[(contract_address, "increase_balance", [i, i])],
+            account_address=PREDEPLOYED_ACCOUNT_ADDRESS,
+            private_key=PREDEPLOYED_ACCOUNT_PRIVATE_KEY,
+            nonce=0,
+        )
+        for i in range(10)
+    ]
+    txs = AccountTransaction.Schema().load(tx_dicts, many=True)
+
+    resp = requests.post(
+        f"{APP_URL}/feeder_gateway/estimate_fee_bulk?independent=true",
+        json=AccountTransaction.Schema().dump(txs, many=True),
+    )
+    assert resp.status_code == 200, resp.json()
+    fee_estimation_infos = FeeEstimationInfo.Schema().load(resp.json(), many=True)
+    assert len(fee_estimation_infos) == len(tx_dicts)
+
+    # each estimation is the same as if the transaction was estimated alone, in order
+    for tx_dict, fee_estimation_info in zip(tx_dicts, fee_estimation_infos):
+        single_resp = estimate_fee_local(tx_dict)
+        assert single_resp.status_code == 200, single_resp.json()
+        assert fee_estimation_info == FeeEstimationInfo.load(single_resp.json())
+
+    # the state is unchanged
+    assert get_nonce(account_address=PREDEPLOYED_ACCOUNT_ADDRESS) == 0
+
+
+@devnet_in_background()
+def test_estimate_fee_bulk_invalid_independent_value():
+    """Test estimating fee in a bulk with an invalid value of independent"""
+    resp = requests.post(
+        f"{APP_URL}/feeder_gateway/estimate_fee_bulk?independent=yes", json=[]
+    )
+    assert resp.json()["code"] == str(StarkErrorCode.MALFORMED_REQUEST)
+    assert "Invalid value for independent" in resp.json()["message"]
+
+
+def _signed_invoke_dict(calls: list, nonce: int) -> dict:
+    """Return the gateway request of an invoke by the predeployed account"""
+    max_fee = 10**18
+    signature, execute_calldata = get_execute_args(
+        calls=calls,
+        account_address=PREDEPLOYED_ACCOUNT_ADDRESS,
+        private_key=PREDEPLOYED_ACCOUNT_PRIVATE_KEY,
+        nonce=nonce,
+        version=SUPPORTED_TX_VERSION,
+        max_fee=max_fee,
+    )
+    return {
+        "sender_address": PREDEPLOYED_ACCOUNT_ADDRESS,
+        "max_fee": hex(max_fee),
+        "calldata": [str(element) for element in execute_calldata],
+        "version": hex(SUPPORTED_TX_VERSION),
+        "nonce": hex(nonce),
+        "signature": signature,
+        "type": "INVOKE_FUNCTION",
+    }
+
+
+@devnet_in_background(*PREDEPLOY_ACCOUNT_CLI_ARGS)
+def test_estimate_fee_and_send_same_transaction():
+    """Sending the transaction whose fee was estimated should charge the estimated fee"""
+    deploy_info = declare_and_deploy_with_chargeable(
+        contract=CONTRACT_PATH, inputs=["10"], salt="0x42"
+    )
+    contract_address = deploy_info["address"]
+
+    tx_dict = _signed_invoke_dict(
+        calls=[(contract_address, "increase_balance", [10, 20])], nonce=0
+    )
+
+    estimate_resp = estimate_fee_local(tx_dict)
+    assert estimate_resp.status_code == 200, estimate_resp.json()
+    estimated_fee = estimate_resp.json()["overall_fee"]
+
+    invoke_resp = requests.post(f"{APP_URL}/gateway/add_transaction", json=tx_dict)
+    assert invoke_resp.status_code == 200, invoke_resp.json()
+
+    receipt = get_transaction_receipt(invoke_resp.json()["transaction_hash"])
+    assert receipt["status"] == "ACCEPTED_ON_L2"
+    assert int(receipt["actual_fee"], 16) == estimated_fee
+    assert get_nonce(account_address=PREDEPLOYED_ACCOUNT_ADDRESS) == 1
+
+    balance_after = call(
+        function="get_balance", address=contract_address, abi_path=ABI_PATH
+    )
+    assert balance_after == "40"
+
+
+@devnet_in_background(*PREDEPLOY_ACCOUNT_CLI_ARGS)
+def test_estimate_fee_and_send_block_dependent_transaction():
+    """A sent transaction reading the block number should see the block it's executed in"""
+    contract_address = declare_and_deploy_with_chargeable(BLOCK_NUMBER_CONTRACT_PATH)[
+        "address"
+    ]
+    tx_dict = _signed_invoke_dict(
+        calls=[(contract_address, "write_block_number", [])], nonce=0
+    )
+
+    estimate_resp = estimate_fee_local(tx_dict)
+    assert estimate_resp.status_code == 200, estimate_resp.json()
+    invoke_resp = requests.post(f"{APP_URL}/gateway/add_transaction", json=tx_dict)
+    assert invoke_resp.status_code == 200, invoke_resp.json()
+
+    written_block_number = call(
+        function="read_block_number",
+        address=contract_address,
+        abi_path=BLOCK_NUMBER_ABI_PATH,
+    )
+    # genesis + declare + deploy + invoke; the estimation saw the block of the deployment
+    assert int(written_block_number) == GENESIS_BLOCK_NUMBER + 3
+
+
+def test_estimated_execution_reused(monkeypatch):
+    """Sending the transaction whose fee was estimated shouldn't execute it again"""
+    starknet_wrapper = StarknetWrapper(
+        DevnetConfig(parse_args(list(PREDEPLOY_ACCOUNT_CLI_ARGS)))
+    )
+    asyncio.run(starknet_wrapper.initialize())
+    monkeypatch.setattr(state, "starknet_wrapper", starknet_wrapper)
+
+    executed_nonces = []
+    apply_concurrent_changes = InternalInvokeFunction.apply_concurrent_changes
+
+    def counting_apply_concurrent_changes(self, *args, **kwargs):
+        executed_nonces.append(self.nonce)
+        return apply_concurrent_changes(self, *args, **kwargs)
+
+    monkeypatch.setattr(
+        InternalInvokeFunction,
+        "apply_concurrent_changes",
+        counting_apply_concurrent_changes,
+    )
+
+    client = app.test_client()
+    calls = [(hex(FeeToken.ADDRESS), "transfer", [1, 1, 0])]
+
+    estimated_tx = _signed_invoke_dict(calls, nonce=0)
+    assert (
+        client.post("/feeder_gateway/estimate_fee", json=estimated_tx).status_code
+        == 200
+    )
+    assert client.post("/gateway/add_transaction", json=estimated_tx).status_code == 200
+    # only by the estimation
+    assert executed_nonces == [0]
+
+    not_estimated_tx = _signed_invoke_dict(calls, nonce=1)
+    assert (
+        client.post("/gateway/add_transaction", json=not_estimated_tx).status_code
+        == 200
+    )
+    assert executed_nonces == [0, 1]
@@ -0,0 +1,152 @@
+"""
+Test executing historical queries in worker processes.
+"""
+
+import pytest
+import requests
+from starkware.starknet.public.abi import get_selector_from_name
+
+from starknet_devnet.blueprints.rpc.utils import rpc_felt
+from starknet_devnet.constants import (
+    DEPRECATED_RPC_DECLARE_TX_VERSION,
+    MIN_TXS_FOR_PARALLEL_SIMULATION,
+)
+
+from .rpc.rpc_utils import get_predeployed_acc_execute_args
+from .settings import APP_URL
+from .shared import (
+    EXPECTED_FEE_TOKEN_ADDRESS,
+    PREDEPLOY_ACCOUNT_CLI_ARGS,
+    PREDEPLOYED_ACCOUNT_ADDRESS,
+)
+from .util import devnet_in_background, mint
+
+HISTORICAL_WORKERS_ARGS = (*PREDEPLOY_ACCOUNT_CLI_ARGS, "--historical-workers", "2")
+
+BALANCE_OF_CALL = {
+    "contract_address": EXPECTED_FEE_TOKEN_ADDRESS,
+    "entry_point_selector": rpc_felt(get_selector_from_name("balanceOf")),
+    "calldata": [PREDEPLOYED_ACCOUNT_ADDRESS],
+}
+
+
+def _rpc_call(method: str, params) -> dict:
+    response = requests.post(
+        f"{APP_URL}/rpc",
+        json={"jsonrpc": "2.0", "id": 0, "method": method, "params": params},
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert "result" in body, body
+    return body["result"]
+
+
+def _balance_at(block_id) -> int:
+    low, high = _rpc_call(
+        "starknet_call", {"request": BALANCE_OF_CALL, "block_id": block_id}
+    )
+    return int(low, 16) + (int(high, 16) << 128)
+
+
+def _feeder_balance_at(block_number: int) -> int:
+    response = requests.post(
+        f"{APP_URL}/feeder_gateway/call_contract?blockNumber={block_number}",
+        json={
+            "contract_address": EXPECTED_FEE_TOKEN_ADDRESS,
+            "entry_point_selector": hex(get_selector_from_name("balanceOf")),
+            "calldata": [str(int(PREDEPLOYED_ACCOUNT_ADDRESS, 16))],
+            "signature": [],
+        },
+    )
+    assert response.status_code == 200, response.json()
+    low, high = response.json()["result"]
+    return int(low, 16) + (int(high, 16) << 128)
+
+
+@pytest.mark.historical_workers
+@devnet_in_background(*HISTORICAL_WORKERS_ARGS)
+def test_historical_call():
+    """Calls at past blocks should see the state of those blocks"""
+    balances = {}
+    for _ in range(3):
+        mint(PREDEPLOYED_ACCOUNT_ADDRESS, amount=10)
+        block_number = _rpc_call("starknet_blockNumber", {})
+        balances[block_number] = _balance_at("latest")
+
+    for block_number, balance in balances.items():
+        assert _balance_at({"block_number": block_number}) == balance
+        assert _feeder_balance_at(block_number) == balance
+
+    block_hash = _rpc_call("starknet_blockHashAndNumber", {})["block_hash"]
+    assert _balance_at({"block_hash": block_hash}) == _balance_at("latest")
+
+
+@pytest.mark.historical_workers
+@devnet_in_background(*HISTORICAL_WORKERS_ARGS)
+def test_historical_call_with_positional_params():
+    """Positional params should be recognized as a historical query as well"""
+    mint(PREDEPLOYED_ACCOUNT_ADDRESS, amount=10)
+    block_number = _rpc_call("starknet_blockNumber", {})
+    expected_balance = _balance_at("latest")
+
+    mint(PREDEPLOYED_ACCOUNT_ADDRESS, amount=10)
+    low, high = _rpc_call(
+        "starknet_call", [BALANCE_OF_CALL, {"block_number": block_number}]
+    )
+    assert int(low, 16) + (int(high, 16) << 128) == expected_balance
+
+
+@pytest.mark.historical_workers
+@devnet_in_background(*HISTORICAL_WORKERS_ARGS)
+def test_historical_call_of_undeployed_contract():
+    """A contract not deployed at the requested block should not be found"""
+    response = requests.post(
+        f"{APP_URL}/rpc",
+        json={
+            "jsonrpc": "2.0",
+            "id": 0,
+            "method": "starknet_call",
+            "params": {
+                "request": {**BALANCE_OF_CALL, "contract_address": rpc_felt(0x123)},
+                "block_id": {"block_number": 0},
+            },
+        },
+    )
+    assert response.json()["error"]["message"] == "Contract not found"
+
+
+@pytest.mark.historical_workers
+@devnet_in_background(*HISTORICAL_WORKERS_ARGS)
+def test_historical_independent_estimation():
+    """Many independent transactions at a past block should be estimated by a worker"""
+    calls = [
+        (
+            EXPECTED_FEE_TOKEN_ADDRESS,
+            "balanceOf",
+            [int(PREDEPLOYED_ACCOUNT_ADDRESS, 16)],
+        )
+    ]
+    signature, execute_calldata = get_predeployed_acc_execute_args(calls)
+    invoke_transaction = {
+        "type": "INVOKE",
+        "max_fee": rpc_felt(0),
+        "version": hex(DEPRECATED_RPC_DECLARE_TX_VERSION),
+        "signature": [rpc_felt(sig) for sig in signature],
+        "nonce": rpc_felt(0),
+        "sender_address": rpc_felt(PREDEPLOYED_ACCOUNT_ADDRESS),
+        "calldata": [rpc_felt(data) for data in execute_calldata],
+    }
+    block_id = {"block_number": 0}
+
+    estimates = _rpc_call(
+        "starknet_estimateFee",
+        {
+            "request": [invoke_transaction] * MIN_TXS_FOR_PARALLEL_SIMULATION,
+            "block_id": block_id,
+            "independent": True,
+        },
+    )
+    single_estimate = _rpc_call(
+        "starknet_estimateFee", {"request": [invoke_transaction], "block_id": block_id}
+    )
+    assert estimates == single_estimate * MIN_TXS_FOR_PARALLEL_SIMULATION
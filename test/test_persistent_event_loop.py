@@ -0,0 +1,52 @@
+"""
+Test serving requests on a persistent event loop.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from .rpc.rpc_utils import rpc_call
+from .shared import PREDEPLOY_ACCOUNT_CLI_ARGS, PREDEPLOYED_ACCOUNT_ADDRESS
+from .util import (
+    assert_tx_status,
+    demand_block_creation,
+    devnet_in_background,
+    get_block,
+    mint,
+)
+
+
+@pytest.mark.persistent_event_loop
+@devnet_in_background(*PREDEPLOY_ACCOUNT_CLI_ARGS, "--persistent-event-loop")
+def test_requests_on_persistent_event_loop():
+    """Regular requests should be served as in the default mode"""
+    tx_hash = mint(PREDEPLOYED_ACCOUNT_ADDRESS, amount=10)["tx_hash"]
+    assert_tx_status(tx_hash, "ACCEPTED_ON_L2")
+
+    block = get_block(parse=True)
+    assert rpc_call("starknet_blockNumber", {})["result"] == block["block_number"]
+
+
+@pytest.mark.persistent_event_loop
+@devnet_in_background(
+    *PREDEPLOY_ACCOUNT_CLI_ARGS, "--persistent-event-loop", "--blocks-on-demand"
+)
+def test_waiting_request_does_not_block_loop():
+    """Request waiting on the shared loop shouldn't block other requests"""
+    tx_hash = mint(PREDEPLOYED_ACCOUNT_ADDRESS, amount=10)["tx_hash"]
+
+    with ThreadPoolExecutor() as executor:
+        waiting = executor.submit(
+            rpc_call,
+            "devnet_waitForTransaction",
+            {"transaction_hash": tx_hash, "timeout": 10},
+        )
+        time.sleep(1)
+        assert not waiting.done()
+
+        demand_block_creation()
+        receipt = waiting.result(timeout=5)["result"]
+
+    assert receipt["status"] == "ACCEPTED_ON_L2"
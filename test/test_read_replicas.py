@@ -0,0 +1,152 @@
+"""
+Test serving read-only requests by read replicas.
+"""
+
+import pytest
+import requests
+from starkware.starknet.public.abi import get_selector_from_name
+
+from starknet_devnet.blueprints.rpc.utils import rpc_felt
+from starknet_devnet.constants import (
+    DEPRECATED_RPC_DECLARE_TX_VERSION,
+    MIN_TXS_FOR_PARALLEL_SIMULATION,
+)
+from starknet_devnet.replicas import BLOCK_NUMBER_HEADER, MIN_BLOCK_NUMBER_HEADER
+
+from .rpc.rpc_utils import get_predeployed_acc_execute_args
+from .settings import APP_URL
+from .shared import (
+    EXPECTED_FEE_TOKEN_ADDRESS,
+    PREDEPLOY_ACCOUNT_CLI_ARGS,
+    PREDEPLOYED_ACCOUNT_ADDRESS,
+)
+from .test_account import get_account_balance
+from .util import devnet_in_background
+
+REPLICA_ARGS = (*PREDEPLOY_ACCOUNT_CLI_ARGS, "--read-replicas", "2")
+
+
+def _mint(amount: int, lite: bool) -> requests.Response:
+    response = requests.post(
+        f"{APP_URL}/mint",
+        json={"address": PREDEPLOYED_ACCOUNT_ADDRESS, "amount": amount, "lite": lite},
+    )
+    assert response.status_code == 200
+    return response
+
+
+def _rpc_call(method: str, params: dict, min_block_number: str = None) -> dict:
+    headers = {MIN_BLOCK_NUMBER_HEADER: min_block_number} if min_block_number else {}
+    response = requests.post(
+        f"{APP_URL}/rpc",
+        json={"jsonrpc": "2.0", "id": 0, "method": method, "params": params},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert BLOCK_NUMBER_HEADER in response.headers
+    return response.json()["result"]
+
+
+def _replicated_balance(block_id="latest") -> int:
+    low, high = _rpc_call(
+        "starknet_call",
+        {
+            "request": {
+                "contract_address": EXPECTED_FEE_TOKEN_ADDRESS,
+                "entry_point_selector": rpc_felt(get_selector_from_name("balanceOf")),
+                "calldata": [PREDEPLOYED_ACCOUNT_ADDRESS],
+            },
+            "block_id": block_id,
+        },
+    )
+    return int(low, 16) + (int(high, 16) << 128)
+
+
+@pytest.mark.read_replicas
+@devnet_in_background(*REPLICA_ARGS)
+def test_read_your_block():
+    """Reads should reflect the block reported by the preceding write"""
+    for _ in range(3):
+        block_number = _mint(amount=10, lite=False).headers[BLOCK_NUMBER_HEADER]
+
+        block = _rpc_call(
+            "starknet_getBlockWithTxHashes",
+            {"block_id": "latest"},
+            min_block_number=block_number,
+        )
+        assert block["block_number"] == int(block_number)
+
+    assert _replicated_balance() == get_account_balance(PREDEPLOYED_ACCOUNT_ADDRESS)
+
+
+@pytest.mark.read_replicas
+@devnet_in_background(*REPLICA_ARGS)
+def test_replicated_changes_without_block():
+    """Changes not resulting in a block should be replicated as well"""
+    _mint(amount=10, lite=True)
+    # without a block, the change is visible only in the pending state
+    assert _replicated_balance("pending") == get_account_balance(
+        PREDEPLOYED_ACCOUNT_ADDRESS
+    )
+
+
+@pytest.mark.read_replicas
+@devnet_in_background(*REPLICA_ARGS)
+def test_replicas_after_restart():
+    """Restarting should replace the replicated state"""
+    _mint(amount=10, lite=False)
+    _mint(amount=10, lite=False)
+    assert requests.post(f"{APP_URL}/restart").status_code == 200
+
+    block = _rpc_call("starknet_getBlockWithTxHashes", {"block_id": "latest"})
+    assert block["block_number"] == 0
+    assert _replicated_balance() == get_account_balance(PREDEPLOYED_ACCOUNT_ADDRESS)
+
+
+@pytest.mark.read_replicas
+@devnet_in_background(*REPLICA_ARGS)
+def test_independent_estimation_on_replica():
+    """Replicas can't start worker processes, so they should simulate many transactions alone"""
+    calls = [
+        (
+            EXPECTED_FEE_TOKEN_ADDRESS,
+            "balanceOf",
+            [int(PREDEPLOYED_ACCOUNT_ADDRESS, 16)],
+        )
+    ]
+    signature, execute_calldata = get_predeployed_acc_execute_args(calls)
+    invoke_transaction = {
+        "type": "INVOKE",
+        "max_fee": rpc_felt(0),
+        "version": hex(DEPRECATED_RPC_DECLARE_TX_VERSION),
+        "signature": [rpc_felt(sig) for sig in signature],
+        "nonce": rpc_felt(0),
+        "sender_address": rpc_felt(PREDEPLOYED_ACCOUNT_ADDRESS),
+        "calldata": [rpc_felt(data) for data in execute_calldata],
+    }
+
+    estimates = _rpc_call(
+        "starknet_estimateFee",
+        {
+            "request": [invoke_transaction] * MIN_TXS_FOR_PARALLEL_SIMULATION,
+            "block_id": "latest",
+            "independent": True,
+        },
+    )
+    single_estimate = _rpc_call(
+        "starknet_estimateFee",
+        {"request": [invoke_transaction], "block_id": "latest"},
+    )
+    assert estimates == single_estimate * MIN_TXS_FOR_PARALLEL_SIMULATION
+
+
+@pytest.mark.read_replicas
+@devnet_in_background(*REPLICA_ARGS, "--historical-workers", "2")
+def test_historical_call_on_replica():
+    """Replicas can't start historical workers, so they should execute past calls alone"""
+    block_number = _mint(amount=10, lite=False).headers[BLOCK_NUMBER_HEADER]
+    expected_balance = get_account_balance(PREDEPLOYED_ACCOUNT_ADDRESS)
+    _mint(amount=10, lite=False)
+
+    balance = _replicated_balance({"block_number": int(block_number)})
+    assert balance == expected_balance
@@ -0,0 +1,49 @@
+"""
+Test the state version
+"""
+
+import pytest
+import requests
+
+from .settings import APP_URL
+from .shared import PREDEPLOY_ACCOUNT_CLI_ARGS, PREDEPLOYED_ACCOUNT_ADDRESS
+from .util import create_empty_block, devnet_in_background, mint
+
+STATE_VERSION_HEADER = "X-Devnet-State-Version"
+
+
+def get_state_version() -> int:
+    """Get the state version and assert it's also reported in the header"""
+    response = requests.get(f"{APP_URL}/state_version")
+    assert response.status_code == 200
+
+    state_version = response.json()["state_version"]
+    assert int(response.headers[STATE_VERSION_HEADER]) == state_version
+    return state_version
+
+
+@pytest.mark.state_version
+@devnet_in_background(*PREDEPLOY_ACCOUNT_CLI_ARGS)
+def test_state_version_increases_on_writes():
+    """The version should increase with each write and stay the same on reads"""
+    initial_version = get_state_version()
+    assert get_state_version() == initial_version
+
+    requests.get(f"{APP_URL}/feeder_gateway/get_block")
+    assert get_state_version() == initial_version
+
+    mint(PREDEPLOYED_ACCOUNT_ADDRESS, 10, lite=True)
+    lite_minted_version = get_state_version()
+    assert lite_minted_version > initial_version
+
+    mint(PREDEPLOYED_ACCOUNT_ADDRESS, 10)
+    minted_version = get_state_version()
+    assert minted_version > lite_minted_version
+
+    create_empty_block()
+    block_version = get_state_version()
+    assert block_version > minted_version
+
+    restart_response = requests.post(f"{APP_URL}/restart")
+    assert int(restart_response.headers[STATE_VERSION_HEADER]) > block_version
+    assert get_state_version() > block_version
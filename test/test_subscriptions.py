@@ -0,0 +1,100 @@
+"""
+Test subscriptions to blocks, transactions and events.
+"""
+
+import json
+from typing import Iterator, Tuple
+
+import pytest
+import requests
+
+from .settings import APP_URL
+from .shared import PREDEPLOY_ACCOUNT_CLI_ARGS, PREDEPLOYED_ACCOUNT_ADDRESS
+from .util import create_empty_block, devnet_in_background, mint
+
+
+def _subscribe(**params) -> requests.Response:
+    return requests.get(f"{APP_URL}/subscribe", params=params, stream=True, timeout=10)
+
+
+def _read_messages(response: requests.Response) -> Iterator[Tuple[str, dict]]:
+    """Yield (event, data) pairs of a Server-Sent Events stream"""
+    event = None
+    for line in response.iter_lines(decode_unicode=True):
+        if line.startswith("event: "):
+            event = line[len("event: ") :]
+        elif line.startswith("data: "):
+            yield event, json.loads(line[len("data: ") :])
+
+
+def _next_message(messages: Iterator[Tuple[str, dict]], expected_event: str) -> dict:
+    for event, data in messages:
+        if event == expected_event:
+            return data
+    raise AssertionError(f"Stream ended before receiving {expected_event}")
+
+
+@pytest.mark.subscriptions
+@devnet_in_background()
+def test_block_subscription():
+    """Subscriber should be notified about new blocks"""
+    with _subscribe(topics="blocks") as response:
+        assert response.status_code == 200
+        assert response.headers["Content-Type"].startswith("text/event-stream")
+
+        messages = _read_messages(response)
+        assert _next_message(messages, "subscribed") == {"topics": ["blocks"]}
+
+        created_block = create_empty_block()
+        notified_block = _next_message(messages, "blocks")
+        assert notified_block["block_hash"] == created_block["block_hash"]
+        assert notified_block["block_number"] == created_block["block_number"]
+        assert notified_block["transaction_hashes"] == []
+
+
+@pytest.mark.subscriptions
+@devnet_in_background(*PREDEPLOY_ACCOUNT_CLI_ARGS)
+def test_transaction_and_event_subscription():
+    """Subscriber should be notified about transaction status and emitted events"""
+    with _subscribe(topics="transactions,events") as response:
+        messages = _read_messages(response)
+        _next_message(messages, "subscribed")
+
+        tx_hash = mint(PREDEPLOYED_ACCOUNT_ADDRESS, amount=10)["tx_hash"]
+
+        statuses = []
+        while "ACCEPTED_ON_L2" not in statuses:
+            notified_tx = _next_message(messages, "transactions")
+            assert int(notified_tx["transaction_hash"], 16) == int(tx_hash, 16)
+            statuses.append(notified_tx["status"])
+
+        event = _next_message(messages, "events")
+        assert int(event["transaction_hash"], 16) == int(tx_hash, 16)
+
+
+@pytest.mark.subscriptions
+@devnet_in_background("--max-subscribers", "1")
+def test_max_subscribers():
+    """Subscribing above the limit should be rejected"""
+    with _subscribe() as response:
+        assert response.status_code == 200
+
+        rejected = _subscribe()
+        assert rejected.status_code == 503
+
+
+@pytest.mark.subscriptions
+@devnet_in_background()
+def test_invalid_subscription_params():
+    """Invalid filters should be rejected"""
+    for params in [
+        {"topics": "blocks,unknown"},
+        {"address": "not-hex"},
+        {"keys": "[1, 2]"},
+        {"dropPolicy": "ignore"},
+        {"queueSize": "0"},
+        {"queueSize": "ten"},
+        {"queueSize": "1.5"},
+    ]:
+        response = _subscribe(**params)
+        assert response.status_code == 400, params
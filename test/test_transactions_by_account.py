@@ -0,0 +1,98 @@
+"""
+Test lookup of transactions by account, sender and nonce, and declared class.
+"""
+
+import pytest
+import requests
+
+from .account import declare
+from .settings import APP_URL
+from .shared import (
+    CONTRACT_PATH,
+    PREDEPLOY_ACCOUNT_CLI_ARGS,
+    PREDEPLOYED_ACCOUNT_ADDRESS,
+    PREDEPLOYED_ACCOUNT_PRIVATE_KEY,
+)
+from .util import assert_hex_equal, devnet_in_background
+
+
+def _get(endpoint: str, params: dict) -> dict:
+    response = requests.get(f"{APP_URL}/feeder_gateway/{endpoint}", params)
+    assert response.status_code == 200
+    return response.json()
+
+
+def _declare_rejected_and_accepted():
+    """Declare with too low max fee, then declare with the same nonce successfully"""
+    rejected = declare(
+        contract_path=CONTRACT_PATH,
+        account_address=PREDEPLOYED_ACCOUNT_ADDRESS,
+        private_key=PREDEPLOYED_ACCOUNT_PRIVATE_KEY,
+        nonce=0,
+        max_fee=1,
+    )
+    accepted = declare(
+        contract_path=CONTRACT_PATH,
+        account_address=PREDEPLOYED_ACCOUNT_ADDRESS,
+        private_key=PREDEPLOYED_ACCOUNT_PRIVATE_KEY,
+        nonce=0,
+        max_fee=int(1e18),
+    )
+    return rejected, accepted
+
+
+@pytest.mark.transactions_by_account
+@devnet_in_background(*PREDEPLOY_ACCOUNT_CLI_ARGS)
+def test_transactions_by_account():
+    """All transactions of the account should be returned in the order of sending"""
+    rejected, accepted = _declare_rejected_and_accepted()
+
+    transactions = _get(
+        "get_transactions_by_account", {"contractAddress": PREDEPLOYED_ACCOUNT_ADDRESS}
+    )["transactions"]
+
+    assert [tx["status"] for tx in transactions] == ["REJECTED", "ACCEPTED_ON_L2"]
+    assert_hex_equal(
+        transactions[0]["transaction"]["transaction_hash"], rejected["tx_hash"]
+    )
+    assert_hex_equal(
+        transactions[1]["transaction"]["transaction_hash"], accepted["tx_hash"]
+    )
+
+
+@pytest.mark.transactions_by_account
+@devnet_in_background(*PREDEPLOY_ACCOUNT_CLI_ARGS)
+def test_transaction_by_sender_and_nonce():
+    """Accepted transaction should take precedence over the rejected one"""
+    _, accepted = _declare_rejected_and_accepted()
+
+    transaction = _get(
+        "get_transaction_by_sender_and_nonce",
+        {"senderAddress": PREDEPLOYED_ACCOUNT_ADDRESS, "nonce": 0},
+    )
+    assert transaction["status"] == "ACCEPTED_ON_L2"
+    assert_hex_equal(
+        transaction["transaction"]["transaction_hash"], accepted["tx_hash"]
+    )
+
+    not_received = _get(
+        "get_transaction_by_sender_and_nonce",
+        {"senderAddress": PREDEPLOYED_ACCOUNT_ADDRESS, "nonce": 1},
+    )
+    assert not_received["status"] == "NOT_RECEIVED"
+
+
+@pytest.mark.transactions_by_account
+@devnet_in_background(*PREDEPLOY_ACCOUNT_CLI_ARGS)
+def test_declare_transaction():
+    """Declare transaction should be found by class hash"""
+    _, accepted = _declare_rejected_and_accepted()
+
+    transaction = _get("get_declare_transaction", {"classHash": accepted["class_hash"]})
+    assert transaction["status"] == "ACCEPTED_ON_L2"
+    assert_hex_equal(
+        transaction["transaction"]["transaction_hash"], accepted["tx_hash"]
+    )
+
+    not_received = _get("get_declare_transaction", {"classHash": "0x123"})
+    assert not_received["status"] == "NOT_RECEIVED"
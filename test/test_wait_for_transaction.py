@@ -0,0 +1,132 @@
+"""
+Test waiting for transactions server-side.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from starknet_devnet.blueprints.rpc.structures.types import PredefinedRpcErrorCode
+
+from .rpc.rpc_utils import BackgroundDevnetClient, make_rpc_payload, rpc_call
+from .settings import APP_URL
+from .shared import PREDEPLOY_ACCOUNT_CLI_ARGS, PREDEPLOYED_ACCOUNT_ADDRESS
+from .util import assert_tx_status, demand_block_creation, devnet_in_background, mint
+
+DUMMY_TX_HASH = "0x123"
+
+
+def _wait_for_transaction(tx_hash: str, timeout=None) -> requests.Response:
+    params = {"transactionHash": tx_hash}
+    if timeout is not None:
+        params["timeout"] = timeout
+    return requests.get(f"{APP_URL}/feeder_gateway/wait_for_transaction", params)
+
+
+@pytest.mark.wait_for_transaction
+@devnet_in_background(*PREDEPLOY_ACCOUNT_CLI_ARGS, "--blocks-on-demand")
+def test_wait_until_accepted():
+    """Waiting request should return as soon as the block is created"""
+    tx_hash = mint(PREDEPLOYED_ACCOUNT_ADDRESS, amount=10)["tx_hash"]
+    assert_tx_status(tx_hash, "PENDING")
+
+    with ThreadPoolExecutor() as executor:
+        waiting = executor.submit(_wait_for_transaction, tx_hash, timeout=10)
+        time.sleep(1)
+        assert not waiting.done()
+
+        demand_block_creation()
+        response = waiting.result(timeout=5)
+
+    assert response.status_code == 200
+    assert response.json()["tx_status"] == "ACCEPTED_ON_L2"
+
+
+@pytest.mark.wait_for_transaction
+@devnet_in_background(*PREDEPLOY_ACCOUNT_CLI_ARGS)
+def test_accepted_transaction_returned_immediately():
+    """Already accepted transaction shouldn't be waited for"""
+    tx_hash = mint(PREDEPLOYED_ACCOUNT_ADDRESS, amount=10)["tx_hash"]
+
+    response = _wait_for_transaction(tx_hash)
+    assert response.status_code == 200
+    assert response.json()["tx_status"] == "ACCEPTED_ON_L2"
+    assert "block_hash" in response.json()
+
+
+@pytest.mark.wait_for_transaction
+@devnet_in_background()
+def test_wait_timeout():
+    """Last known status should be returned on timeout"""
+    start = time.time()
+    response = _wait_for_transaction(DUMMY_TX_HASH, timeout=1)
+    assert time.time() - start >= 1
+
+    assert response.status_code == 200
+    assert response.json()["tx_status"] == "NOT_RECEIVED"
+
+
+@pytest.mark.wait_for_transaction
+@devnet_in_background()
+def test_wait_invalid_params():
+    """Invalid hash and timeout should be rejected"""
+    assert _wait_for_transaction("123").status_code == 400
+    assert _wait_for_transaction(DUMMY_TX_HASH, timeout=-1).status_code == 400
+    assert _wait_for_transaction(DUMMY_TX_HASH, timeout="abc").status_code == 400
+
+
+@pytest.mark.wait_for_transaction
+@devnet_in_background(*PREDEPLOY_ACCOUNT_CLI_ARGS, "--blocks-on-demand")
+def test_rpc_wait_for_transaction():
+    """RPC extension should return the receipt once the block is created"""
+    tx_hash = mint(PREDEPLOYED_ACCOUNT_ADDRESS, amount=10)["tx_hash"]
+
+    with ThreadPoolExecutor() as executor:
+        waiting = executor.submit(
+            rpc_call,
+            "devnet_waitForTransaction",
+            {"transaction_hash": tx_hash, "timeout": 10},
+        )
+        time.sleep(1)
+        demand_block_creation()
+        receipt = waiting.result(timeout=5)["result"]
+
+    assert int(receipt["transaction_hash"], 16) == int(tx_hash, 16)
+    assert receipt["status"] == "ACCEPTED_ON_L2"
+
+
+@pytest.mark.wait_for_transaction
+@devnet_in_background()
+def test_rpc_wait_for_unknown_transaction():
+    """Unknown transaction should result in an error after timeout"""
+    response = rpc_call(
+        "devnet_waitForTransaction", {"transaction_hash": DUMMY_TX_HASH, "timeout": 0}
+    )
+    assert response["error"]["code"] == 25  # TXN_HASH_NOT_FOUND
+
+
+@pytest.mark.wait_for_transaction
+@devnet_in_background()
+def test_rpc_wait_for_transaction_in_mixed_batch():
+    """Waiting in a batch with other methods should be rejected instead of blocking devnet"""
+    start = time.time()
+    responses = BackgroundDevnetClient.post(
+        "/rpc",
+        [
+            {**make_rpc_payload("starknet_blockNumber", {}), "id": 0},
+            {
+                **make_rpc_payload(
+                    "devnet_waitForTransaction",
+                    {"transaction_hash": DUMMY_TX_HASH, "timeout": 10},
+                ),
+                "id": 1,
+            },
+        ],
+    ).json()
+    assert time.time() - start < 10
+
+    assert isinstance(responses[0]["result"], int)
+    assert responses[1]["id"] == 1
+    assert responses[1]["error"]["code"] == PredefinedRpcErrorCode.INVALID_REQUEST.value